@@ -1,91 +1,32 @@
-import json
+import os
+import sys
 
-# Load JSON data
-json_path = "JSON File obtained from VOSViewer.json"
-with open(json_path, 'r', encoding='utf-8-sig') as f:
-    data = json.load(f)
-
-# List of goals (normalized to lowercase)
-goals = {
-    "energy utilization", "resource allocation", "quality of service", "resource management",
-    "resources allocation", "green computing", "energy-consumption", "energy efficiency",
-    "decision making", "quality-of-service", "wireless communications", "scheduling algorithms",
-    "computational efficiency", "economic and social effects", "information management",
-    "network security", "low-latency communication"
-}
-
-# List of techniques (normalized to lowercase)
-techniques = {
-    "computation offloading", "reinforcement learning", "task analysis", "deep learning",
-    "job analysis", "task offloading", "reinforcement learnings", "optimisations", "optimization",
-    "integer programming", "deep reinforcement learning", "multiaccess", "computational modelling",
-    "network architecture", "learning algorithms", "heuristic algorithms", "iterative methods",
-    "markov processes", "nonlinear programming", "game theory", "convex optimization",
-    "computation resources", "learning systems", "multi agent systems", "bandwidth",
-    "approximation algorithms", "computational complexity", "optimization problems",
-    "benchmarking", "machine learning", "transfer functions"
-}
-
-# Keyword normalization mappings
-goal_aliases = {
-    "resources allocation": "resource allocation",
-    "quality-of-service": "quality of service"
-}
-technique_aliases = {
-    "reinforcement learnings": "reinforcement learning",
-    "optimisations": "optimization"
-}
-
-# Apply normalization
-goals = {goal_aliases.get(g, g) for g in goals}
-techniques = {technique_aliases.get(t, t) for t in techniques}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mec_analysis.network import KeywordNetwork
+from mec_analysis.reports import network_top_techniques, network_top_techniques_lines
+from mec_analysis.taxonomy import GOAL_ALIASES, GOALS_RAW, KEYWORD_ALIASES, TECHNIQUE_ALIASES, TECHNIQUES_RAW
+from mec_analysis.vosviewer import build_keyword_network
 
-# Extract data
-items = data['network']['items']
-links = data['network']['links']
-
-# Create ID-to-keyword mapping
-id_to_keyword = {item['id']: item['label'].lower() for item in items}
-keyword_to_id = {item['label'].lower(): item['id'] for item in items}
-
-# Normalize keyword labels using aliases
-normalized_id_to_keyword = {
-    item['id']: goal_aliases.get(item['label'].lower(),
-                technique_aliases.get(item['label'].lower(), item['label'].lower()))
-    for item in items
-}
-
-# Collect results
-results = {}
-
-for goal in goals:
-    keyword_id = keyword_to_id.get(goal)
-    if keyword_id is None:
-        results[goal] = "Not found"
-        continue
+json_path = "JSON File obtained from VOSViewer.json"
+corpus_file = None  # build the network from this Scopus CSV instead of a VOSviewer export; None reads json_path
+built_json_path = "keyword_network.json"  # where the built network is written (same JSON schema)
+min_occurrences = 5  # keywords in fewer documents are left out of the built network
 
-    # Collect connected keywords and strengths
-    connected_keywords_strength = [
-        (normalized_id_to_keyword[link['target_id']], link['strength'])
-        if link['source_id'] == keyword_id else
-        (normalized_id_to_keyword[link['source_id']], link['strength'])
-        for link in links
-        if link['source_id'] == keyword_id or link['target_id'] == keyword_id
-    ]
+# Goals and techniques (see mec_analysis/taxonomy.py), normalized by the aliases
+goals = {GOAL_ALIASES.get(g, g) for g in GOALS_RAW}
+techniques = {TECHNIQUE_ALIASES.get(t, t) for t in TECHNIQUES_RAW}
 
-    # Filter to techniques only
-    connected_techniques = [(kw, strength) for kw, strength in connected_keywords_strength if kw in techniques]
+# Build the co-occurrence network from the corpus when requested
+if corpus_file:
+    build_keyword_network(corpus_file, built_json_path, aliases=KEYWORD_ALIASES, min_occurrences=min_occurrences)
+    json_path = built_json_path
 
-    # Get top 5
-    top_5 = sorted(connected_techniques, key=lambda x: x[1], reverse=True)[:5]
+# Load the network as an adjacency index, with labels normalized by the aliases
+network = KeywordNetwork.load(json_path, aliases=KEYWORD_ALIASES)
 
-    results[goal] = top_5 if top_5 else "No technique connections found"
+# Top 5 technique neighbours of each goal by link strength (goals in sorted
+# order, so the report does not depend on set iteration order)
+results = network_top_techniques(network, sorted(goals), techniques, k=5)
 
 # Print results
-for goal, top_techs in results.items():
-    print(f"\nGoal: {goal.capitalize()}")
-    if isinstance(top_techs, str):
-        print(top_techs)
-    else:
-        for tech, strength in top_techs:
-            print(f"  {tech} (Strength: {strength})")
+print("\n".join(network_top_techniques_lines(results)))
@@ -1,91 +1,64 @@
-import pandas as pd
+import os
+import sys
 
-# Load dataset
-file_path = "Mobile Edge computing dataset.csv"
-data = pd.read_csv(file_path, low_memory=False)
-
-# Define alias mappings
-alias_map = {
-    "resources allocation": "resource allocation",
-    "quality-of-service": "quality of service",
-    "optimisations": "optimization",
-    "reinforcement learnings": "reinforcement learning"
-}
-
-# Define raw lists
-goals_raw = [
-    "resource allocation", "energy utilization", "quality of service",
-    "resource management", "resources allocation", "green computing",
-    "energy efficiency", "energy-consumption", "decision making",
-    "quality-of-service", "network security", "information management",
-    "scheduling algorithms", "economic and social effects",
-    "low-latency communication", "wireless communications", "computational efficiency"
-]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mec_analysis.cache import open_match_cache
+from mec_analysis.corpus import corpus_texts, read_typed_corpus_chunks
+from mec_analysis.cube import KeywordCube
+from mec_analysis.incidence import build_incidence
+from mec_analysis.index import CorpusIndex
+from mec_analysis.metrics import RunMetrics
+from mec_analysis.reports import doc_type_top_keywords_lines
+from mec_analysis.taxonomy import taxonomy_matcher
 
-techniques_raw = [
-    "computation offloading", "reinforcement learning", "task analysis", "deep learning",
-    "job analysis", "task offloading", "optimisations", "optimization", "integer programming",
-    "deep reinforcement learning", "multiaccess", "computational modelling", "network architecture",
-    "learning algorithms", "heuristic algorithms", "iterative methods", "markov processes",
-    "nonlinear programming", "game theory", "convex optimization", "computation resources",
-    "learning systems", "multi agent systems", "bandwidth", "approximation algorithms",
-    "computational complexity", "optimization problems", "benchmarking", "machine learning",
-    "transfer functions", "reinforcement learnings"
-]
+# Dataset is streamed in chunks of this many rows (bounds memory use)
+file_path = "Mobile Edge computing dataset.csv"
+chunk_size = 50_000
+use_index = True  # count from the corpus index (built next to the CSV, rebuilt when it changes)
+cache_dir = ".match_cache"  # match results are reused across runs when not using the index; None disables
+metrics_dir = "run_metrics"  # per-stage timing reports; None disables
+profile_matching = False  # also write a cProfile .prof of the matching stage
 
-# Normalize and build keyword categories
-canonical_goals = sorted({alias_map.get(g, g) for g in goals_raw})
-canonical_techniques = sorted({alias_map.get(t, t) for t in techniques_raw})
+# Goal/technique taxonomy shared by all analyses (see mec_analysis/taxonomy.py)
+matcher = taxonomy_matcher()
 
 doc_types = ["Article", "Book chapter", "Conference paper"]
-goal_doc_count = {g: {dt: 0 for dt in doc_types} for g in canonical_goals}
-tech_doc_count = {t: {dt: 0 for dt in doc_types} for t in canonical_techniques}
-
-# Process rows
-for _, row in data.iterrows():
-    doc_type = row.get("Document Type", "")
-    if doc_type not in doc_types:
-        continue
-
-    text = " ".join([
-        str(row.get("Abstract", "")).lower(),
-        str(row.get("Author Keywords", "")).lower(),
-        str(row.get("Index Keywords", "")).lower()
-    ])
-
-    seen_goals = set()
-    seen_techs = set()
-
-    for g in goals_raw:
-        canonical = alias_map.get(g, g)
-        if g.lower() in text:
-            seen_goals.add(canonical)
-
-    for t in techniques_raw:
-        canonical = alias_map.get(t, t)
-        if t.lower() in text:
-            seen_techs.add(canonical)
-
-    for g in seen_goals:
-        goal_doc_count[g][doc_type] += 1
-    for t in seen_techs:
-        tech_doc_count[t][doc_type] += 1
 
-# Convert to DataFrame
-goal_rows = [[dt, 'Goal', g, count] for g, counts in goal_doc_count.items() for dt, count in counts.items()]
-tech_rows = [[dt, 'Technique', t, count] for t, counts in tech_doc_count.items() for dt, count in 
-             counts.items()]
-df_all = pd.DataFrame(goal_rows + tech_rows, columns=["Document Type", "Category", "Keyword", "Count"])
+# Build a document x keyword matrix and count it into a (year x document type
+# x keyword) cube. With the index the matrix comes from its postings;
+# otherwise the CSV is streamed in chunks, every text matched and the chunk
+# cubes are added up.
+metrics = RunMetrics("5.2.2", metrics_dir, profile=profile_matching)
+cube = None
+if use_index:
+    with metrics.stage("load") as record:
+        index = CorpusIndex.load(file_path)
+        docs = index.select(doc_types=doc_types)
+        record["rows"] += index.n_docs
+    with metrics.stage("match", rows=len(docs), profile=True):
+        incidence = index.incidence(matcher, docs)
+    with metrics.stage("aggregate", rows=len(docs)):
+        cube = KeywordCube.from_incidence(incidence, doc_type_labels=doc_types)
+else:
+    cache = open_match_cache(cache_dir, "5.2.2")
+    columns = ["Document Type", "Abstract", "Author Keywords", "Index Keywords"]
+    chunks = read_typed_corpus_chunks(file_path, columns, chunksize=chunk_size)
+    for data in metrics.timed(chunks, "load", bytes_read=os.path.getsize(file_path)):
+        with metrics.stage("normalize", rows=len(data)):
+            data = data[data["Document Type"].isin(doc_types)]
+            texts = corpus_texts(data, ["Abstract", "Author Keywords", "Index Keywords"])
+        with metrics.stage("match", rows=len(texts), profile=True):
+            incidence = build_incidence(texts, matcher, doc_types=data["Document Type"], cache=cache)
+        with metrics.stage("aggregate", rows=len(texts)):
+            chunk_cube = KeywordCube.from_incidence(incidence, doc_type_labels=doc_types)
+            cube = chunk_cube if cube is None else cube + chunk_cube
+    if cache is not None:
+        cache.save()
 
-# Function to display top 5 for each category and document type
-def display_top_5_by_category(df):
-    for doc_type in doc_types:
-        for category in ["Goal", "Technique"]:
-            print(f"\nTop 5 {category}s for {doc_type}:")
-            subset = df[(df["Document Type"] == doc_type) & (df["Category"] == category)]
-            top_5 = subset.nlargest(5, "Count")
-            for _, row in top_5.iterrows():
-                print(f"  {row['Keyword']}: {row['Count']}")
+# Display the top 5 for each category and document type, as slices of the cube
+with metrics.stage("export"):
+    print("\n".join(doc_type_top_keywords_lines(cube, doc_types, k=5)))
 
-# Display the results
-display_top_5_by_category(df_all)
+report_path = metrics.write()
+if report_path:
+    print(f"\n✅ Run metrics saved to: {report_path}")
@@ -1,105 +1,94 @@
 import os
+import sys
+import numpy as np
 import pandas as pd
-import json
-from collections import defaultdict, Counter
 
-# Define paths
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mec_analysis.cache import open_match_cache
+from mec_analysis.cooccurrence import CooccurrenceTensor
+from mec_analysis.cube import KeywordCube
+from mec_analysis.incidence import build_incidence
+from mec_analysis.metrics import RunMetrics
+from mec_analysis.parallel import parallel_map
+from mec_analysis.periods import partition_bytes, partition_tasks, read_partition, store_year_ranges
+from mec_analysis.reports import goal_technique_rows, goal_technique_text
+from mec_analysis.taxonomy import taxonomy_matcher
+
+# Define paths (period_store is written by "dataset splitting code.py")
 base_path = r"Splitting Dataset into 5 Time periods"
-csv_files = [
-    "2011_2013.csv", "2014_2016.csv", "2017_2019.csv",
-    "2020_2022.csv", "2023_2024.csv"
-]
-
-# Define goals and technique aliases
-goal_aliases = {
-    "resources allocation": "resource allocation",
-    "quality-of-service": "quality of service"
-}
-technique_aliases = {
-    "optimisations": "optimization",
-    "reinforcement learnings": "reinforcement learning"
-}
-
-goals_raw = [
-    "computational efficiency", "decision making", "economic and social effects", "energy efficiency",
-    "energy utilization", "energy-consumption", "green computing", "information management",
-    "low-latency communication", "network security", "quality of service", "quality-of-service",
-    "resource allocation", "resource management", "resources allocation", "scheduling algorithms",
-    "wireless communications"
-]
-
-techniques_raw = [
-    "approximation algorithms", "bandwidth", "benchmarking", "computation offloading",
-    "computation resources", "computational complexity", "computational modelling",
-    "convex optimization", "deep learning", "deep reinforcement learning", "game theory",
-    "heuristic algorithms", "integer programming", "iterative methods", "job analysis",
-    "learning algorithms", "learning systems", "machine learning", "markov processes",
-    "multi agent systems", "multiaccess", "network architecture", "nonlinear programming",
-    "optimisations", "optimization", "optimization problems", "reinforcement learning",
-    "reinforcement learnings", "task analysis", "task offloading", "transfer functions"
-]
-
-# Normalize lists
-goals = list({goal_aliases.get(g, g) for g in goals_raw})
-techniques = list({technique_aliases.get(t, t) for t in techniques_raw})
-
-# Combine all results
-all_results = []
-
-# Combined text output path
-combined_txt_path = os.path.join(base_path, "combined_goal_technique_analysis.txt")
-with open(combined_txt_path, 'w', encoding='utf-8') as tf:
-
-    for csv_file in csv_files:
-        print(f"\n==== Processing {csv_file} ====")
-        file_path = os.path.join(base_path, csv_file)
-        df = pd.read_csv(file_path).fillna('')
-
-        goal_occurrence = Counter()
-        goal_to_technique_counter = defaultdict(Counter)
-
-        for _, row in df.iterrows():
-            text = f"{row.get('Abstract', '')} {row.get('Author Keywords', '')}{row.get('Index Keywords', '')}".lower()
-        
-
-            found_goals = {
-                goal_aliases.get(g, g)
-                for g in goals_raw if g.lower() in text
-            }
-
-            found_techniques = {
-                technique_aliases.get(t, t)
-                for t in techniques_raw if t.lower() in text
-            }
-
-            for g in found_goals:
-                goal_occurrence[g] += 1
-                goal_to_technique_counter[g].update(found_techniques)
-
-        results = []
-        period_label = csv_file.replace(".csv", "")
-        tf.write(f"\n===== Period: {period_label} =====\n\n")
-
-        for goal in goal_occurrence:
-            techs = goal_to_technique_counter[goal].most_common(3)
-            row = {
-                "Time Period": period_label,
-                "Goal": goal,
-                "Goal Occurrence": goal_occurrence[goal]
-            }
-            tf.write(f"Goal: {goal} (Occurrences: {goal_occurrence[goal]})\n")
-            for i, (tech, count) in enumerate(techs, start=1):
-                row[f"Technique {i}"] = tech
-                row[f"Count {i}"] = count
-                tf.write(f"  Technique {i}: {tech} (Count: {count})\n")
-            tf.write("\n")
-            results.append(row)
-
-        all_results.extend(results)
-    print(f"✅ Combined text file saved to: {combined_txt_path}")
-
-# Save all results to a single CSV
-combined_csv_path = os.path.join(base_path, "combined_goal_technique_analysis.csv")
-combined_df = pd.DataFrame(all_results)
-combined_df.to_csv(combined_csv_path, index=False)
-print(f"✅ Combined CSV file saved to: {combined_csv_path}")
+store_path = os.path.join(base_path, "period_store")
+periods = None  # all periods in the store, or e.g. ["2020_2022", "2023_2024"]
+text_columns = ["Abstract", "Author Keywords", "Index Keywords"]
+workers = None  # worker processes: None = one per CPU, 1 = run without a pool
+rows_per_task = 50_000  # large periods are split into tasks of about this many rows
+cache_dir = ".match_cache"  # match results are reused across runs; None disables
+metrics_dir = "run_metrics"  # per-stage timing reports; None disables
+profile_matching = False  # also write a cProfile .prof of the matching stage
+
+# Goal/technique taxonomy shared by all analyses (see mec_analysis/taxonomy.py)
+matcher = taxonomy_matcher()
+
+
+def count_partition_slice(task):
+    """Worker: match one slice of a period; return its co-occurrence tensor, keyword cube and stage metrics."""
+    period_label, row_groups = task
+    first_group = row_groups[0] if row_groups else 0
+    metrics = RunMetrics(f"5.3.1-{period_label}-{first_group}", metrics_dir, profile=profile_matching)
+    with metrics.stage("load", period_label,
+                       bytes_read=partition_bytes(store_path, period_label, text_columns + ["Year"],
+                                                  row_groups)) as record:
+        df = read_partition(store_path, period_label, columns=text_columns + ["Year"], row_groups=row_groups)
+        record["rows"] += len(df)
+    with metrics.stage("normalize", period_label, rows=len(df)):
+        df[text_columns] = df[text_columns].fillna('')
+        text = (
+            df['Abstract'].astype(str) + " " + df['Author Keywords'].astype(str) + df['Index Keywords'].astype(str)
+        ).str.lower()
+    with metrics.stage("match", period_label, rows=len(text), profile=True):
+        # One cache file per task, so workers never write the same file
+        cache = open_match_cache(cache_dir, f"5.3.1-{period_label}-{first_group}")
+        incidence = build_incidence(text, matcher, years=df['Year'], cache=cache)
+        if cache is not None:
+            cache.save()
+    with metrics.stage("aggregate", period_label, rows=len(text)):
+        tensor = CooccurrenceTensor.from_incidence(
+            incidence, np.full(incidence.n_docs, period_label, dtype=object), period_labels=[period_label]
+        )
+        cube = KeywordCube.from_incidence(incidence)
+    metrics.dump_profiles()
+    return tensor, cube, metrics.records
+
+
+if __name__ == "__main__":
+    # Scan every period slice in a worker process and merge them into one tensor and cube
+    metrics = RunMetrics("5.3.1", metrics_dir)
+    tensor = cube = None
+    tasks = partition_tasks(store_path, periods, rows_per_task)
+    for slice_tensor, slice_cube, slice_metrics in parallel_map(count_partition_slice, tasks, workers):
+        metrics.merge(slice_metrics)
+        with metrics.stage("aggregate"):
+            tensor = slice_tensor if tensor is None else tensor + slice_tensor
+            cube = slice_cube if cube is None else cube + slice_cube
+
+    # Every goal of each period with its top techniques, as slices of the tensor and the cube
+    with metrics.stage("aggregate"):
+        year_ranges = store_year_ranges(store_path)
+        all_results = goal_technique_rows(tensor, cube, year_ranges, k=3) if tensor is not None else []
+        period_labels = tensor.periods if tensor is not None else []
+
+    # Combined text output path
+    combined_txt_path = os.path.join(base_path, "combined_goal_technique_analysis.txt")
+    with metrics.stage("export"), open(combined_txt_path, 'w', encoding='utf-8') as tf:
+        tf.write(goal_technique_text(all_results, period_labels))
+        print(f"✅ Combined text file saved to: {combined_txt_path}")
+
+    # Save all results to a single CSV
+    combined_csv_path = os.path.join(base_path, "combined_goal_technique_analysis.csv")
+    with metrics.stage("export", rows=len(all_results)):
+        combined_df = pd.DataFrame(all_results)
+        combined_df.to_csv(combined_csv_path, index=False)
+    print(f"✅ Combined CSV file saved to: {combined_csv_path}")
+
+    report_path = metrics.write()
+    if report_path:
+        print(f"✅ Run metrics saved to: {report_path}")
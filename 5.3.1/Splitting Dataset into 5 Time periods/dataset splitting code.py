@@ -1,25 +1,43 @@
-import pandas as pd
+import argparse
 import os
+import sys
 
-# Step 1: Set the path
-base_path = r'E:\dataset\thesis'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from mec_analysis.dedup import deduplicate_corpus
+from mec_analysis.periods import DEFAULT_YEAR_RANGES, parse_year_ranges, partition_corpus
+
+# Step 1: Set the path (this folder, where 5.3.1.py reads the period store from)
+base_path = os.path.dirname(os.path.abspath(__file__))
 input_file = os.path.join(base_path, 'Mobile Edge computing dataset.csv')  # Replace with your actual CSV filename
+store_path = os.path.join(base_path, 'period_store')
+deduplicated_file = os.path.join(base_path, 'deduplicated_corpus.csv')  # corpus without duplicate papers
+report_file = os.path.join(base_path, 'duplicate_clusters.csv')  # which rows were removed, and why
+
+parser = argparse.ArgumentParser(description="Split the dataset into year-range partitions in one pass.")
+parser.add_argument("--input", default=input_file, help="Scopus CSV export")
+parser.add_argument("--output", default=store_path, help="Directory of the partitioned (Parquet) store")
+parser.add_argument("--periods", nargs="+", metavar="START-END",
+                    help="Year ranges, e.g. 2011-2013 2014-2016 (default: the five thesis periods)")
+parser.add_argument("--chunksize", type=int, default=50_000, help="Rows read per chunk")
+parser.add_argument("--no-dedup", action="store_true", help="Keep duplicate papers (same DOI, title or abstract)")
+parser.add_argument("--deduplicated", default=deduplicated_file, help="Deduplicated CSV the store is split from")
+parser.add_argument("--report", default=report_file, help="Duplicate cluster report CSV")
+parser.add_argument("--dedup-threshold", type=float, default=0.8,
+                    help="Estimated abstract similarity of near-duplicate papers (default 0.8)")
+args = parser.parse_args()
 
-# Step 2: Read the CSV file
-df = pd.read_csv(input_file)
+# Step 2: Define year ranges (one partition each)
+year_ranges = parse_year_ranges(args.periods) if args.periods else DEFAULT_YEAR_RANGES
 
-# Step 3: Define year ranges and output CSV file names
-year_ranges = {
-    '2011_2013.csv': (2011, 2013),
-    '2014_2016.csv': (2014, 2016),
-    '2017_2019.csv': (2017, 2019),
-    '2020_2022.csv': (2020, 2022),
-    '2023_2024.csv': (2023, 2024)
-}
+# Step 3: Drop duplicate papers (see mec_analysis/dedup.py), keeping the first copy of each
+corpus_file = args.input
+if not args.no_dedup:
+    report = deduplicate_corpus(args.input, args.deduplicated, args.report, args.dedup_threshold,
+                                chunksize=args.chunksize)
+    corpus_file = args.deduplicated
+    print(f"Removed {int((~report['Kept']).sum())} duplicate papers (report: {args.report})")
 
-# Step 4: Filter and save each range as CSV
-for filename, (start_year, end_year) in year_ranges.items():
-    filtered_df = df[(df['Year'] >= start_year) & (df['Year'] <= end_year)]
-    output_path = os.path.join(base_path, filename)
-    filtered_df.to_csv(output_path, index=False)
-    print(f"Saved: {output_path} ({len(filtered_df)} rows)")
+# Step 4: Read the CSV once and write every row to its period's partition
+rows = partition_corpus(corpus_file, args.output, year_ranges, chunksize=args.chunksize)
+for period, count in rows.items():
+    print(f"Saved: {os.path.join(args.output, 'period=' + period)} ({count} rows)")
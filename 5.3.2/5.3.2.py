@@ -1,50 +1,33 @@
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mec_analysis.cache import open_match_cache
+from mec_analysis.charts import render_charts
+from mec_analysis.corpus import corpus_texts, read_typed_corpus_chunks
+from mec_analysis.cube import KeywordCube
+from mec_analysis.excel import write_excel_rows
+from mec_analysis.incidence import assign_periods, build_incidence
+from mec_analysis.index import CorpusIndex
+from mec_analysis.metrics import RunMetrics
+from mec_analysis.reports import TOP_GOALS_TECHNIQUES_COLUMNS, top_goals_techniques_charts, top_goals_techniques_rows
+from mec_analysis.taxonomy import taxonomy_matcher
+
 # ==== File and Paths ====
 file_path = "Mobile Edge computing dataset.csv"
 output_file_path = "top_goals_techniques_filtered.xlsx"
+chunk_size = 50_000  # rows per streamed chunk of the CSV
+use_index = True  # count from the corpus index (built next to the CSV, rebuilt when it changes)
+cache_dir = ".match_cache"  # match results are reused across runs when not using the index; None disables
+metrics_dir = "run_metrics"  # per-stage timing reports; None disables
+profile_matching = False  # also write a cProfile .prof of the matching stage
+chart_dir = None  # one bar chart per year range and document type, rendered in parallel; None disables
+chart_dpi = 300  # resolution of those charts
 
-# ==== Load CSV ====
-data = pd.read_csv(file_path, low_memory=False)
-
-# ==== Normalize text columns ====
-for col in ['Abstract', 'Author Keywords', 'Index Keywords']:
-    data[col] = data[col].astype(str).str.lower()
-
-# ==== Alias Mappings ====
-goal_aliases = {
-    "resources allocation": "resource allocation",
-    "quality-of-service": "quality of service"
-}
-
-technique_aliases = {
-    "optimisations": "optimization",
-    "reinforcement learnings": "reinforcement learning"
-}
-
-# ==== Master Keyword Lists ====
-goals_raw = [
-    "resource allocation", "energy utilization", "quality of service", "resource management",
-    "resources allocation", "green computing", "energy efficiency", "energy-consumption",
-    "decision making", "quality-of-service", "network security", "information management",
-    "scheduling algorithms", "economic and social effects", "low-latency communication",
-    "wireless communications", "computational efficiency"
-]
-
-techniques_raw = [
-    "computation offloading", "reinforcement learning", "task analysis", "deep learning",
-    "job analysis", "task offloading", "reinforcement learnings", "optimisations", "optimization",
-    "integer programming", "deep reinforcement learning", "multiaccess", "computational modelling",
-    "network architecture", "learning algorithms", "heuristic algorithms", "iterative methods",
-    "markov processes", "nonlinear programming", "game theory", "convex optimization",
-    "computation resources", "learning systems", "multi agent systems", "bandwidth",
-    "approximation algorithms", "computational complexity", "optimization problems",
-    "benchmarking", "machine learning", "transfer functions"
-]
-
-# ==== Normalize keyword lists ====
-goals = list({goal_aliases.get(g, g) for g in goals_raw})
-techniques = list({technique_aliases.get(t, t) for t in techniques_raw})
+# ==== Goal/technique taxonomy shared by all analyses (see mec_analysis/taxonomy.py) ====
+matcher = taxonomy_matcher()
 
 # ==== Year Ranges ====
 year_ranges = {
@@ -55,58 +38,66 @@ year_ranges = {
     "2023-2024": (2023, 2024)
 }
 
-# ==== Initialize Count Containers ====
-technique_doc_count = {
-    yr: {dt: {tech: 0 for tech in techniques} for dt in ["Article", "Conference paper", "Book chapter"]}
-    for yr in year_ranges
-}
-goal_doc_count = {
-    yr: {dt: {goal: 0 for goal in goals} for dt in ["Article", "Conference paper", "Book chapter"]}
-    for yr in year_ranges
-}
-
-# ==== Iterate and Count ====
-for _, row in data.iterrows():
-    year = row.get("Year", None)
-    doc_type = row.get("Document Type", "")
-    if pd.isna(year) or doc_type not in ["Article", "Conference paper", "Book chapter"]:
-        continue
-
-    # Find year slot
-    for range_label, (start, end) in year_ranges.items():
-        if start <= year <= end:
-            # Combine text fields
-            text = f"{row['Abstract']} {row['Author Keywords']} {row['Index Keywords']}"
-
-            # Check techniques
-            for raw_tech in techniques_raw:
-                canonical_tech = technique_aliases.get(raw_tech, raw_tech)
-                if raw_tech in text:
-                    technique_doc_count[range_label][doc_type][canonical_tech] += 1
-
-            # Check goals
-            for raw_goal in goals_raw:
-                canonical_goal = goal_aliases.get(raw_goal, raw_goal)
-                if raw_goal in text:
-                    goal_doc_count[range_label][doc_type][canonical_goal] += 1
-
-# ==== Prepare Output ====
-output_data = []
-
-for yr in year_ranges:
-    for doc_type in ["Article", "Conference paper", "Book chapter"]:
-        top_techniques = sorted(technique_doc_count[yr][doc_type].items(), key=lambda x: x[1], reverse=True)[:6]
-        top_goals = sorted(goal_doc_count[yr][doc_type].items(), key=lambda x: x[1], reverse=True)[:5]
-
-        for tech, count in top_techniques:
-            if count > 0:
-                output_data.append([yr, doc_type, "Technique", tech, count])
-        for goal, count in top_goals:
-            if count > 0:
-                output_data.append([yr, doc_type, "Goal", goal, count])
-
-# ==== Export to Excel ====
-df_results = pd.DataFrame(output_data, columns=["Year Range", "Document Type", "Category", "Name", "Count"])
-df_results.to_excel(output_file_path, index=False)
-
-print(f"✅ Filtered data with alias normalization saved to: {output_file_path}")
+doc_types = ["Article", "Conference paper", "Book chapter"]
+
+if __name__ == "__main__":
+    # ==== Count per Year and Document Type ====
+    # Matches go into a (year x document type x keyword) cube. With the index
+    # they are looked up in its postings; otherwise the CSV is streamed and
+    # each chunk matched into a cube, and chunk cubes are summed. Year ranges
+    # are then slices of the cube. Keyword counts use the spelling counts, so
+    # every matching spelling is counted, as before.
+    metrics = RunMetrics("5.3.2", metrics_dir, profile=profile_matching)
+    if use_index:
+        with metrics.stage("load") as record:
+            index = CorpusIndex.load(file_path)
+            docs = index.select(doc_types=doc_types)
+            periods = assign_periods(index.years[docs], year_ranges)
+            docs = docs[pd.notna(periods)]
+            record["rows"] += index.n_docs
+        with metrics.stage("match", rows=len(docs), profile=True):
+            incidence = index.incidence(matcher, docs)
+        with metrics.stage("aggregate", rows=len(docs)):
+            cube = KeywordCube.from_incidence(incidence, doc_type_labels=doc_types)
+    else:
+        cube = None
+        cache = open_match_cache(cache_dir, "5.3.2")
+        chunks = read_typed_corpus_chunks(file_path, chunksize=chunk_size)
+        for data in metrics.timed(chunks, "load", bytes_read=os.path.getsize(file_path)):
+            with metrics.stage("normalize", rows=len(data)):
+                periods = assign_periods(data["Year"], year_ranges)
+                keep = pd.notna(periods) & data["Document Type"].isin(doc_types).to_numpy()
+                data = data[keep]
+
+                # Text columns arrive lowercased from the typed reader
+                text = corpus_texts(data, ['Abstract', 'Author Keywords', 'Index Keywords'])
+            with metrics.stage("match", rows=len(text), profile=True):
+                incidence = build_incidence(
+                    text, matcher, years=data["Year"], doc_types=data["Document Type"], cache=cache
+                )
+            with metrics.stage("aggregate", rows=len(text)):
+                chunk_cube = KeywordCube.from_incidence(incidence, doc_type_labels=doc_types)
+                cube = chunk_cube if cube is None else cube + chunk_cube
+        if cache is not None:
+            cache.save()
+
+    # ==== Prepare Output ====
+    with metrics.stage("aggregate"):
+        output_data = top_goals_techniques_rows(cube, year_ranges, doc_types, k_techniques=6, k_goals=5)
+
+    # ==== Export to Excel ====
+    with metrics.stage("export", rows=len(output_data)):
+        write_excel_rows(output_file_path, TOP_GOALS_TECHNIQUES_COLUMNS, output_data)
+
+    print(f"✅ Filtered data with alias normalization saved to: {output_file_path}")
+
+    # ==== Charts per Year Range and Document Type ====
+    if chart_dir:
+        charts = top_goals_techniques_charts(output_data, year_ranges, doc_types, chart_dir, dpi=chart_dpi)
+        with metrics.stage("plot", rows=len(charts)):
+            render_charts(charts)
+        print(f"✅ {len(charts)} charts saved to: {chart_dir}")
+
+    report_path = metrics.write()
+    if report_path:
+        print(f"✅ Run metrics saved to: {report_path}")
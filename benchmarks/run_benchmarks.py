@@ -0,0 +1,240 @@
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from benchmarks.synthetic_corpus import write_corpus_csv, write_workbook
+from mec_analysis.periods import DEFAULT_YEAR_RANGES
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPLITTER = os.path.join(REPO, "5.3.1", "Splitting Dataset into 5 Time periods", "dataset splitting code.py")
+SCRIPTS = {name: os.path.join(REPO, name, f"{name}.py") for name in ["5.2.2", "5.2.3", "5.3.1", "5.3.2", "5.3.3"]}
+
+# File names the scripts expect in their working directory
+CORPUS_CSV = "Mobile Edge computing dataset.csv"
+INPUT_5_2_3 = "Input containing Top 100 recommended papers From 2011-2024 of Mobile Edge Computing.xlsx"
+STORE_5_3_1 = os.path.join("Splitting Dataset into 5 Time periods", "period_store")
+BOOKS_5_3_3 = {label.replace("_", "-"): "Top  10 Papers from Year span\\" + label.replace("_", "-") + ".xlsx"
+               for label in DEFAULT_YEAR_RANGES}
+
+# Committed outputs and where each script writes them
+COMMITTED = {
+    "5.2.3": ("5.2.3/Keyword_Counts_Cleaned.xlsx", "Keyword_Counts_Cleaned.xlsx"),
+    "5.3.3": ("5.3.3/stacked_keyword_occurrences_data.csv", "stacked_keyword_occurrences_data.csv"),
+    "5.3.1": ("5.3.1/combined_goal_technique_analysis.csv",
+              os.path.join("Splitting Dataset into 5 Time periods", "combined_goal_technique_analysis.csv")),
+    "5.3.2": ("5.3.2/top_goals_techniques_filtered.xlsx", "top_goals_techniques_filtered.xlsx"),
+}
+
+SIZES = {"3.4k": 3_400, "100k": 100_000, "1M": 1_000_000}
+
+# Runs a script as __main__ and reports its peak memory (and that of its worker processes)
+CHILD = """
+import json, runpy, sys, time
+script, report = sys.argv[1], sys.argv[2]
+sys.argv = [script] + sys.argv[3:]
+start = time.perf_counter()
+runpy.run_path(script, run_name="__main__")
+result = {"script_s": time.perf_counter() - start}
+try:
+    import resource
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB elsewhere
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+    result["workers_peak_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2**20
+except ImportError:
+    pass
+with open(report, "w") as f:
+    json.dump(result, f)
+"""
+
+
+def run_script(script, cwd, args=()):
+    """Run ``script`` in ``cwd``; return wall time, peak memory and status."""
+    fd, report = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, MPLBACKEND="Agg")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", CHILD, script, report, *args], cwd=cwd, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    result = {"wall_s": round(time.perf_counter() - start, 3), "status": "ok" if proc.returncode == 0 else "failed"}
+    if proc.returncode == 0:
+        with open(report) as f:
+            result.update({key: round(value, 3) for key, value in json.load(f).items()})
+    else:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ""
+    os.remove(report)
+    return result
+
+
+def prepare_inputs(script, workdir, corpus_csv=None, n_records=None, xlsx_rows=None, seed=0):
+    """Lay out ``workdir`` the way ``script`` expects its inputs.
+
+    CSV-based scripts get ``corpus_csv``; the Excel-based ones (5.2.3, 5.3.3)
+    get synthetic workbooks of ``min(n_records, xlsx_rows)`` rows, or the
+    committed workbooks when ``n_records`` is None.
+    """
+    os.makedirs(workdir, exist_ok=True)
+    if script in ("5.2.2", "5.3.2", "5.3.1"):
+        shutil.copyfile(corpus_csv, os.path.join(workdir, CORPUS_CSV))
+    elif script == "5.2.3":
+        target = os.path.join(workdir, INPUT_5_2_3)
+        if n_records is None:
+            shutil.copyfile(os.path.join(REPO, "5.2.3", INPUT_5_2_3), target)
+        else:
+            write_workbook(target, min(n_records, xlsx_rows), seed)
+    elif script == "5.3.3":
+        for i, (label, name) in enumerate(BOOKS_5_3_3.items()):
+            target = os.path.join(workdir, name)
+            if n_records is None:
+                source = os.path.join(REPO, "5.3.3", "Top  10 Papers from Year span", f"{label}.xlsx")
+                os.makedirs(os.path.dirname(target) or workdir, exist_ok=True)
+                shutil.copyfile(source, target)
+            else:
+                year_range = DEFAULT_YEAR_RANGES[label.replace("-", "_")]
+                write_workbook(target, min(n_records // len(BOOKS_5_3_3), xlsx_rows), seed + i, year_range)
+
+
+def run_analysis(script, workdir):
+    """Run one analysis end to end; 5.3.1 includes splitting the corpus into its period store."""
+    results = []
+    if script == "5.3.1":
+        split = run_script(SPLITTER, workdir, ["--input", CORPUS_CSV, "--output", STORE_5_3_1])
+        results.append(("5.3.1 split", split))
+        if split["status"] != "ok":
+            return results
+    results.append((script, run_script(SCRIPTS[script], workdir)))
+    return results
+
+
+def _top_k_summary(items_by_group):
+    # Equal counts at the cut-off of a top-k list may be broken either way, so
+    # compare the counts and only the names ranked strictly above the cut-off
+    summary = {}
+    for group, items in items_by_group.items():
+        counts = sorted((count for _, count in items), reverse=True)
+        cut = counts[-1] if counts else None
+        summary[group] = (counts, sorted(name for name, count in items if count > cut))
+    return summary
+
+
+def _top_k_items(script, df):
+    items = {}
+    if script == "5.3.1":
+        n_techniques = sum(c.startswith("Technique ") for c in df.columns)
+        for _, row in df.iterrows():
+            group = (row["Time Period"], row["Goal"], int(row["Goal Occurrence"]))
+            items[group] = [(row[f"Technique {i}"], int(row[f"Count {i}"])) for i in range(1, n_techniques + 1)
+                            if pd.notna(row[f"Technique {i}"])]
+    else:
+        for group, rows in df.groupby(["Year Range", "Document Type", "Category"]):
+            items[group] = list(zip(rows["Name"], rows["Count"].astype(int)))
+    return items
+
+
+def outputs_match(script, expected_path, actual_path):
+    """Compare a script output with the committed one (tie order of top-k tables ignored)."""
+    read = pd.read_csv if expected_path.endswith(".csv") else pd.read_excel
+    expected, actual = read(expected_path), read(actual_path)
+    if script in ("5.3.1", "5.3.2"):
+        return _top_k_summary(_top_k_items(script, expected)) == _top_k_summary(_top_k_items(script, actual))
+    return expected.fillna("").astype(str).equals(actual.fillna("").astype(str))
+
+
+def check_committed(workdir, dataset=None):
+    """Re-run the analyses on their committed inputs and compare with the committed outputs.
+
+    5.2.3 and 5.3.3 use the workbooks in the repository. 5.3.1 and 5.3.2 need
+    the full Scopus export (``dataset``), which is not committed.
+    """
+    rows = []
+    for script, (expected, output) in COMMITTED.items():
+        if script in ("5.3.1", "5.3.2") and dataset is None:
+            rows.append({"size": "committed", "script": script, "status": "skipped (no --dataset)"})
+            continue
+        script_dir = os.path.join(workdir, "committed", script)
+        shutil.rmtree(script_dir, ignore_errors=True)
+        prepare_inputs(script, script_dir, corpus_csv=dataset)
+        for name, result in run_analysis(script, script_dir):
+            if name == script and result["status"] == "ok":
+                same = outputs_match(script, os.path.join(REPO, expected), os.path.join(script_dir, output))
+                result["status"] = "ok, matches committed" if same else "MISMATCH"
+            rows.append({"size": "committed", "script": name, **result})
+    return rows
+
+
+def run_benchmarks(sizes, scripts, workdir, xlsx_rows=20_000, seed=0, repeat=1):
+    """Benchmark ``scripts`` on synthetic corpora of each size; return one row per run.
+
+    Every size gets fresh working directories, so the first run of a script is
+    cold (no match cache); further ``repeat`` runs reuse the cache.
+    """
+    rows = []
+    for size_label, n_records in sizes.items():
+        size_dir = os.path.join(workdir, size_label)
+        shutil.rmtree(size_dir, ignore_errors=True)
+        os.makedirs(size_dir)
+        corpus_csv = os.path.join(size_dir, CORPUS_CSV)
+        start = time.perf_counter()
+        write_corpus_csv(corpus_csv, n_records, seed)
+        print(f"Generated {n_records} records in {time.perf_counter() - start:.1f}s")
+
+        for script in scripts:
+            script_dir = os.path.join(size_dir, script)
+            prepare_inputs(script, script_dir, corpus_csv, n_records, xlsx_rows, seed)
+            for run in range(1, repeat + 1):
+                for name, result in run_analysis(script, script_dir):
+                    row = {"size": size_label, "records": n_records, "script": name, "run": run, **result}
+                    print(f"  {name:12} run {run}: {result['wall_s']:8.2f}s  "
+                          f"{result.get('peak_rss_mb', float('nan')):8.1f} MB  {result['status']}")
+                    rows.append(row)
+    return rows
+
+
+RESULT_FIELDS = ["size", "records", "script", "run", "status", "wall_s", "script_s", "peak_rss_mb",
+                 "workers_peak_rss_mb", "error"]
+
+
+def write_results(rows, output_path):
+    fields = list(dict.fromkeys(RESULT_FIELDS + [key for row in rows for key in row]))
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile the analysis scripts.")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES),
+                        help=f"corpus sizes: {', '.join(SIZES)} or a record count (default: all)")
+    parser.add_argument("--scripts", nargs="+", default=list(SCRIPTS), choices=list(SCRIPTS))
+    parser.add_argument("--workdir", default=os.path.join(REPO, "benchmarks", ".work"))
+    parser.add_argument("--output", default="benchmark_results.csv", help="results CSV")
+    parser.add_argument("--xlsx-rows", type=int, default=20_000,
+                        help="maximum rows of the synthetic workbooks for 5.2.3 and 5.3.3")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per script (later runs are warm)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dataset", help="full Scopus CSV, to also check 5.3.1 and 5.3.2 against committed results")
+    parser.add_argument("--skip-check", action="store_true", help="do not compare with the committed results")
+    args = parser.parse_args()
+
+    sizes = {size: SIZES[size] if size in SIZES else int(size) for size in args.sizes}
+    rows = []
+    if not args.skip_check:
+        print("Checking outputs against committed results")
+        rows += check_committed(args.workdir, args.dataset)
+        for row in rows:
+            print(f"  {row['script']:12} {row['status']}")
+    rows += run_benchmarks(sizes, args.scripts, args.workdir, args.xlsx_rows, args.seed, args.repeat)
+
+    write_results(rows, args.output)
+    print(f"✅ Benchmark results saved to: {args.output}")
+    if any(row["status"] in ("failed", "MISMATCH") for row in rows):
+        sys.exit(1)
@@ -0,0 +1,149 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mec_analysis.periods import DEFAULT_YEAR_RANGES
+from mec_analysis.taxonomy import GOALS_RAW, TECHNIQUES_RAW
+
+# Taxonomy terms (with their alias spellings) as used by the analysis scripts
+GOAL_TERMS = GOALS_RAW
+TECHNIQUE_TERMS = TECHNIQUES_RAW
+
+# Frequent keywords that are not part of the taxonomy
+OTHER_KEYWORDS = [
+    "mobile edge computing", "edge computing", "internet of things", "cloud computing",
+    "5g mobile communication systems", "mobile computing", "fog computing", "vehicular networks",
+    "latency", "edge server", "unmanned aerial vehicles (uav)", "wireless networks", "digital storage",
+    "servers", "energy harvesting", "blockchain", "network function virtualization", "caching",
+    "federated learning", "stochastic systems", "lyapunov methods", "queueing theory", "throughput",
+    "internet of vehicles", "software defined networking", "smart city", "augmented reality",
+    "mobile devices", "cellular network", "data privacy", "virtual machine", "base stations",
+]
+
+VOCABULARY = (
+    "the a an of in on for with to and by from under over via this that these our we propose present "
+    "study paper approach framework scheme method model system network networks mobile edge cloud user "
+    "users device devices task tasks server servers latency delay energy cost performance results show "
+    "simulation simulations numerical proposed existing baseline scheme algorithm algorithms problem "
+    "formulate formulated jointly joint minimize maximize optimal efficient effective novel based "
+    "distributed centralized computing communication wireless channel data traffic load offloading "
+    "resource resources allocation computation service services application applications vehicle "
+    "vehicles access point points base station stations architecture design analysis evaluation "
+    "significantly improve improves improvement reduce reduces reduction compared against outperforms "
+    "under different scenarios dynamic environment environments heterogeneous multi-user multi-server "
+    "constraint constraints deadline deadlines quality requirements demand demands capacity limited"
+).split()
+
+DOC_TYPES = ["Conference paper", "Article", "Book chapter", "Review", "Conference review", "Book"]
+DOC_TYPE_WEIGHTS = [0.6, 0.3, 0.04, 0.03, 0.02, 0.01]
+
+CORPUS_FIELDS = ["Title", "Year", "DOI", "Abstract", "Author Keywords", "Index Keywords", "Document Type"]
+
+
+def _zipf_weights(n, exponent, rng):
+    # Zipf-like popularity over a random ranking of the terms
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+class CorpusGenerator:
+    """Draws Scopus-like records with the columns the analysis scripts read.
+
+    Abstracts are about 1.3k characters (log-normal), built from a pool of
+    pre-generated sentences with a few taxonomy terms mixed in; Author
+    Keywords hold 2-8 and Index Keywords 9-20 ``"; "``-separated terms. Term
+    popularity follows a Zipf-like law, and later years hold more papers.
+    """
+
+    def __init__(self, seed=0, n_sentences=4000):
+        self.rng = np.random.default_rng(seed)
+        self.terms = GOAL_TERMS + TECHNIQUE_TERMS
+        self.term_weights = _zipf_weights(len(self.terms), 1.1, self.rng)
+        self.keywords = self.terms + OTHER_KEYWORDS
+        self.keyword_weights = np.concatenate([self.term_weights * 0.5,
+                                               _zipf_weights(len(OTHER_KEYWORDS), 0.9, self.rng) * 0.5])
+        words = self.rng.choice(VOCABULARY, size=(n_sentences, 16))
+        lengths = self.rng.integers(8, 17, size=n_sentences)
+        self.sentences = np.array([
+            " ".join(row[:length]).capitalize() + "." for row, length in zip(words, lengths)
+        ], dtype=object)
+        self.next_id = 0
+
+    def _years(self, n, year_range=None):
+        start, end = year_range or (min(r[0] for r in DEFAULT_YEAR_RANGES.values()),
+                                    max(r[1] for r in DEFAULT_YEAR_RANGES.values()))
+        years = np.arange(start, end + 1)
+        weights = (years - start + 1.0) ** 2
+        return self.rng.choice(years, size=n, p=weights / weights.sum())
+
+    def _keyword_lists(self, n, low, high, missing=0.0):
+        counts = self.rng.integers(low, high + 1, size=n)
+        drawn = self.rng.choice(len(self.keywords), size=counts.sum(), p=self.keyword_weights)
+        splits = np.split(drawn, np.cumsum(counts)[:-1])
+        lists = ["; ".join(dict.fromkeys(self.keywords[i] for i in ids)) for ids in splits]
+        if missing:
+            return [None if drop else kw for kw, drop in zip(lists, self.rng.random(n) < missing)]
+        return lists
+
+    def _abstracts(self, n):
+        n_sentences = np.clip(np.round(self.rng.lognormal(np.log(12), 0.35, size=n)), 4, 40).astype(int)
+        sentence_ids = self.rng.integers(0, len(self.sentences), size=n_sentences.sum())
+        n_terms = self.rng.poisson(1.5, size=n)
+        term_ids = self.rng.choice(len(self.terms), size=n_terms.sum(), p=self.term_weights)
+        abstracts = []
+        s = t = 0
+        for n_s, n_t in zip(n_sentences, n_terms):
+            parts = list(self.sentences[sentence_ids[s:s + n_s]])
+            for term in term_ids[t:t + n_t]:
+                parts.insert(self.rng.integers(0, len(parts) + 1), f"We consider {self.terms[term]}.")
+            abstracts.append(" ".join(parts))
+            s, t = s + n_s, t + n_t
+        return abstracts
+
+    def records(self, n, year_range=None):
+        """Return ``n`` records as a DataFrame (years within ``year_range`` if given)."""
+        ids = np.arange(self.next_id, self.next_id + n)
+        self.next_id += n
+        return pd.DataFrame({
+            "Title": [f"Synthetic paper {i}" for i in ids],
+            "Year": self._years(n, year_range),
+            "DOI": [f"10.5555/synthetic.{i}" for i in ids],
+            "Abstract": self._abstracts(n),
+            "Author Keywords": self._keyword_lists(n, 2, 8, missing=0.2),
+            "Index Keywords": self._keyword_lists(n, 9, 20, missing=0.02),
+            "Document Type": self.rng.choice(DOC_TYPES, size=n, p=DOC_TYPE_WEIGHTS),
+        }, columns=CORPUS_FIELDS)
+
+
+def write_corpus_csv(path, n_records, seed=0, chunksize=50_000):
+    """Write a synthetic corpus of ``n_records`` rows to ``path``, chunk by chunk."""
+    generator = CorpusGenerator(seed)
+    for start in range(0, max(n_records, 1), chunksize):
+        n = min(chunksize, n_records - start)
+        generator.records(n).to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    return path
+
+
+def write_workbook(path, n_records, seed=0, year_range=None):
+    """Write ``n_records`` synthetic records as an Excel workbook."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    CorpusGenerator(seed).records(n_records, year_range).to_excel(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Scopus-like corpus CSV.")
+    parser.add_argument("records", type=int, help="number of records")
+    parser.add_argument("--output", default="Mobile Edge computing dataset.csv", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_corpus_csv(args.output, args.records, args.seed)
+    print(f"✅ Synthetic corpus ({args.records} records) saved to: {args.output}")
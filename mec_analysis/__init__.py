@@ -0,0 +1 @@
+"""Shared helpers for the Mobile Edge Computing thesis analysis scripts."""
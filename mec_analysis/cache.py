@@ -0,0 +1,156 @@
+import hashlib
+import os
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+
+from mec_analysis.matcher import KeywordMatcher
+
+
+def text_key(text):
+    """Content address of a document's combined text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class MatchCache:
+    """Persistent record of which raw terms each document text contains.
+
+    Documents are keyed by a hash of their text. Terms are only ever appended,
+    and each document remembers how many terms it has been scanned against,
+    so adding a term to ``goals_raw``/``techniques_raw`` only scans that term,
+    and an unchanged dataset is not scanned at all. Hits are stored per raw
+    spelling; aliases are applied afterwards by the matcher, so changing an
+    alias map never requires a rescan.
+
+    Only the documents looked up since the cache was opened are written
+    back by :meth:`save`, so entries of edited or removed documents are
+    dropped and the file stays the size of the current dataset.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.terms = []
+        self.term_index = {}
+        self.row_of = {}
+        self._keys = []
+        self._scanned = np.zeros(0, dtype=np.int32)
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        self._updated = {}  # row -> (scanned, hits) changed since load
+        self._touched = set()  # rows looked up since load
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with np.load(self.path, allow_pickle=False) as stored:
+            self.terms = stored["terms"].tolist()
+            self._keys = [k.tobytes() for k in stored["keys"]]
+            self._scanned = stored["scanned"]
+            self._indptr = stored["indptr"]
+            self._indices = stored["indices"]
+        self.term_index = {term: i for i, term in enumerate(self.terms)}
+        self.row_of = {key: row for row, key in enumerate(self._keys)}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _row_state(self, row):
+        if row in self._updated:
+            return self._updated[row]
+        if row >= len(self._scanned):
+            return 0, []
+        return int(self._scanned[row]), self._indices[self._indptr[row]:self._indptr[row + 1]].tolist()
+
+    def term_matrix(self, texts, matcher):
+        """Return the document x ``matcher.terms`` hit matrix for ``texts``.
+
+        Only documents never seen before, or terms they were not yet scanned
+        against, are matched; everything else comes from the cache.
+        """
+        texts = list(texts)
+        for term in matcher.terms:
+            if term not in self.term_index:
+                self.term_index[term] = len(self.terms)
+                self.terms.append(term)
+        n_terms = len(self.terms)
+
+        rows = []
+        for text in texts:
+            key = text_key(text)
+            if key not in self.row_of:
+                self.row_of[key] = len(self._keys)
+                self._keys.append(key)
+            rows.append(self.row_of[key])
+        self._touched.update(rows)
+
+        # Scan stale documents against the terms added since their last scan
+        stale = defaultdict(dict)
+        for i, row in enumerate(rows):
+            scanned, _ = self._row_state(row)
+            if scanned < n_terms:
+                stale[scanned][row] = texts[i]
+        for scanned, stale_texts in stale.items():
+            new_terms = KeywordMatcher(self.terms[scanned:], [])  # term ids offset by `scanned`
+            for row, text in stale_texts.items():
+                _, hits = self._row_state(row)
+                found = sorted(scanned + t for t in new_terms.find_term_ids(text))
+                self._updated[row] = (n_terms, hits + found)
+
+        # Map cache term columns onto the matcher's term order
+        column = np.full(n_terms, -1, dtype=np.int64)
+        column[[self.term_index[t] for t in matcher.terms]] = np.arange(len(matcher.terms))
+        indptr = [0]
+        indices = []
+        for row in rows:
+            cols = column[self._row_state(row)[1]]
+            indices.extend(cols[cols >= 0].tolist())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(texts), len(matcher.terms)),
+        )
+
+    def save(self):
+        """Write the documents looked up in this run back to ``self.path`` (atomically).
+
+        Nothing is written if no document was looked up, or if nothing was
+        scanned and no entry is stale.
+        """
+        if not self._touched or (not self._updated and len(self._touched) == len(self._keys)):
+            return
+        kept = sorted(self._touched)
+        scanned = np.zeros(len(kept), dtype=np.int32)
+        indptr = np.zeros(len(kept) + 1, dtype=np.int64)
+        indices = []
+        for new_row, row in enumerate(kept):
+            row_scanned, hits = self._row_state(row)
+            scanned[new_row] = row_scanned
+            indices.extend(hits)
+            indptr[new_row + 1] = len(indices)
+        self._keys = [self._keys[row] for row in kept]
+        self.row_of = {key: row for row, key in enumerate(self._keys)}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            terms=np.asarray(self.terms, dtype=str),
+            keys=np.frombuffer(b"".join(self._keys), dtype=np.uint8).reshape(-1, 16),
+            scanned=scanned,
+            indptr=indptr,
+            indices=np.asarray(indices, dtype=np.int32),
+        )
+        os.replace(tmp_path, self.path)
+        self._scanned, self._indptr, self._indices = scanned, indptr, np.asarray(indices, dtype=np.int32)
+        self._updated = {}
+        self._touched = set(range(len(self._keys)))
+
+
+def open_match_cache(cache_dir, name):
+    """Return the cache ``name`` inside ``cache_dir``, or None when ``cache_dir`` is None."""
+    if cache_dir is None:
+        return None
+    return MatchCache(os.path.join(cache_dir, f"{name}.npz"))
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+
+from mec_analysis.parallel import parallel_map
+
+# Colors of consecutive series (e.g. year ranges) in stacked charts
+SERIES_COLORS = colormaps["tab10"].colors
+
+
+def _format_count(value):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+class BarChart:
+    """A (stacked) bar chart of counts, drawn without pyplot.
+
+    ``series`` maps series names to one value per category and is stacked in
+    order; a plain list of values is a single unnamed series. ``colors`` holds
+    one color per series, or one per bar for a single series.
+    ``value_labels`` puts the counts inside each segment ("center", zeros
+    left unlabelled) or above each bar ("top"); None draws no labels.
+    ``legend`` is a list of ``(label, color)`` entries and defaults to the
+    series names when there are several. ``tick_colors`` colors the category
+    labels.
+
+    The figure is drawn on its own Agg canvas, so charts need no display and
+    share no global state; that is what lets :func:`render_charts` draw many
+    of them in worker processes.
+    """
+
+    def __init__(self, output_path, categories, series, colors=None, title=None, xlabel=None, ylabel=None,
+                 value_labels="center", tick_colors=None, legend=None, legend_title=None, legend_loc="best",
+                 figsize=(18, 8), dpi=300, tick_rotation=45, tick_ha="right", tick_fontsize=9, grid=False):
+        self.output_path = output_path
+        self.categories = list(categories)
+        self.series = dict(series) if isinstance(series, dict) else {None: list(series)}
+        self.colors = list(colors) if colors is not None else None
+        self.title, self.xlabel, self.ylabel = title, xlabel, ylabel
+        self.value_labels = value_labels
+        self.tick_colors = tick_colors
+        self.legend, self.legend_title, self.legend_loc = legend, legend_title, legend_loc
+        self.figsize, self.dpi = figsize, dpi
+        self.tick_rotation, self.tick_ha, self.tick_fontsize = tick_rotation, tick_ha, tick_fontsize
+        self.grid = grid
+
+    def _series_colors(self):
+        if self.colors is None:
+            return [SERIES_COLORS[i % len(SERIES_COLORS)] for i in range(len(self.series))]
+        if len(self.series) == 1 and len(self.colors) == len(self.categories):
+            return [self.colors]
+        return [self.colors[i % len(self.colors)] for i in range(len(self.series))]
+
+    def draw(self, figure):
+        ax = figure.add_subplot()
+        positions = np.arange(len(self.categories))
+        bottoms = np.zeros(len(self.categories))
+        bars = None
+        for (name, values), color in zip(self.series.items(), self._series_colors()):
+            values = np.asarray(values, dtype=float)
+            bars = ax.bar(positions, values, bottom=bottoms, color=color, label=name)
+            if self.value_labels == "center":
+                # One call labels every segment of the series
+                labels = [_format_count(v) if v > 0 else "" for v in values]
+                ax.bar_label(bars, labels=labels, label_type="center", fontsize=8, color="white")
+            bottoms = bottoms + values
+        if self.value_labels == "top" and bars is not None:
+            ax.bar_label(bars, labels=[_format_count(v) for v in bottoms], padding=2, fontsize=8)
+
+        ax.set_xticks(positions, self.categories, rotation=self.tick_rotation, ha=self.tick_ha,
+                      fontsize=self.tick_fontsize)
+        if self.tick_colors is not None:
+            for tick_label, color in zip(ax.get_xticklabels(), self.tick_colors):
+                tick_label.set_color(color)
+        if self.xlabel:
+            ax.set_xlabel(self.xlabel, fontsize=12)
+        if self.ylabel:
+            ax.set_ylabel(self.ylabel, fontsize=12)
+        if self.title:
+            ax.set_title(self.title, fontsize=14)
+        if self.legend is not None:
+            handles = [Patch(color=color, label=label) for label, color in self.legend]
+            ax.legend(handles=handles, title=self.legend_title, loc=self.legend_loc, fontsize=10)
+        elif len(self.series) > 1:
+            ax.legend(title=self.legend_title, loc=self.legend_loc)
+        figure.tight_layout()
+        if self.grid:
+            ax.grid(axis="y", linestyle="--", alpha=0.6)
+        return ax
+
+    def render(self):
+        """Draw the chart and save it to ``output_path``; returns the path."""
+        figure = Figure(figsize=self.figsize)
+        FigureCanvasAgg(figure)
+        self.draw(figure)
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        figure.savefig(self.output_path, dpi=self.dpi)
+        return self.output_path
+
+
+def render_chart(chart):
+    return chart.render()
+
+
+def render_charts(charts, workers=None):
+    """Render ``charts`` across a process pool; returns their output paths.
+
+    ``workers`` is passed to :func:`~mec_analysis.parallel.parallel_map`; a
+    single chart is rendered in this process.
+    """
+    return parallel_map(render_chart, charts, workers)
@@ -0,0 +1,167 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mec_analysis.ranking import axis_codes, top_k
+
+# Document-type label used when the rows are not split by document type
+ALL_DOC_TYPES = "All"
+
+
+class CooccurrenceTensor:
+    """Goal x technique co-occurrence counts per (period x document type).
+
+    ``pairs`` is a sparse ``(periods * doc_types * goals) x techniques``
+    matrix: row ``(p * len(doc_types) + d) * len(goals) + g`` holds the
+    number of documents of group ``(p, d)`` mentioning goal ``g`` together
+    with each technique, built with one sparse product of the goal and
+    technique incidence matrices. Per-keyword counts are kept in the
+    :class:`~mec_analysis.cube.KeywordCube`. Tensors of different chunks,
+    files or worker processes combine with ``+``.
+    """
+
+    def __init__(self, goals, techniques, periods, doc_types, pairs):
+        self.goals = list(goals)
+        self.techniques = list(techniques)
+        self.periods = list(periods)
+        self.doc_types = list(doc_types)
+        self.pairs = pairs
+
+    @property
+    def n_goals(self):
+        return len(self.goals)
+
+    @property
+    def shape(self):
+        return len(self.periods), len(self.doc_types), len(self.goals), len(self.techniques)
+
+    @classmethod
+    def from_incidence(cls, incidence, periods, doc_types=None, period_labels=None, doc_type_labels=None):
+        """Count an :class:`~mec_analysis.incidence.Incidence` in one pass.
+
+        ``periods``/``doc_types`` label each row (``doc_types=None`` puts every
+        row under :data:`ALL_DOC_TYPES`). ``period_labels``/``doc_type_labels``
+        fix the axes; rows outside them, or with a missing label, are not
+        counted. Without them the axes are the labels seen, in order.
+        """
+        n_docs = incidence.n_docs
+        if doc_types is None:
+            doc_types = np.full(n_docs, ALL_DOC_TYPES, dtype=object)
+            doc_type_labels = doc_type_labels or [ALL_DOC_TYPES]
+        period_codes, period_labels = axis_codes(periods, period_labels)
+        doc_type_codes, doc_type_labels = axis_codes(doc_types, doc_type_labels)
+        n_groups = len(period_labels) * len(doc_type_labels)
+
+        # Route every (document, goal) hit to the row of its group's goal, then
+        # multiply by the technique incidence: row g * n_goals + goal of the
+        # product is that goal's technique co-occurrence within group g.
+        n_goals = incidence.matcher.n_goals
+        doc_group = np.where((period_codes >= 0) & (doc_type_codes >= 0),
+                             period_codes * len(doc_type_labels) + doc_type_codes, -1)
+        goal_hits = incidence.goal_matrix.tocoo()
+        keep = doc_group[goal_hits.row] >= 0
+        doc_goal = sparse.csr_matrix(
+            (
+                np.ones(int(keep.sum()), dtype=np.int64),
+                (doc_group[goal_hits.row[keep]] * n_goals + goal_hits.col[keep], goal_hits.row[keep]),
+            ),
+            shape=(n_groups * n_goals, n_docs),
+        )
+        pairs = (doc_goal @ incidence.technique_matrix.astype(np.int64)).tocsr()
+        return cls(incidence.goals, incidence.techniques, period_labels, doc_type_labels, pairs)
+
+    def reindex(self, periods, doc_types):
+        """Return this tensor on the (superset) axes ``periods`` x ``doc_types``."""
+        period_pos = pd.Index(periods, dtype=object).get_indexer(self.periods)
+        doc_type_pos = pd.Index(doc_types, dtype=object).get_indexer(self.doc_types)
+        if (period_pos < 0).any() or (doc_type_pos < 0).any():
+            raise ValueError("reindex axes must contain the current labels")
+        new_group = (period_pos[:, None] * len(doc_types) + doc_type_pos[None, :]).ravel()
+        pairs = self.pairs.tocoo()
+        pair_rows = new_group[pairs.row // self.n_goals] * self.n_goals + pairs.row % self.n_goals
+        pairs = sparse.csr_matrix(
+            (pairs.data, (pair_rows, pairs.col)),
+            shape=(len(periods) * len(doc_types) * self.n_goals, len(self.techniques)),
+        )
+        return CooccurrenceTensor(self.goals, self.techniques, periods, doc_types, pairs)
+
+    def __add__(self, other):
+        if self.goals != other.goals or self.techniques != other.techniques:
+            raise ValueError("Cannot add co-occurrence tensors over different keywords")
+        periods = list(dict.fromkeys(self.periods + other.periods))
+        doc_types = list(dict.fromkeys(self.doc_types + other.doc_types))
+        left, right = self.reindex(periods, doc_types), other.reindex(periods, doc_types)
+        return CooccurrenceTensor(self.goals, self.techniques, periods, doc_types, left.pairs + right.pairs)
+
+    def rollup(self, period_of, period_labels=None):
+        """Sum the periods into coarser ones, e.g. years into year ranges.
+
+        ``period_of`` maps a current period label to its new label; periods
+        it does not map are dropped. ``period_labels`` fixes the new axis
+        (otherwise the new labels in order of appearance).
+        """
+        new_labels = [period_of[p] for p in self.periods if p in period_of]
+        period_labels = list(dict.fromkeys(new_labels)) if period_labels is None else list(period_labels)
+        codes = np.array([period_labels.index(period_of[p]) if period_of.get(p) in period_labels else -1
+                          for p in self.periods], dtype=np.int64)
+
+        # Pair rows are (period * doc_types + doc_type) * n_goals + goal
+        pairs = self.pairs.tocoo()
+        rows_per_period = len(self.doc_types) * self.n_goals
+        new_period = codes[pairs.row // rows_per_period]
+        keep = new_period >= 0
+        pairs = sparse.csr_matrix(
+            (pairs.data[keep], (new_period[keep] * rows_per_period + pairs.row[keep] % rows_per_period,
+                                pairs.col[keep])),
+            shape=(len(period_labels) * rows_per_period, len(self.techniques)),
+        )
+        return CooccurrenceTensor(self.goals, self.techniques, period_labels, self.doc_types, pairs)
+
+    def save(self, tensor_dir):
+        """Write the tensor to ``tensor_dir`` (pairs.npz and meta.json)."""
+        tmp_dir = tensor_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        sparse.save_npz(os.path.join(tmp_dir, "pairs.npz"), self.pairs)
+        meta = {"goals": self.goals, "techniques": self.techniques, "periods": self.periods,
+                "doc_types": self.doc_types}
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(tensor_dir, ignore_errors=True)
+        os.replace(tmp_dir, tensor_dir)
+        return tensor_dir
+
+    @classmethod
+    def load(cls, tensor_dir):
+        with open(os.path.join(tensor_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        pairs = sparse.load_npz(os.path.join(tensor_dir, "pairs.npz")).tocsr()
+        return cls(meta["goals"], meta["techniques"], meta["periods"], meta["doc_types"], pairs)
+
+    def _positions(self, labels, label, axis):
+        if label is None:
+            return np.arange(len(labels))
+        if label not in labels:
+            raise KeyError(f"{axis} {label!r} not in tensor")
+        return np.array([labels.index(label)])
+
+    def goal_technique(self, period=None, doc_type=None):
+        """Dense goal x technique co-occurrence counts for one slice."""
+        period_pos = self._positions(self.periods, period, "Period")
+        doc_type_pos = self._positions(self.doc_types, doc_type, "Document type")
+        groups = (period_pos[:, None] * len(self.doc_types) + doc_type_pos[None, :]).ravel()
+        rows = (groups[:, None] * self.n_goals + np.arange(self.n_goals)[None, :]).ravel()
+        selected = self.pairs[rows].toarray()
+        return selected.reshape(len(groups), self.n_goals, -1).sum(axis=0)
+
+    def top_techniques(self, goal, k=3, period=None, doc_type=None):
+        """The ``k`` techniques co-occurring most with ``goal`` as ``(technique, count)``.
+
+        Zero counts are left out; ties keep keyword order.
+        """
+        counts = self.goal_technique(period, doc_type)[self.goals.index(goal)]
+        return top_k(self.techniques, counts, k)
@@ -0,0 +1,134 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Columns the analyses actually read from the Scopus export
+CORPUS_COLUMNS = ["Year", "Document Type", "Abstract", "Author Keywords", "Index Keywords"]
+
+# Columns matched against the taxonomy, joined with a space (as 5.2.2 and 5.3.2 match them)
+TEXT_COLUMNS = ["Abstract", "Author Keywords", "Index Keywords"]
+
+DEFAULT_CHUNKSIZE = 50_000
+
+# Numeric columns of the typed reader; everything else but "Document Type" is lowercased text
+TYPED_NUMBERS = {"Year": "Int16", "Cited by": "Int32"}
+
+# Cells read as missing, the same strings pandas' read_csv treats as NaN
+NA_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>",
+             "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"]
+
+
+def _typed_frame(table):
+    # Arrow table of string columns -> compact, typed DataFrame
+    data = {}
+    for name in table.column_names:
+        column = table[name]
+        if name in TYPED_NUMBERS:
+            values = pd.to_numeric(pd.Series(pd.arrays.ArrowExtensionArray(column)), errors="coerce")
+            data[name] = values.astype(TYPED_NUMBERS[name])
+        elif name == "Document Type":
+            encoded = column.combine_chunks().dictionary_encode()
+            codes = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False)
+            data[name] = pd.Categorical.from_codes(codes, encoded.dictionary.to_pylist())
+        else:
+            data[name] = pd.arrays.ArrowExtensionArray(pc.utf8_lower(column))
+    return pd.DataFrame(data)
+
+
+def read_typed_corpus_chunks(file_path, columns=CORPUS_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, start=0, end=None):
+    """Stream the Scopus CSV as compact, typed DataFrames of at most ``chunksize`` rows.
+
+    Only ``columns`` are parsed (columns missing from the file are skipped),
+    so wide fields such as References or Affiliations never reach memory.
+    The CSV is parsed by Arrow straight into column buffers, without a
+    Python string per cell: Year is ``Int16`` (and Cited by ``Int32``),
+    Document Type a categorical, and every other column is lowercased once
+    into a contiguous Arrow string array (missing cells stay ``<NA>``; see
+    :func:`corpus_texts` and :func:`keyword_codes`). A chunk takes a fraction
+    of the memory of the same rows read with ``pd.read_csv``.
+
+    ``start``/``end`` limit the read to a byte range of whole rows, e.g. the
+    rows appended since an earlier read; the column names still come from
+    the header.
+    """
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), [])
+    wanted = [col for col in header if col in set(columns)]
+    end = os.path.getsize(file_path) if end is None else end
+    if start and start >= end:
+        return  # nothing appended
+    with pa.memory_map(file_path) as source:
+        reader = pacsv.open_csv(
+            pa.BufferReader(source.read_at(end - start, start)),
+            # Past the header, the rows are read under the header's column names
+            read_options=pacsv.ReadOptions(column_names=header if start else None),
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=wanted,
+                column_types={col: pa.string() for col in wanted},
+                null_values=NA_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+        # Arrow reads in byte-sized blocks; re-cut them into chunks of ``chunksize`` rows
+        pending, n_pending = [], 0
+        for batch in reader:
+            pending.append(batch)
+            n_pending += batch.num_rows
+            while n_pending >= chunksize:
+                table = pa.Table.from_batches(pending, reader.schema)
+                yield _typed_frame(table.slice(0, chunksize))
+                rest = table.slice(chunksize)
+                pending, n_pending = rest.to_batches(), rest.num_rows
+        if n_pending or not header:
+            yield _typed_frame(pa.Table.from_batches(pending, reader.schema))
+
+
+def _arrow_strings(values):
+    # Arrow string array of a typed-reader column (or of any string Series)
+    if isinstance(values.dtype, pd.ArrowDtype):
+        array = pa.array(values.array)
+        return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+    return pa.array(values.where(values.isna(), values.astype(str)), type=pa.string(), from_pandas=True)
+
+
+def corpus_texts(data, columns=TEXT_COLUMNS, sep=" "):
+    """Text of each row of a typed chunk to match on: ``columns`` joined with ``sep``.
+
+    The columns are already lowercased; missing cells read ``"nan"``, as they
+    did when the columns were joined with ``astype(str)``. The result is one
+    Arrow string array, not a Python string per row.
+    """
+    parts = [pc.fill_null(_arrow_strings(data[col]), "nan") for col in columns]
+    text = pc.binary_join_element_wise(*parts, sep) if len(parts) > 1 else parts[0]
+    return pd.Series(pd.arrays.ArrowExtensionArray(text), index=data.index)
+
+
+def keyword_codes(values, aliases=None):
+    """Split ``"; "``-separated keyword cells into interned keyword codes.
+
+    Returns ``(rows, codes, vocabulary)``: keyword ``vocabulary[codes[i]]``
+    is listed by row ``rows[i]`` (its position in ``values``). Keywords are
+    stripped, empty ones dropped and ``aliases`` applied to the vocabulary,
+    so every distinct spelling is a Python string once, not once per use.
+    """
+    cells = pc.utf8_lower(_arrow_strings(values))
+    split = pc.split_pattern(cells, ";")
+    rows = pc.list_parent_indices(split).to_numpy(zero_copy_only=False).astype(np.int64)
+    keywords = pc.utf8_trim_whitespace(pc.list_flatten(split))
+    keep = pc.not_equal(keywords, "").to_numpy(zero_copy_only=False)
+    encoded = pc.dictionary_encode(keywords.filter(pa.array(keep)))
+    rows, codes = rows[keep], encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+    vocabulary = encoded.dictionary.to_pylist()
+    if aliases:
+        # Spellings that alias to the same keyword share one code
+        codes_of, remap = {}, []
+        for keyword in vocabulary:
+            remap.append(codes_of.setdefault(aliases.get(keyword, keyword), len(codes_of)))
+        vocabulary, codes = list(codes_of), np.asarray(remap, dtype=np.int64)[codes]
+    return rows, codes, vocabulary
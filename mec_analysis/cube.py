@@ -0,0 +1,211 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mec_analysis.ranking import axis_codes, top_k_cells
+
+CUBE_FILES = ["docs", "keyword_docs", "keyword_spellings"]
+
+
+class KeywordCube:
+    """Dense document counts over (year x document type x keyword).
+
+    ``keyword_docs[y, d, k]`` is the number of documents of year ``years[y]``
+    and type ``doc_types[d]`` mentioning keyword ``k`` (goals, then
+    techniques, so the category is a split of the keyword axis),
+    ``keyword_spellings`` counts their matching spellings and ``docs`` the
+    documents of each (year, document type). Years run without gaps from the
+    first to the last year seen; documents without a year, or without a
+    document type, are kept under a trailing ``None`` label on that axis.
+
+    Every report on per-keyword counts is a query on the cube: select
+    years (a year, a ``(start, end)`` span or a list), document types and a
+    category, sum over the axes not kept ``by`` (roll-up) and rank keywords
+    per remaining cell (:meth:`top_k`). Cubes of different chunks combine
+    with ``+``, and :meth:`save`/:meth:`load` keep a precomputed cube on disk.
+    """
+
+    def __init__(self, keywords, n_goals, years, doc_types, docs, keyword_docs, keyword_spellings):
+        self.keywords = list(keywords)
+        self.n_goals = n_goals
+        self.years = list(years)
+        self.doc_types = list(doc_types)
+        self.docs = docs
+        self.keyword_docs = keyword_docs
+        self.keyword_spellings = keyword_spellings
+
+    @property
+    def goals(self):
+        return self.keywords[:self.n_goals]
+
+    @property
+    def techniques(self):
+        return self.keywords[self.n_goals:]
+
+    @property
+    def shape(self):
+        return self.keyword_docs.shape
+
+    @classmethod
+    def from_incidence(cls, incidence, doc_type_labels=None):
+        """Count an :class:`~mec_analysis.incidence.Incidence` in one pass.
+
+        With ``doc_type_labels`` the document type axis is fixed and rows of
+        other types are not counted; otherwise it holds the types seen.
+        """
+        n_docs = incidence.n_docs
+        years = np.full(n_docs, np.nan) if incidence.years is None else np.asarray(incidence.years, dtype=float)
+        known = ~np.isnan(years)
+        first, last = (int(years[known].min()), int(years[known].max())) if known.any() else (0, -1)
+        year_labels = list(range(first, last + 1)) + ([None] if not known.all() else [])
+        year_codes = np.where(known, np.nan_to_num(years) - first, last - first + 1).astype(np.int64)
+
+        doc_types = np.full(n_docs, None) if incidence.doc_types is None else incidence.doc_types
+        missing = pd.isna(pd.Series(np.asarray(doc_types, dtype=object), dtype=object)).to_numpy()
+        doc_type_codes, labels = axis_codes(doc_types, doc_type_labels)
+        if doc_type_labels is None and missing.any():
+            doc_type_codes[missing] = len(labels)
+            labels.append(None)
+        doc_type_labels = labels
+
+        rows = np.flatnonzero(doc_type_codes >= 0)
+        n_years, n_doc_types = len(year_labels), len(doc_type_labels)
+        indicator = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (year_codes[rows] * n_doc_types + doc_type_codes[rows], rows)),
+            shape=(n_years * n_doc_types, n_docs),
+        )
+        axes = (n_years, n_doc_types)
+        return cls(
+            incidence.keywords,
+            incidence.matcher.n_goals,
+            year_labels,
+            doc_type_labels,
+            np.asarray(indicator.sum(axis=1), dtype=np.int64).reshape(axes),
+            (indicator @ incidence.matrix.astype(np.int64)).toarray().reshape(*axes, -1),
+            (indicator @ incidence.spelling_matrix.astype(np.int64)).toarray().reshape(*axes, -1),
+        )
+
+    def reindex(self, years, doc_types):
+        """Return this cube on the (superset) axes ``years`` x ``doc_types``."""
+        year_pos = np.array([years.index(y) for y in self.years], dtype=np.int64)
+        doc_type_pos = np.array([doc_types.index(t) for t in self.doc_types], dtype=np.int64)
+        axes = (len(years), len(doc_types))
+        docs = np.zeros(axes, dtype=np.int64)
+        keyword_docs = np.zeros((*axes, len(self.keywords)), dtype=np.int64)
+        keyword_spellings = np.zeros_like(keyword_docs)
+        index = np.ix_(year_pos, doc_type_pos)
+        docs[index] = self.docs
+        keyword_docs[index] = self.keyword_docs
+        keyword_spellings[index] = self.keyword_spellings
+        return KeywordCube(self.keywords, self.n_goals, years, doc_types, docs, keyword_docs, keyword_spellings)
+
+    def __add__(self, other):
+        if self.keywords != other.keywords:
+            raise ValueError("Cannot add keyword cubes over different keywords")
+        known = [y for y in self.years + other.years if y is not None]
+        years = list(range(min(known), max(known) + 1)) if known else []
+        if None in self.years or None in other.years:
+            years.append(None)
+        labels = list(dict.fromkeys(self.doc_types + other.doc_types))
+        doc_types = [t for t in labels if t is not None] + ([None] if None in labels else [])
+        left, right = self.reindex(years, doc_types), other.reindex(years, doc_types)
+        return KeywordCube(self.keywords, self.n_goals, years, doc_types, left.docs + right.docs,
+                           left.keyword_docs + right.keyword_docs, left.keyword_spellings + right.keyword_spellings)
+
+    def _year_positions(self, years):
+        # None: every year (undated documents too); (start, end): that span; else one year or a list
+        if years is None:
+            return np.arange(len(self.years))
+        if isinstance(years, tuple):
+            return np.array([i for i, y in enumerate(self.years) if y is not None and years[0] <= y <= years[1]],
+                            dtype=np.int64)
+        years = years if isinstance(years, list) else [years]
+        return np.array([self.years.index(y) for y in years if y in self.years], dtype=np.int64)
+
+    def _doc_type_positions(self, doc_types):
+        # Document types not in the cube select nothing (count zero)
+        if doc_types is None:
+            return np.arange(len(self.doc_types))
+        doc_types = doc_types if isinstance(doc_types, list) else [doc_types]
+        return np.array([self.doc_types.index(t) for t in doc_types if t in self.doc_types], dtype=np.int64)
+
+    def _keyword_slice(self, category):
+        if category is None:
+            return slice(None)
+        if category == "Goal":
+            return slice(None, self.n_goals)
+        if category == "Technique":
+            return slice(self.n_goals, None)
+        raise ValueError(f"Unknown category {category!r}")
+
+    def slice(self, years=None, doc_types=None):
+        """Sub-cube of the selected years and document types."""
+        year_pos, doc_type_pos = self._year_positions(years), self._doc_type_positions(doc_types)
+        index = np.ix_(year_pos, doc_type_pos)
+        return KeywordCube(self.keywords, self.n_goals, [self.years[i] for i in year_pos],
+                           [self.doc_types[i] for i in doc_type_pos], self.docs[index], self.keyword_docs[index],
+                           self.keyword_spellings[index])
+
+    def counts(self, years=None, doc_types=None, category=None, by=(), spelling=False):
+        """Keyword counts of a slice, summed over the axes not listed in ``by``.
+
+        ``by`` keeps ``"year"`` and/or ``"doc_type"``; the result has those
+        axes (in that order) followed by the keywords of ``category``.
+        """
+        unknown = set(by) - {"year", "doc_type"}
+        if unknown:
+            raise ValueError(f"Cannot group by {sorted(unknown)}")
+        values = self.keyword_spellings if spelling else self.keyword_docs
+        index = np.ix_(self._year_positions(years), self._doc_type_positions(doc_types))
+        values = values[index][..., self._keyword_slice(category)]
+        summed = tuple(axis for axis, dim in enumerate(["year", "doc_type"]) if dim not in by)
+        return values.sum(axis=summed)
+
+    def doc_counts(self, years=None, doc_types=None, by=()):
+        """Number of documents of a slice, summed over the axes not listed in ``by``."""
+        values = self.docs[np.ix_(self._year_positions(years), self._doc_type_positions(doc_types))]
+        return values.sum(axis=tuple(axis for axis, dim in enumerate(["year", "doc_type"]) if dim not in by))
+
+    def top_k(self, k, category=None, years=None, doc_types=None, by=(), spelling=False, nonzero=True):
+        """The ``k`` most frequent keywords of a slice as ``(keyword, count)``.
+
+        Without ``by`` a single list; otherwise a dict from each cell's label
+        (a tuple when grouping by both axes) to its list. ``nonzero=False``
+        keeps keywords with a zero count. Ties keep keyword order.
+        """
+        counts = self.counts(years, doc_types, category, by, spelling)
+        names = self.keywords[self._keyword_slice(category)]
+        cells = top_k_cells(counts, names, k, nonzero)
+        if not by:
+            return cells[()]
+        labels = {"year": [self.years[i] for i in self._year_positions(years)],
+                  "doc_type": [self.doc_types[i] for i in self._doc_type_positions(doc_types)]}
+        axes = [labels[dim] for dim in ["year", "doc_type"] if dim in by]
+        return {(tuple(axis[i] for axis, i in zip(axes, cell)) if len(cell) > 1 else axes[0][cell[0]]): top
+                for cell, top in cells.items()}
+
+    def save(self, cube_dir):
+        """Write the cube to ``cube_dir`` (one .npy per array plus meta.json)."""
+        tmp_dir = cube_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        for name in CUBE_FILES:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(self, name))
+        meta = {"keywords": self.keywords, "n_goals": self.n_goals, "years": self.years,
+                "doc_types": self.doc_types}
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(cube_dir, ignore_errors=True)
+        os.replace(tmp_dir, cube_dir)
+        return cube_dir
+
+    @classmethod
+    def load(cls, cube_dir):
+        with open(os.path.join(cube_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = [np.load(os.path.join(cube_dir, f"{name}.npy")) for name in CUBE_FILES]
+        return cls(meta["keywords"], meta["n_goals"], meta["years"], meta["doc_types"], *arrays)
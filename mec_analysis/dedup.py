@@ -0,0 +1,286 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from mec_analysis.corpus import DEFAULT_CHUNKSIZE, _arrow_strings, read_typed_corpus_chunks
+
+DEDUP_COLUMNS = ["Title", "Year", "DOI", "Abstract"]
+
+DUPLICATE_REPORT_COLUMNS = ["Cluster", "Row", "Kept", "Same DOI", "Same title", "Abstract similarity", "Year",
+                            "DOI", "Title"]
+
+# Stripped from both ends of a word, so "latency," and "(latency)" are the same word
+PUNCTUATION = ".,;:!?()[]{}<>\"'`“”‘’«»"
+
+# Scopus' placeholder for a missing abstract (lowercased, as the typed reader reads it)
+NO_ABSTRACT = "[no abstract available]"
+
+# Titles shorter than this (after normalization) are too generic to identify a paper
+MIN_TITLE_CHARS = 20
+
+
+def _stable_hash(values):
+    """uint64 hash of every Arrow string (0 where missing), the same in every process and run."""
+    encoded = values.dictionary_encode()
+    hashes = pd.util.hash_array(np.asarray(encoded.dictionary.to_pylist(), dtype=object))
+    indices = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False).astype(np.int64)
+    result = np.zeros(len(indices), dtype=np.uint64)
+    present = indices >= 0
+    result[present] = hashes[indices[present]]
+    return result
+
+
+def normalized_doi(values):
+    """Lowercased DOIs without a resolver prefix (``https://doi.org/``, ``doi:``)."""
+    doi = pc.utf8_lower(_arrow_strings(values))
+    return pc.utf8_trim_whitespace(pc.replace_substring_regex(doi, r"^\s*(https?://(dx\.)?doi\.org/|doi:\s*)", ""))
+
+
+def normalized_title(values):
+    """Lowercased titles with punctuation and repeated spaces reduced to single spaces."""
+    title = pc.replace_substring_regex(pc.utf8_lower(_arrow_strings(values)), r"[^\w]+", " ")
+    return pc.utf8_trim_whitespace(title)
+
+
+class MinHasher:
+    """MinHash signatures of the word shingles of a text.
+
+    Texts are lowercased, split into words at whitespace (without leading
+    or trailing punctuation) and cut into shingles of ``shingle_words`` consecutive words; each
+    signature entry is the smallest of one random hash of the shingles, so
+    the share of equal entries of two signatures estimates the Jaccard
+    similarity of their shingle sets. Everything is vectorized over a
+    chunk: words are interned and hashed in Arrow, shingles hashed by
+    combining their word hashes and each permutation (a multiply-add-shift
+    hash of the 32-bit shingle hashes) reduced per document.
+    """
+
+    def __init__(self, num_perm=64, shingle_words=3, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+        self.a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+
+    def signatures(self, texts):
+        """``(signatures, present)``: a ``docs x num_perm`` uint32 array and which docs have a shingle."""
+        words = pc.utf8_split_whitespace(pc.utf8_lower(pc.fill_null(_arrow_strings(texts), "")))
+        lengths = pc.list_value_length(words).to_numpy(zero_copy_only=False).astype(np.int64)
+        flat = pc.utf8_trim(pc.list_flatten(words), characters=PUNCTUATION)
+        word_hash = _stable_hash(flat)
+        # Words that were only punctuation are dropped
+        keep = pc.not_equal(flat, "").to_numpy(zero_copy_only=False)
+        doc = np.repeat(np.arange(len(lengths)), lengths)[keep]
+        word_hash = word_hash[keep]
+
+        # Shingle i covers words i .. i + k - 1 of the same document
+        k = self.shingle_words
+        n_shingles = max(len(word_hash) - k + 1, 0)
+        starts = np.arange(n_shingles)
+        valid = doc[starts] == doc[starts + k - 1] if n_shingles else np.zeros(0, dtype=bool)
+        shingle = np.zeros(n_shingles, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for j in range(k):
+                shingle = shingle * np.uint64(0x9E3779B97F4A7C15) + word_hash[starts + j]
+        shingle, shingle_doc = shingle[valid] >> np.uint64(32), doc[starts[valid]]
+
+        n_docs = len(lengths)
+        signatures = np.full((n_docs, self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        present = np.zeros(n_docs, dtype=bool)
+        if len(shingle):
+            doc_starts = np.flatnonzero(np.r_[True, shingle_doc[1:] != shingle_doc[:-1]])
+            docs_with = shingle_doc[doc_starts]
+            present[docs_with] = True
+            values = np.empty_like(shingle)
+            for p in range(self.num_perm):
+                np.multiply(shingle, self.a[p], out=values)
+                np.add(values, self.b[p], out=values)
+                np.right_shift(values, np.uint64(32), out=values)
+                signatures[docs_with, p] = np.minimum.reduceat(values, doc_starts)
+        return signatures, present
+
+
+def _first_of_groups(keys, present):
+    # (first row, row) pairs linking every present row to the first row with the same key
+    rows = np.flatnonzero(present)
+    if not len(rows):
+        return np.zeros((0, 2), dtype=np.int64)
+    codes, _ = pd.factorize(keys[rows])
+    first = np.full(codes.max() + 1, len(keys), dtype=np.int64)
+    np.minimum.at(first, codes, rows)
+    pairs = np.column_stack([first[codes], rows])
+    return pairs[pairs[:, 0] != pairs[:, 1]]
+
+
+class CorpusFingerprints:
+    """Per-row DOI and title hashes and abstract MinHash signatures of a corpus.
+
+    Built chunk by chunk (:meth:`add`) in one pass and kept as fixed-size
+    arrays (``num_perm`` 32-bit values per row), so millions of rows fit in
+    memory; fingerprints of consecutive parts of the CSV, e.g. from
+    different workers, are joined with ``+``. :meth:`clusters` then links
+    duplicates without comparing all pairs: rows sharing a DOI or a
+    normalized title are duplicates outright, and abstracts are compared
+    only within LSH buckets (``bands`` bands of the signature), each
+    candidate pair being kept if its estimated similarity reaches
+    ``threshold``.
+    """
+
+    def __init__(self, hasher=None, doi=None, title=None, signatures=None, present=None, years=None):
+        self.hasher = hasher or MinHasher()
+        num_perm = self.hasher.num_perm
+        self.doi = np.zeros(0, dtype=np.uint64) if doi is None else doi
+        self.title = np.zeros(0, dtype=np.uint64) if title is None else title
+        self.signatures = np.zeros((0, num_perm), dtype=np.uint32) if signatures is None else signatures
+        self.present = np.zeros(0, dtype=bool) if present is None else present
+        self.years = np.zeros(0) if years is None else years
+
+    @property
+    def n_rows(self):
+        return len(self.doi)
+
+    def add(self, data):
+        """Fingerprint one chunk of :func:`~mec_analysis.corpus.read_typed_corpus_chunks` (appended)."""
+        n = len(data)
+        doi = _stable_hash(normalized_doi(data["DOI"])) if "DOI" in data else np.zeros(n, dtype=np.uint64)
+        if "Title" in data:
+            title = normalized_title(data["Title"])
+            long_enough = pc.greater_equal(pc.utf8_length(title), MIN_TITLE_CHARS)
+            title = np.where(pc.fill_null(long_enough, False).to_numpy(zero_copy_only=False),
+                             _stable_hash(title), 0).astype(np.uint64)
+        else:
+            title = np.zeros(n, dtype=np.uint64)
+        if "Abstract" in data:
+            abstracts = _arrow_strings(data["Abstract"])
+            abstracts = pc.if_else(pc.equal(pc.utf8_trim_whitespace(abstracts), NO_ABSTRACT), None, abstracts)
+            signatures, present = self.hasher.signatures(pd.Series(pd.arrays.ArrowExtensionArray(abstracts)))
+        else:
+            signatures, present = np.zeros((n, self.hasher.num_perm), dtype=np.uint32), np.zeros(n, dtype=bool)
+        years = (pd.to_numeric(data["Year"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                 if "Year" in data else np.full(n, np.nan))
+        self.doi = np.concatenate([self.doi, doi])
+        self.title = np.concatenate([self.title, title])
+        self.signatures = np.concatenate([self.signatures, signatures])
+        self.present = np.concatenate([self.present, present])
+        self.years = np.concatenate([self.years, years])
+        return self
+
+    def __add__(self, other):
+        joined = CorpusFingerprints(self.hasher)
+        for name in ("doi", "title", "signatures", "present", "years"):
+            setattr(joined, name, np.concatenate([getattr(self, name), getattr(other, name)]))
+        return joined
+
+    def similarity(self, a, b):
+        """Estimated Jaccard similarity of the abstracts of rows ``a`` and ``b`` (arrays; NaN without one)."""
+        a, b = np.asarray(a), np.asarray(b)
+        shared = (self.signatures[a] == self.signatures[b]).mean(axis=1) if len(a) else np.zeros(0)
+        return np.where(self.present[a] & self.present[b], shared, np.nan)
+
+    def candidate_pairs(self, bands=16):
+        """Row pairs that share an LSH bucket in at least one band (each pair linked to its bucket's first row)."""
+        rows_per_band = self.hasher.num_perm // bands
+        pairs = []
+        for band in range(bands):
+            values = self.signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+            key = np.zeros(self.n_rows, dtype=np.uint64)
+            with np.errstate(over="ignore"):
+                for j in range(rows_per_band):
+                    key = key * np.uint64(0x100000001B3) + values[:, j]
+            pairs.append(_first_of_groups(key, self.present))
+        pairs = np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+        return np.unique(pairs, axis=0) if len(pairs) else pairs
+
+    def clusters(self, threshold=0.8, bands=16):
+        """Cluster label of every row (connected components of the duplicate links)."""
+        candidates = self.candidate_pairs(bands)
+        similar = candidates[self.similarity(candidates[:, 0], candidates[:, 1]) >= threshold]
+        links = np.concatenate([_first_of_groups(self.doi, self.doi != 0),
+                                _first_of_groups(self.title, self.title != 0), similar])
+        graph = sparse.csr_matrix((np.ones(len(links)), (links[:, 0], links[:, 1])),
+                                  shape=(self.n_rows, self.n_rows))
+        return csgraph.connected_components(graph, directed=False)[1]
+
+
+def fingerprint_corpus(csv_path, hasher=None, chunksize=DEFAULT_CHUNKSIZE):
+    """One pass over the Scopus CSV into :class:`CorpusFingerprints`."""
+    fingerprints = CorpusFingerprints(hasher)
+    for chunk in read_typed_corpus_chunks(csv_path, DEDUP_COLUMNS, chunksize=chunksize):
+        fingerprints.add(chunk)
+    return fingerprints
+
+
+def deduplicate_corpus(csv_path, output_path, report_path=None, threshold=0.8, num_perm=64, bands=16,
+                       shingle_words=3, chunksize=DEFAULT_CHUNKSIZE):
+    """Write ``csv_path`` without its duplicate papers to ``output_path``; returns the duplicate report.
+
+    Of every cluster of duplicates the first row is kept (earlier exports
+    win) and the CSV is otherwise copied unchanged. The report (also
+    written to ``report_path``) lists every row of a cluster with what it
+    shares with the kept row (see :data:`DUPLICATE_REPORT_COLUMNS`).
+    Two passes over the CSV, both streamed in chunks.
+    """
+    fingerprints = fingerprint_corpus(csv_path, MinHasher(num_perm, shingle_words), chunksize)
+    labels = fingerprints.clusters(threshold, bands)
+    kept_row = np.full(labels.max() + 1 if len(labels) else 0, fingerprints.n_rows, dtype=np.int64)
+    np.minimum.at(kept_row, labels, np.arange(fingerprints.n_rows))
+    kept = kept_row[labels] == np.arange(fingerprints.n_rows)
+    in_cluster = np.bincount(labels, minlength=len(kept_row))[labels] > 1
+
+    # Second pass: copy the kept rows verbatim, collecting the details of clustered rows
+    tmp_path = output_path + ".tmp"
+    details = []
+    offset = 0
+    chunks = pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunksize)
+    for i, chunk in enumerate(chunks):
+        rows = np.arange(offset, offset + len(chunk))
+        chunk[kept[rows]].to_csv(tmp_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        clustered = in_cluster[rows]
+        columns = [col for col in ("DOI", "Title") if col in chunk]
+        details.append(chunk.loc[clustered, columns].assign(Row=rows[clustered]))
+        offset += len(chunk)
+    if offset != fingerprints.n_rows:
+        os.remove(tmp_path)
+        raise ValueError(f"{csv_path}: read {offset} rows, but {fingerprints.n_rows} were fingerprinted")
+    os.replace(tmp_path, output_path)
+
+    rows = np.flatnonzero(in_cluster)
+    first = kept_row[labels[rows]]
+    cluster_ids, _ = pd.factorize(labels[rows])
+    report = pd.DataFrame({
+        "Cluster": cluster_ids + 1,
+        "Row": rows,
+        "Kept": kept[rows],
+        "Same DOI": (fingerprints.doi[rows] == fingerprints.doi[first]) & (fingerprints.doi[rows] != 0),
+        "Same title": (fingerprints.title[rows] == fingerprints.title[first]) & (fingerprints.title[rows] != 0),
+        "Abstract similarity": np.round(fingerprints.similarity(rows, first), 3),
+        "Year": pd.array(fingerprints.years[rows], dtype="Float64").astype("Int64"),
+    })
+    found = pd.concat(details, ignore_index=True) if details else pd.DataFrame(columns=["Row"])
+    report = report.merge(found, on="Row", how="left").reindex(columns=DUPLICATE_REPORT_COLUMNS)
+    if report_path:
+        report.to_csv(report_path, index=False)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove duplicate papers from a (merged) Scopus CSV: same DOI, "
+                                                 "same title or near-identical abstract (MinHash + LSH).")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("output", help="deduplicated CSV to write")
+    parser.add_argument("--report", default="duplicate_clusters.csv", help="duplicate cluster report CSV")
+    parser.add_argument("--threshold", type=float, default=0.8,
+                        help="estimated abstract similarity (Jaccard of word 3-grams) of near duplicates")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash signature length (default 64)")
+    parser.add_argument("--bands", type=int, default=16, help="LSH bands the signature is cut into (default 16)")
+    args = parser.parse_args()
+
+    report = deduplicate_corpus(args.csv, args.output, args.report, args.threshold, args.num_perm, args.bands)
+    removed = int((~report["Kept"]).sum())
+    print(f"✅ {removed} duplicates in {report['Cluster'].nunique()} clusters removed; "
+          f"deduplicated corpus saved to: {args.output}, report to: {args.report}")
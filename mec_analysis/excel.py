@@ -0,0 +1,215 @@
+import json
+import os
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from pandas.io.parsers import TextParser
+
+SIDECAR_SUFFIX = ".columns.parquet"
+SIDECAR_KEY = b"mec_source"
+# Bumped when the stored values change, so older sidecars are rebuilt
+SIDECAR_FORMAT = 2
+
+
+def sidecar_path(path):
+    """Columnar cache written next to workbook ``path``."""
+    return path + SIDECAR_SUFFIX
+
+
+def iter_excel_rows(path, columns=None, sheet=0):
+    """Return ``(header, rows)`` for ``sheet`` (name or index) of a workbook.
+
+    ``header`` lists every column name of the sheet; ``rows`` yields the
+    values of ``columns`` (default: all) for each data row. The workbook is
+    opened read-only and streamed row by row, so only the requested cells
+    are kept.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    worksheet = workbook.worksheets[sheet] if isinstance(sheet, int) else workbook[sheet]
+    sheet_rows = worksheet.iter_rows(values_only=True)
+    header = ["" if name is None else str(name) for name in next(sheet_rows, ())]
+    columns = [name for name in header if name] if columns is None else list(columns)
+    missing = [col for col in columns if col not in header]
+    if missing:
+        workbook.close()
+        raise ValueError(f"Columns {missing} not found in {path!r}")
+    positions = [header.index(col) for col in columns]
+
+    def rows():
+        try:
+            for row in sheet_rows:
+                yield tuple(row[i] if i < len(row) else None for i in positions)
+        finally:
+            workbook.close()
+
+    return header, rows()
+
+
+def _cell(value):
+    # As pd.read_excel passes a cell to its parser: empty as "", whole floats as int
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _parse(columns, rows):
+    # The cells go through pd.read_excel's parser, so numeric text becomes numbers,
+    # "NA"-like text NaN and dtypes are inferred from these rows
+    data = [list(columns)] + [[_cell(value) for value in row] for row in rows]
+    return TextParser(data, header=0, skip_blank_lines=False).read()
+
+
+def _frame(columns, rows):
+    # Like pd.read_excel: trailing empty rows dropped, the rest parsed
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    return _parse(columns, rows)
+
+
+def _head(df, nrows):
+    # The first ``nrows`` rows with dtypes of their own, as pd.read_excel(nrows=...) infers them
+    df = df.head(nrows)
+    return _parse(df.columns, df.astype(object).where(df.notna(), None).values.tolist())
+
+
+def _as_read_excel(df):
+    # Missing values as NaN (not None) and all-empty columns as float, as pd.read_excel returns them
+    for col in df.columns:
+        if df[col].dtype == object:
+            missing = df[col].isna()
+            if missing.all():
+                df[col] = np.nan
+            elif missing.any():
+                df[col] = df[col].where(~missing, np.nan)
+    return df
+
+
+def _mixed_part(col):
+    # Sidecar column holding the non-text values of a mixed-type column
+    return f"{col}\x00values"
+
+
+def _to_table(df, metadata):
+    """Arrow table of ``df``; mixed text/number columns are stored as two typed columns."""
+    arrays, names, mixed = [], [], []
+    for col in df.columns:
+        try:
+            arrays.append(pa.Array.from_pandas(df[col]))
+            names.append(col)
+            continue
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        is_text = df[col].map(lambda value: isinstance(value, str))
+        arrays.append(pa.array(df[col].where(is_text, None).tolist(), type=pa.string()))
+        names.append(col)
+        others = df[col].where(~is_text & df[col].notna(), None).tolist()
+        try:
+            arrays.append(pa.array(others))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if v is None else str(v) for v in others], type=pa.string()))
+        names.append(_mixed_part(col))
+        mixed.append(col)
+    table = pa.Table.from_arrays(arrays, names=names)
+    metadata = dict(metadata, mixed=mixed)
+    return table.replace_schema_metadata({SIDECAR_KEY: json.dumps(metadata).encode("utf-8")})
+
+
+def _from_table(table, columns, mixed):
+    df = pd.DataFrame(index=range(table.num_rows))
+    for col in columns:
+        if col in mixed:
+            text, others = table.column(col).to_pylist(), table.column(_mixed_part(col)).to_pylist()
+            df[col] = pd.Series([t if t is not None else o for t, o in zip(text, others)], dtype=object)
+        else:
+            df[col] = table.column(col).to_pandas()
+    return _as_read_excel(df.infer_objects())
+
+
+def read_excel_columns(path, columns=None, nrows=None, sheet=0, sidecar=True):
+    """Read ``columns`` (default: all) of a workbook into a DataFrame.
+
+    Values match ``pd.read_excel``. With ``sidecar=True`` the columns read are
+    also stored in a Parquet file next to the workbook; later calls read from
+    it while the workbook's mtime and size are unchanged, and only go back to
+    the workbook for columns the sidecar does not hold yet. ``nrows`` limits
+    the returned rows; the sidecar always keeps every row.
+    """
+    stat = os.stat(path)
+    source = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sheet": sheet, "format": SIDECAR_FORMAT}
+    cached_columns = []
+    if sidecar and os.path.exists(sidecar_path(path)):
+        schema = pq.read_schema(sidecar_path(path))
+        stored = json.loads((schema.metadata or {}).get(SIDECAR_KEY, b"{}"))
+        if stored.get("source") == source:
+            mixed = set(stored["mixed"])
+            cached_columns = [name for name in schema.names if "\x00" not in name]
+            wanted = [name for name in stored["header"] if name] if columns is None else list(columns)
+            if set(wanted) <= set(cached_columns):
+                parts = wanted + [_mixed_part(col) for col in wanted if col in mixed]
+                table = pq.read_table(sidecar_path(path), columns=parts)
+                if nrows is not None:
+                    return _head(_from_table(table.slice(0, nrows), wanted, mixed), nrows)
+                return _from_table(table, wanted, mixed)
+
+    if not sidecar:
+        header, rows = iter_excel_rows(path, columns, sheet)
+        data = list(islice(rows, nrows))
+        rows.close()
+        return _frame([name for name in header if name] if columns is None else list(columns), data)
+
+    # Stream the workbook once for the wanted columns plus those already cached
+    wanted = None if columns is None else list(dict.fromkeys(cached_columns + list(columns)))
+    header, rows = iter_excel_rows(path, wanted, sheet)
+    wanted = [name for name in header if name] if wanted is None else wanted
+    df = _frame(wanted, list(rows))
+    tmp_path = sidecar_path(path) + ".tmp"
+    pq.write_table(_to_table(df, {"source": source, "header": header}), tmp_path)
+    os.replace(tmp_path, sidecar_path(path))
+
+    df = df if columns is None else df[list(columns)]
+    return _head(df, nrows) if nrows is not None else df
+
+
+# Header cell style of DataFrame.to_excel
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def _cell_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_excel_rows(path, columns, rows, sheet_name="Sheet1"):
+    """Write ``rows`` (an iterable of sequences) under a ``columns`` header.
+
+    Uses a write-only workbook, so rows are streamed to disk as they come and
+    memory stays constant however many rows there are. The header is styled
+    like ``DataFrame.to_excel(index=False)`` output. Returns the row count.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    header = []
+    for name in columns:
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font, cell.border, cell.alignment = _HEADER_FONT, _HEADER_BORDER, _HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
+    n_rows = 0
+    for row in rows:
+        worksheet.append([_cell_value(value) for value in row])
+        n_rows += 1
+    workbook.save(path)
+    return n_rows
@@ -0,0 +1,216 @@
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse.linalg import ArpackNoConvergence, eigsh
+
+# Scores added to every item by network_metrics / export_network_json
+METRIC_SCORES = ["Weighted degree", "PageRank", "Eigenvector centrality"]
+
+PATH_COLUMNS = ["Goal", "Technique", "Hops", "Path", "Weakest link", "Path length", "Two-hop strength"]
+
+
+def weighted_degree(adjacency):
+    """Total strength of each item's links (a self-link counts once)."""
+    return np.asarray(adjacency.sum(axis=1)).ravel()
+
+
+def pagerank(adjacency, damping=0.85, tol=1e-10, max_iter=200):
+    """PageRank of every item, following links in proportion to their strength.
+
+    Power iteration with sparse matrix-vector products; items without links
+    spread their rank uniformly. Scores sum to 1.
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    degree = weighted_degree(adjacency)
+    dangling = degree == 0
+    inverse = np.divide(1.0, degree, out=np.zeros(n), where=~dangling)
+    transition = (sparse.diags(inverse) @ adjacency).T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        updated = damping * (transition @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(updated - rank).sum() < tol:
+            return updated
+        rank = updated
+    return rank
+
+
+def eigenvector_centrality(adjacency, tol=1e-10):
+    """Leading eigenvector of the link-strength matrix, non-negative with unit length.
+
+    Computed with ARPACK (sparse Lanczos); tiny networks use a dense solver.
+    """
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    matrix = adjacency.astype(float)
+    vector = None
+    if n >= 3:
+        try:
+            vector = eigsh(matrix, k=1, which="LA", tol=tol)[1][:, 0]
+        except ArpackNoConvergence:
+            pass
+    if vector is None:
+        vector = np.linalg.eigh(matrix.toarray())[1][:, -1]
+    vector = np.abs(vector)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def network_metrics(network, adjacency=None):
+    """One row per item: id, label, cluster, position, its ``weights``/``scores`` and the computed metrics."""
+    adjacency = network.adjacency() if adjacency is None else adjacency
+    df = pd.DataFrame({"id": network.ids, "label": network.labels, "cluster": network.cluster,
+                       "x": network.x, "y": network.y})
+    for group in (network.weights, network.scores):
+        for name, values in group.items():
+            df[name] = values
+    df["Weighted degree"] = weighted_degree(adjacency)
+    df["PageRank"] = pagerank(adjacency)
+    df["Eigenvector centrality"] = eigenvector_centrality(adjacency)
+    return df
+
+
+def cluster_summary(network, adjacency=None):
+    """Link strength within and between VOSviewer clusters, one row per cluster.
+
+    Cluster totals come from one sparse product ``C.T @ triu(A) @ C`` with
+    the item x cluster indicator ``C``, so every link is counted once.
+    """
+    adjacency = network.adjacency() if adjacency is None else adjacency
+    clusters, codes = np.unique(network.cluster, return_inverse=True)
+    indicator = sparse.csr_matrix((np.ones(len(codes)), (np.arange(len(codes)), codes)),
+                                  shape=(len(codes), len(clusters)))
+    once = indicator.T @ sparse.triu(adjacency).tocsr() @ indicator
+    between = (once + once.T).toarray()
+    np.fill_diagonal(between, once.diagonal())
+
+    degree = weighted_degree(adjacency)
+    rows = []
+    for c, cluster in enumerate(clusters):
+        members = np.flatnonzero(codes == c)
+        strongest = members[np.argmax(degree[members])]
+        row = {
+            "Cluster": int(cluster),
+            "Items": len(members),
+            "Internal link strength": float(between[c, c]),
+            "External link strength": float(between[c].sum() - between[c, c]),
+            "Strongest item": network.labels[strongest],
+        }
+        for other, other_cluster in enumerate(clusters):
+            if other != c:
+                row[f"Strength to cluster {int(other_cluster)}"] = float(between[c, other])
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def indirect_strength(adjacency, sources, targets, hops=2):
+    """``sources x targets`` total strength of all walks of exactly ``hops`` links.
+
+    The product of link strengths along each walk, summed, i.e. the rows of
+    ``A ** hops``; computed as ``hops`` sparse products from the sources only.
+    """
+    reach = adjacency[sources]
+    for _ in range(hops - 1):
+        reach = reach @ adjacency
+    return reach[:, targets].toarray()
+
+
+def strongest_paths(network, goals, techniques, adjacency=None, max_hops=None):
+    """Strongest multi-hop path from every goal to every technique in the network.
+
+    Path length is the sum of ``1 / strength`` over its links, so strong links
+    are short; one Dijkstra run per goal (from all items carrying its
+    normalized label) reaches every technique. Returns rows with the hop count,
+    the labels along the path and its weakest link, and the "Two-hop strength"
+    of the pair (:func:`indirect_strength` over 2 links, summed over the items
+    of both labels); pairs farther apart than ``max_hops`` links, or not
+    connected, are left out.
+    """
+    adjacency = network.adjacency() if adjacency is None else adjacency
+    costs = adjacency.copy()
+    costs.eliminate_zeros()  # a zero-strength link is no link, not an infinitely long one
+    costs.data = 1.0 / costs.data
+    technique_positions = {t: np.flatnonzero(network.labels == t) for t in techniques}
+    targets = np.concatenate([np.zeros(0, dtype=np.int64)] + list(technique_positions.values()))
+    target_offsets = np.cumsum([0] + [len(positions) for positions in technique_positions.values()])
+    target_slice = {t: slice(target_offsets[i], target_offsets[i + 1]) for i, t in enumerate(technique_positions)}
+    rows = []
+    for goal in goals:
+        sources = np.flatnonzero(network.labels == goal)
+        if len(sources) == 0:
+            continue
+        distances, predecessors = csgraph.dijkstra(costs, indices=sources, min_only=True,
+                                                   return_predecessors=True)[:2]
+        two_hop = indirect_strength(adjacency, sources, targets, hops=2).sum(axis=0)
+        for technique, positions in technique_positions.items():
+            positions = positions[np.isfinite(distances[positions])]
+            if len(positions) == 0:
+                continue
+            node = positions[np.argmin(distances[positions])]
+            path = [node]
+            while predecessors[path[-1]] >= 0:
+                path.append(predecessors[path[-1]])
+            path.reverse()
+            if max_hops is not None and len(path) - 1 > max_hops:
+                continue
+            strengths = [adjacency[a, b] for a, b in zip(path[:-1], path[1:])]
+            rows.append({
+                "Goal": goal,
+                "Technique": technique,
+                "Hops": len(path) - 1,
+                "Path": " > ".join(network.labels[i] for i in path),
+                "Weakest link": float(min(strengths)) if strengths else None,
+                "Path length": float(distances[node]),
+                "Two-hop strength": float(two_hop[target_slice[technique]].sum()),
+            })
+    return pd.DataFrame(rows, columns=PATH_COLUMNS)
+
+
+def export_network_json(json_path, output_path, metrics):
+    """Copy a VOSviewer JSON export with :data:`METRIC_SCORES` added to every item's ``scores``.
+
+    ``metrics`` is a :func:`network_metrics` frame; VOSviewer offers extra
+    score fields for coloring the map.
+    """
+    by_id = metrics.set_index("id")[METRIC_SCORES].to_dict("index")
+    with open(json_path, "r", encoding="utf-8-sig") as f:
+        document = json.load(f)
+    for item in document["network"]["items"]:
+        scores = item.setdefault("scores", {})
+        scores.update({name: float(value) for name, value in by_id[item["id"]].items()})
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(document, f)
+    return output_path
+
+
+if __name__ == "__main__":
+    from mec_analysis.network import KeywordNetwork
+    from mec_analysis.taxonomy import KEYWORD_ALIASES, taxonomy_matcher
+
+    parser = argparse.ArgumentParser(description="Centrality, cluster and path analytics of a VOSviewer network.")
+    parser.add_argument("json", help="VOSviewer JSON export")
+    parser.add_argument("--metrics", default="network_metrics.csv", help="per-keyword metrics CSV")
+    parser.add_argument("--clusters", default="cluster_summary.csv", help="per-cluster link strength CSV")
+    parser.add_argument("--paths", default="goal_technique_paths.csv", help="goal -> technique paths CSV")
+    parser.add_argument("--max-hops", type=int, help="leave out paths longer than this")
+    parser.add_argument("--export-json", help="also write the export with the metrics added to its scores")
+    args = parser.parse_args()
+
+    network = KeywordNetwork.load(args.json, aliases=KEYWORD_ALIASES)
+    adjacency = network.adjacency()
+    matcher = taxonomy_matcher()
+    metrics = network_metrics(network, adjacency)
+    metrics.to_csv(args.metrics, index=False)
+    cluster_summary(network, adjacency).to_csv(args.clusters, index=False)
+    strongest_paths(network, matcher.goals, matcher.techniques, adjacency, args.max_hops).to_csv(args.paths,
+                                                                                                 index=False)
+    print(f"✅ Network analytics saved to: {args.metrics}, {args.clusters}, {args.paths}")
+    if args.export_json:
+        export_network_json(args.json, args.export_json, metrics)
+        print(f"✅ Network with metric scores saved to: {args.export_json}")
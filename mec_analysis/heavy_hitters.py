@@ -0,0 +1,191 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from mec_analysis.cooccurrence import ALL_DOC_TYPES
+from mec_analysis.corpus import DEFAULT_CHUNKSIZE, read_typed_corpus_chunks
+from mec_analysis.incidence import assign_periods
+from mec_analysis.vosviewer import KEYWORD_COLUMNS, split_keywords
+
+# Keywords monitored per (period, document type) by default
+DEFAULT_CAPACITY = 2_000
+
+# Period label of the single cell every row goes to when no year ranges are given
+ALL_PERIODS = "All"
+
+HEAVY_HITTER_COLUMNS = ["Period", "Document Type", "Rank", "Keyword", "Count", "Error", "Guaranteed",
+                        "In taxonomy"]
+
+
+class SpaceSaving:
+    """Space-Saving summary of the most frequent keywords, in bounded memory.
+
+    At most ``capacity`` keywords are monitored, each with a ``count`` that
+    never underestimates its true frequency and an ``error`` bounding the
+    overestimate (``count - error`` is guaranteed). Any keyword seen more
+    than ``total / capacity`` times is monitored. Summaries are merged with
+    ``+`` (Agarwal et al., "Mergeable summaries"): a keyword missing from a
+    full summary is charged that summary's smallest count, which is as much
+    as it can have had there. A batch of exact counts (e.g. of one chunk)
+    is added the same way, as a summary without error.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, keywords=(), counts=(), errors=(), total=0):
+        self.capacity = capacity
+        self.keywords = np.asarray(keywords, dtype=object)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.errors = np.asarray(errors, dtype=np.int64)
+        self.total = total
+
+    @classmethod
+    def exact(cls, counts, capacity=DEFAULT_CAPACITY):
+        """Summary of exact ``{keyword: count}`` counts (a Series), pruned to ``capacity``."""
+        summary = cls(None, counts.index.to_numpy(dtype=object), counts.to_numpy(dtype=np.int64),
+                      np.zeros(len(counts), dtype=np.int64), int(counts.sum()))
+        return summary._prune(capacity)
+
+    @property
+    def floor(self):
+        """The most a keyword that is not monitored can have been seen: the smallest count once full."""
+        return int(self.counts.min()) if self.capacity is not None and len(self.counts) >= self.capacity else 0
+
+    def _prune(self, capacity):
+        # Keep the ``capacity`` largest counts; whatever is dropped is covered by the new floor
+        if len(self.counts) > capacity:
+            keep = np.argpartition(-self.counts, capacity - 1)[:capacity]
+            self.keywords, self.counts, self.errors = self.keywords[keep], self.counts[keep], self.errors[keep]
+        self.capacity = capacity
+        return self
+
+    def __add__(self, other):
+        keywords = pd.Index(self.keywords).union(pd.Index(other.keywords), sort=False)
+        counts, errors = np.zeros(len(keywords), dtype=np.int64), np.zeros(len(keywords), dtype=np.int64)
+        for summary in (self, other):
+            floor = summary.floor
+            position = keywords.get_indexer(summary.keywords)
+            missing = np.ones(len(keywords), dtype=bool)
+            missing[position] = False
+            counts[position] += summary.counts
+            errors[position] += summary.errors
+            counts[missing] += floor
+            errors[missing] += floor
+        merged = SpaceSaving(None, keywords.to_numpy(dtype=object), counts, errors, self.total + other.total)
+        return merged._prune(min(c for c in (self.capacity, other.capacity) if c is not None))
+
+    def add_counts(self, counts):
+        """Add exact ``{keyword: count}`` counts (a Series) in place."""
+        merged = self + SpaceSaving.exact(counts, self.capacity)
+        self.keywords, self.counts, self.errors = merged.keywords, merged.counts, merged.errors
+        self.total = merged.total
+        return self
+
+    def top(self, n):
+        """The ``n`` keywords with the largest counts as ``(keyword, count, error)``, ties by keyword."""
+        order = np.lexsort((self.keywords.astype(str), -self.counts))[:n]
+        return [(self.keywords[i], int(self.counts[i]), int(self.errors[i])) for i in order]
+
+
+class KeywordHeavyHitters:
+    """Space-Saving summaries of the Author/Index Keywords per (period, document type).
+
+    Every document counts once per distinct (alias-normalized) keyword, so
+    counts are papers per keyword, like the taxonomy reports. With
+    ``year_ranges`` rows are bucketed into those periods (rows outside them
+    are not counted), otherwise every row is under one :data:`ALL_PERIODS`
+    period; each period also gets an
+    :data:`~mec_analysis.cooccurrence.ALL_DOC_TYPES` document type next to
+    ``doc_types``. Memory
+    is ``capacity`` keywords per cell plus one chunk's exact counts,
+    whatever the size of the vocabulary. Summaries of chunks or workers
+    combine with ``+``.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, year_ranges=None, doc_types=None, aliases=None):
+        self.capacity = capacity
+        self.year_ranges = year_ranges
+        self.doc_types = list(doc_types or [])
+        self.aliases = aliases
+        periods = list(year_ranges) if year_ranges else [ALL_PERIODS]
+        self.cells = {(period, doc_type): SpaceSaving(capacity)
+                      for period in periods for doc_type in self.doc_types + [ALL_DOC_TYPES]}
+
+    def add(self, data):
+        """Count one chunk of the corpus (a DataFrame with the keyword columns, Year and Document Type)."""
+        data = data.reset_index(drop=True)
+        rows, codes, vocabulary = split_keywords(data, KEYWORD_COLUMNS, self.aliases)
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        if self.year_ranges:
+            periods = assign_periods(data["Year"], self.year_ranges)
+        else:
+            periods = np.full(len(data), ALL_PERIODS, dtype=object)
+        doc_types = np.asarray(data["Document Type"], dtype=object) if self.doc_types else None
+
+        for (period, doc_type), summary in self.cells.items():
+            in_cell = periods == period
+            if doc_type != ALL_DOC_TYPES:
+                in_cell &= doc_types == doc_type
+            cell_codes = codes[in_cell[rows]]
+            counts = np.bincount(cell_codes, minlength=len(vocabulary))
+            present = np.flatnonzero(counts)
+            summary.add_counts(pd.Series(counts[present], index=vocabulary[present]))
+        return self
+
+    def __add__(self, other):
+        if self.cells.keys() != other.cells.keys():
+            raise ValueError("Cannot add heavy hitters over different periods or document types")
+        merged = KeywordHeavyHitters(self.capacity, self.year_ranges, self.doc_types, self.aliases)
+        merged.cells = {cell: summary + other.cells[cell] for cell, summary in self.cells.items()}
+        return merged
+
+    def rows(self, n=20, known=None, new_only=False):
+        """Top ``n`` keywords of every cell (see :data:`HEAVY_HITTER_COLUMNS`).
+
+        ``known`` are the keywords already in the taxonomy (flagged in the
+        "In taxonomy" column, or left out with ``new_only``).
+        """
+        known = set(known or [])
+        rows = []
+        for (period, doc_type), summary in self.cells.items():
+            ranked = [entry for entry in summary.top(len(summary.keywords)) if not (new_only and entry[0] in known)]
+            for rank, (keyword, count, error) in enumerate(ranked[:n], start=1):
+                rows.append([period, doc_type, rank, keyword, count, error, count - error, keyword in known])
+        return rows
+
+
+def sketch_corpus(csv_path, capacity=DEFAULT_CAPACITY, year_ranges=None, doc_types=None, aliases=None,
+                  chunksize=DEFAULT_CHUNKSIZE):
+    """One pass over the Scopus CSV into a :class:`KeywordHeavyHitters`."""
+    hitters = KeywordHeavyHitters(capacity, year_ranges, doc_types, aliases)
+    columns = KEYWORD_COLUMNS + ["Year", "Document Type"]
+    for chunk in read_typed_corpus_chunks(csv_path, columns, chunksize=chunksize):
+        hitters.add(chunk)
+    return hitters
+
+
+if __name__ == "__main__":
+    from mec_analysis.periods import parse_year_ranges
+    from mec_analysis.taxonomy import KEYWORD_ALIASES, taxonomy_matcher
+
+    parser = argparse.ArgumentParser(description="Most frequent Author/Index Keywords per period and document "
+                                                 "type, with error bounds, in one pass and bounded memory.")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("--periods", nargs="+", metavar="START-END", help="year ranges, e.g. 2011-2013 2014-2016")
+    parser.add_argument("--doc-type", nargs="+", help="also rank these document types separately")
+    parser.add_argument("--top", type=int, default=20, help="keywords reported per cell (default 20)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY,
+                        help=f"keywords monitored per cell (default {DEFAULT_CAPACITY})")
+    parser.add_argument("--new-only", action="store_true", help="leave out keywords already in the taxonomy")
+    parser.add_argument("--output", help="CSV file to write (default: print)")
+    args = parser.parse_args()
+
+    year_ranges = parse_year_ranges(args.periods) if args.periods else None
+    hitters = sketch_corpus(args.csv, args.capacity, year_ranges, args.doc_type, KEYWORD_ALIASES)
+    matcher = taxonomy_matcher()
+    table = pd.DataFrame(hitters.rows(args.top, set(matcher.keywords) | set(matcher.terms), args.new_only),
+                         columns=HEAVY_HITTER_COLUMNS)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"✅ {len(table)} rows saved to: {args.output}")
+    else:
+        print(table.to_string(index=False))
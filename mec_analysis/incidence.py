@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class Incidence:
+    """Sparse document x keyword incidence for one corpus.
+
+    ``term_matrix`` has one column per raw spelling in ``matcher.terms``;
+    ``spelling_matrix`` folds those onto canonical keywords (so a paper using
+    two spellings of a keyword counts 2) and ``matrix`` is its boolean form.
+    ``years`` and ``doc_types`` are NumPy arrays aligned with the rows.
+    """
+
+    def __init__(self, matcher, term_matrix, years=None, doc_types=None):
+        self.matcher = matcher
+        self.keywords = matcher.keywords
+        self.goals = matcher.goals
+        self.techniques = matcher.techniques
+        self.term_matrix = term_matrix
+        n_terms = len(matcher.terms)
+        term_to_keyword = sparse.csr_matrix(
+            (np.ones(n_terms, dtype=np.int32), (np.arange(n_terms), matcher.term_keyword)),
+            shape=(n_terms, len(matcher.keywords)),
+        )
+        self.spelling_matrix = (term_matrix @ term_to_keyword).tocsr()
+        self.matrix = self.spelling_matrix.astype(bool)
+        self.years = years
+        self.doc_types = doc_types
+
+    @property
+    def n_docs(self):
+        return self.matrix.shape[0]
+
+    @property
+    def goal_matrix(self):
+        return self.matrix[:, :self.matcher.n_goals]
+
+    @property
+    def technique_matrix(self):
+        return self.matrix[:, self.matcher.n_goals:]
+
+
+def build_incidence(texts, matcher, years=None, doc_types=None, cache=None):
+    """Match every text once and return an :class:`Incidence`.
+
+    ``texts`` must already be lowercased. ``years``/``doc_types`` are optional
+    per-row labels (Series or arrays) kept alongside the matrix. With a
+    :class:`~mec_analysis.cache.MatchCache`, previously matched texts are not
+    scanned again (call ``cache.save()`` afterwards to persist new results).
+    """
+    if cache is not None:
+        term_matrix = cache.term_matrix(texts, matcher)
+    else:
+        indptr = [0]
+        indices = []
+        for text in texts:
+            found = matcher.find_term_ids(text)
+            indices.extend(found)
+            indptr.append(len(indices))
+
+        term_matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(matcher.terms)),
+        )
+    if years is not None:
+        years = year_values(years)
+    if doc_types is not None:
+        doc_types = np.asarray(doc_types, dtype=object)
+    return Incidence(matcher, term_matrix, years, doc_types)
+
+
+def year_values(years):
+    """Years as a float array, NaN where unknown (accepts nullable ``Int16`` columns)."""
+    return pd.to_numeric(pd.Series(years), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def assign_periods(years, year_ranges):
+    """Label each year with the ``year_ranges`` key whose (start, end) contains it."""
+    years = year_values(years)
+    periods = np.full(len(years), None, dtype=object)
+    for label, (start, end) in year_ranges.items():
+        periods[(years >= start) & (years <= end)] = label
+    return periods
+
+
+class KeywordCounts:
+    """Mergeable document counts produced from an :class:`Incidence`.
+
+    Holds the number of documents, papers per keyword and the goal x technique
+    co-occurrence matrix. Counts from different chunks, files or worker
+    processes combine with ``+``.
+    """
+
+    def __init__(self, n_goals, docs, keyword_counts, goal_technique):
+        self.n_goals = n_goals
+        self.docs = docs
+        self.keyword_counts = keyword_counts
+        self.goal_technique = goal_technique
+
+    @classmethod
+    def from_incidence(cls, incidence):
+        goal_matrix = incidence.goal_matrix.astype(np.int64)
+        return cls(
+            incidence.matcher.n_goals,
+            incidence.n_docs,
+            np.asarray(incidence.matrix.sum(axis=0), dtype=np.int64).ravel(),
+            (goal_matrix.T @ incidence.technique_matrix.astype(np.int64)).toarray(),
+        )
+
+    @property
+    def goal_counts(self):
+        return self.keyword_counts[:self.n_goals]
+
+    @property
+    def technique_counts(self):
+        return self.keyword_counts[self.n_goals:]
+
+    def __add__(self, other):
+        return KeywordCounts(
+            self.n_goals,
+            self.docs + other.docs,
+            self.keyword_counts + other.keyword_counts,
+            self.goal_technique + other.goal_technique,
+        )
@@ -0,0 +1,168 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+from scipy import sparse
+
+from mec_analysis.cooccurrence import ALL_DOC_TYPES, CooccurrenceTensor
+from mec_analysis.corpus import CORPUS_COLUMNS, DEFAULT_CHUNKSIZE, corpus_texts, read_typed_corpus_chunks
+from mec_analysis.cube import KeywordCube
+from mec_analysis.incidence import build_incidence, year_values
+
+STATE_VERSION = 1
+
+# Bytes hashed per read when fingerprinting the counted part of the CSV
+HASH_BLOCK = 1 << 20
+
+
+def state_path(csv_path):
+    """Directory the counts of ``csv_path`` are kept in by default."""
+    return csv_path + ".state"
+
+
+def _hash_bytes(f, hasher, n):
+    # Feed the next ``n`` bytes of ``f`` to ``hasher``
+    while n > 0:
+        block = f.read(min(HASH_BLOCK, n))
+        if not block:
+            break
+        hasher.update(block)
+        n -= len(block)
+    return hasher
+
+
+def _taxonomy_meta(matcher):
+    return {"keywords": matcher.keywords, "n_goals": matcher.n_goals, "terms": matcher.terms,
+            "term_keyword": matcher.term_keyword}
+
+
+class CorpusState:
+    """Keyword counts of the corpus CSV, updated in place as rows are appended.
+
+    Holds the (year x document type x keyword)
+    :class:`~mec_analysis.cube.KeywordCube` and the per-year goal x technique
+    :class:`~mec_analysis.cooccurrence.CooccurrenceTensor` of the first
+    ``offset`` bytes of the CSV, with a hash of those bytes. While the CSV
+    still starts with them (new rows were appended), :meth:`update` matches
+    only the rows after ``offset`` and adds their counts; if anything before
+    it changed, or the taxonomy did, everything is counted again. Reports
+    are then sliced from the counts without touching the CSV.
+    """
+
+    def __init__(self, matcher, cube, pairs, offset=0, source_hash=None, n_rows=0):
+        self.matcher = matcher
+        self.cube = cube
+        self.pairs = pairs
+        self.offset = offset
+        self.source_hash = source_hash or hashlib.sha256().hexdigest()
+        self.n_rows = n_rows
+
+    @classmethod
+    def empty(cls, matcher):
+        n_keywords = len(matcher.keywords)
+        cube = KeywordCube(matcher.keywords, matcher.n_goals, [], [], np.zeros((0, 0), dtype=np.int64),
+                           np.zeros((0, 0, n_keywords), dtype=np.int64), np.zeros((0, 0, n_keywords), dtype=np.int64))
+        pairs = CooccurrenceTensor(matcher.goals, matcher.techniques, [], [ALL_DOC_TYPES],
+                                   sparse.csr_matrix((0, len(matcher.techniques)), dtype=np.int64))
+        return cls(matcher, cube, pairs)
+
+    @classmethod
+    def load(cls, state_dir, matcher):
+        """The saved state, or an empty one if there is none or it was counted with another taxonomy."""
+        meta_path = os.path.join(state_dir, "meta.json")
+        if not os.path.exists(meta_path):
+            return cls.empty(matcher)
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STATE_VERSION or meta["taxonomy"] != _taxonomy_meta(matcher):
+            return cls.empty(matcher)
+        cube = KeywordCube.load(os.path.join(state_dir, "cube"))
+        pairs = CooccurrenceTensor.load(os.path.join(state_dir, "pairs"))
+        return cls(matcher, cube, pairs, meta["offset"], meta["source_hash"], meta["n_rows"])
+
+    def save(self, state_dir):
+        """Write the state to ``state_dir`` (the cube, the tensor and meta.json)."""
+        tmp_dir = state_dir + ".tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        self.cube.save(os.path.join(tmp_dir, "cube"))
+        self.pairs.save(os.path.join(tmp_dir, "pairs"))
+        meta = {"version": STATE_VERSION, "offset": self.offset, "source_hash": self.source_hash,
+                "n_rows": self.n_rows, "taxonomy": _taxonomy_meta(self.matcher)}
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(state_dir, ignore_errors=True)
+        os.replace(tmp_dir, state_dir)
+        return state_dir
+
+    def add(self, data):
+        """Match one chunk of :func:`~mec_analysis.corpus.read_typed_corpus_chunks` and add its counts."""
+        incidence = build_incidence(corpus_texts(data), self.matcher, years=data["Year"],
+                                    doc_types=data["Document Type"])
+        years = [int(year) if not np.isnan(year) else None for year in year_values(data["Year"])]
+        self.cube = self.cube + KeywordCube.from_incidence(incidence)
+        self.pairs = self.pairs + CooccurrenceTensor.from_incidence(incidence, years)
+        self.n_rows += len(data)
+
+    def update(self, csv_path, chunksize=DEFAULT_CHUNKSIZE):
+        """Count the rows of ``csv_path`` not counted yet; returns how many were added.
+
+        Only rows appended after ``offset`` are read when the bytes before
+        it are unchanged; otherwise the state is reset and the whole CSV
+        counted.
+        """
+        size = os.path.getsize(csv_path)
+        with open(csv_path, "rb") as f:
+            hasher = _hash_bytes(f, hashlib.sha256(), self.offset)
+            f.seek(max(self.offset - 1, 0))
+            # The counted part must still be there, unchanged and ending at a row boundary
+            appended = (self.offset <= size and hasher.hexdigest() == self.source_hash
+                        and (self.offset == 0 or f.read(1) == b"\n"))
+            if not appended:
+                fresh = CorpusState.empty(self.matcher)
+                self.cube, self.pairs, self.offset, self.n_rows = fresh.cube, fresh.pairs, 0, 0
+                hasher = hashlib.sha256()
+
+            n_before = self.n_rows
+            for data in read_typed_corpus_chunks(csv_path, CORPUS_COLUMNS, chunksize, start=self.offset, end=size):
+                self.add(data)
+            f.seek(self.offset)
+            self.source_hash = _hash_bytes(f, hasher, size - self.offset).hexdigest()
+            self.offset = size
+        return self.n_rows - n_before
+
+    def period_pairs(self, year_ranges):
+        """The goal x technique tensor summed into ``year_ranges`` (``{label: (start, end)}``)."""
+        period_of = {year: label for label, (start, end) in year_ranges.items()
+                     for year in self.pairs.periods if year is not None and start <= year <= end}
+        return self.pairs.rollup(period_of, list(year_ranges))
+
+
+def update_state(csv_path, matcher, state_dir=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Bring the saved counts of ``csv_path`` up to date; returns ``(state, rows added)``."""
+    state_dir = state_dir or state_path(csv_path)
+    state = CorpusState.load(state_dir, matcher)
+    counted = state.source_hash
+    added = state.update(csv_path, chunksize)
+    if state.source_hash != counted or not os.path.exists(os.path.join(state_dir, "meta.json")):
+        state.save(state_dir)
+    return state, added
+
+
+if __name__ == "__main__":
+    from mec_analysis.taxonomy import taxonomy_matcher
+
+    parser = argparse.ArgumentParser(description="Count the rows appended to the corpus CSV since the last run.")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("--state-dir", help="where the counts are kept (default: next to the CSV)")
+    parser.add_argument("--rebuild", action="store_true", help="count the whole CSV again")
+    args = parser.parse_args()
+
+    state_dir = args.state_dir or state_path(args.csv)
+    if args.rebuild:
+        shutil.rmtree(state_dir, ignore_errors=True)
+    state, added = update_state(args.csv, taxonomy_matcher(), state_dir)
+    print(f"✅ {added} new rows counted ({state.n_rows} in total), state saved to: {state_dir}")
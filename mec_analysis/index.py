@@ -0,0 +1,408 @@
+import argparse
+import bisect
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+from scipy import sparse
+
+from mec_analysis.corpus import TEXT_COLUMNS, _arrow_strings, corpus_texts, read_typed_corpus_chunks
+from mec_analysis.incidence import Incidence, year_values
+from mec_analysis.periods import parse_year_ranges
+
+# Columns whose text is indexed, joined with a space (as 5.2.2 and 5.3.2 match them)
+INDEX_COLUMNS = TEXT_COLUMNS
+INDEX_VERSION = 1
+SEGMENT_ROWS = 10_000
+
+# Postings of every segment, each a per-term slice of a varint byte stream
+SEGMENT_FILES = ["terms", "df", "docs", "docs_offsets", "tf", "tf_offsets", "pos", "pos_offsets"]
+
+
+def index_path(csv_path):
+    """Directory the index of ``csv_path`` is kept in by default."""
+    return csv_path + ".index"
+
+
+def _encode_varints(values):
+    # LEB128: 7 bits per byte, high bit set on all but the last byte of a value
+    values = np.asarray(values, dtype=np.uint64)
+    sizes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        sizes += rest > 0
+        rest >>= np.uint64(7)
+    data = np.empty(int(sizes.sum()), dtype=np.uint8)
+    starts = np.cumsum(sizes) - sizes
+    for k in range(int(sizes.max()) if len(sizes) else 0):
+        has_byte = sizes > k
+        byte = (values[has_byte] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (sizes[has_byte] > k + 1).astype(np.uint64) << np.uint64(7)
+        data[starts[has_byte] + k] = (byte | more).astype(np.uint8)
+    return data, sizes
+
+
+def _decode_varints(data):
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return np.zeros(0, dtype=np.int64)
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    shifts = (np.arange(len(data)) - np.repeat(starts, ends - starts + 1)) * 7
+    values = (data & 0x7F).astype(np.int64) << shifts
+    return np.add.reduceat(values, starts)
+
+
+def _grouped_cumsum(values, counts):
+    # Running sums that restart at each group of ``counts`` values
+    totals = np.cumsum(values)
+    starts = np.cumsum(counts) - counts
+    return totals - np.repeat(totals[starts] - values[starts], counts)
+
+
+def _gather(data, offsets, rows):
+    # Concatenated byte ranges offsets[r]:offsets[r + 1] of ``rows``
+    starts, ends = offsets[rows], offsets[rows + 1]
+    sizes = ends - starts
+    positions = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+    return data[positions]
+
+
+def _tokenize(texts, vocabulary):
+    """Term ids, in-segment doc numbers and positions of every token, sorted by term.
+
+    Tokens are the pieces of ``text.split(" ")``, so a text is exactly its
+    tokens joined with spaces; new tokens are added to ``vocabulary``. The
+    texts are split and interned in Arrow, so only the distinct tokens of
+    the segment become Python strings.
+    """
+    split = pc.split_pattern(_arrow_strings(texts), " ")
+    lengths = pc.list_value_length(split).to_numpy(zero_copy_only=False).astype(np.int64)
+    encoded = pc.dictionary_encode(pc.list_flatten(split))
+    term_ids = np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in encoded.dictionary.to_pylist()),
+                           dtype=np.int64, count=len(encoded.dictionary))
+    terms = term_ids[encoded.indices.to_numpy(zero_copy_only=False)]
+    docs = np.repeat(np.arange(len(lengths)), lengths)
+    positions = np.arange(len(terms)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    order = np.argsort(terms, kind="stable")
+    return terms[order], docs[order], positions[order], lengths
+
+
+def _write_segment(segment_dir, terms, docs, positions):
+    # One posting per (term, doc) with its token count and positions
+    os.makedirs(segment_dir)
+    new_posting = np.ones(len(terms), dtype=bool)
+    new_posting[1:] = (terms[1:] != terms[:-1]) | (docs[1:] != docs[:-1])
+    posting_starts = np.flatnonzero(new_posting)
+    posting_terms, posting_docs = terms[posting_starts], docs[posting_starts]
+    tf = np.diff(np.append(posting_starts, len(terms)))
+    new_term = np.ones(len(posting_terms), dtype=bool)
+    new_term[1:] = posting_terms[1:] != posting_terms[:-1]
+    term_starts = np.flatnonzero(new_term)
+
+    # Doc numbers as gaps from the term's previous doc, positions as gaps within a doc
+    doc_gaps = posting_docs.copy()
+    doc_gaps[1:] -= posting_docs[:-1]
+    doc_gaps[term_starts] = posting_docs[term_starts]
+    position_gaps = positions.copy()
+    position_gaps[1:] -= positions[:-1]
+    position_gaps[posting_starts] = positions[posting_starts]
+
+    arrays = {"terms": posting_terms[term_starts], "df": np.diff(np.append(term_starts, len(posting_terms)))}
+    for name, values, groups in [("docs", doc_gaps, term_starts), ("tf", tf, term_starts),
+                                 ("pos", position_gaps, posting_starts[term_starts])]:
+        data, sizes = _encode_varints(values)
+        offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+        if len(groups):
+            offsets[1:] = np.cumsum(np.add.reduceat(sizes, groups))
+        arrays[name], arrays[f"{name}_offsets"] = data, offsets
+    for name in SEGMENT_FILES:
+        np.save(os.path.join(segment_dir, f"{name}.npy"), arrays[name])
+
+
+def build_index(csv_path, index_dir=None, columns=INDEX_COLUMNS, segment_rows=SEGMENT_ROWS):
+    """Tokenize the corpus once and write its inverted index to ``index_dir``.
+
+    The CSV is streamed ``segment_rows`` rows at a time and every chunk
+    becomes one segment of compressed (varint, gap-encoded) postings, so
+    memory is bounded by the segment size. Year and Document Type are stored
+    as arrays aligned with the document ids (CSV row numbers). The index is
+    written to a temporary directory and moved into place when complete.
+    Returns ``index_dir``.
+    """
+    index_dir = index_dir or index_path(csv_path)
+    stat = os.stat(csv_path)
+    tmp_dir = index_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    vocabulary = {}
+    segments, years, doc_types = [], [], []
+    n_docs = max_tokens = 0
+    for chunk in read_typed_corpus_chunks(csv_path, ["Year", "Document Type"] + list(columns),
+                                          chunksize=segment_rows):
+        terms, docs, positions, lengths = _tokenize(corpus_texts(chunk, columns), vocabulary)
+        _write_segment(os.path.join(tmp_dir, f"segment-{len(segments):05d}"), terms, docs, positions)
+        segments.append([n_docs, len(chunk)])
+        years.append(year_values(chunk["Year"]))
+        doc_types.append(chunk["Document Type"].to_numpy(dtype=object))
+        n_docs += len(chunk)
+        max_tokens = max(max_tokens, int(lengths.max()) if len(lengths) else 0)
+
+    # Vocabulary in id order, plus id orders sorted by token and by reversed token
+    tokens = list(vocabulary)
+    with open(os.path.join(tmp_dir, "vocabulary.bin"), "wb") as f:
+        f.write("\x00".join(tokens).encode("utf-8"))
+    np.save(os.path.join(tmp_dir, "prefix_order.npy"),
+            np.array(sorted(range(len(tokens)), key=tokens.__getitem__), dtype=np.int64))
+    np.save(os.path.join(tmp_dir, "suffix_order.npy"),
+            np.array(sorted(range(len(tokens)), key=lambda i: tokens[i][::-1]), dtype=np.int64))
+
+    codes, labels = pd.factorize(pd.Series(np.concatenate(doc_types) if doc_types else [], dtype=object))
+    np.save(os.path.join(tmp_dir, "years.npy"), np.concatenate(years) if years else np.zeros(0))
+    np.save(os.path.join(tmp_dir, "doc_type_codes.npy"), codes.astype(np.int32))
+    meta = {
+        "version": INDEX_VERSION,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "columns": list(columns),
+        "n_docs": n_docs,
+        "max_tokens": max_tokens,
+        "doc_type_labels": list(labels),
+        "segments": segments,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(index_dir, ignore_errors=True)
+    os.replace(tmp_dir, index_dir)
+    return index_dir
+
+
+class _Segment:
+    def __init__(self, segment_dir, first_doc):
+        self.first_doc = first_doc
+        for name in SEGMENT_FILES:
+            setattr(self, name, np.load(os.path.join(segment_dir, f"{name}.npy"), mmap_mode="r"))
+
+    def _rows(self, term_ids):
+        # Rows of the segment's (sorted) terms that are among ``term_ids``
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        rows = np.searchsorted(self.terms, term_ids)
+        present = rows < len(self.terms)
+        present[present] = self.terms[rows[present]] == term_ids[present]
+        return rows[present]
+
+    def docs_of(self, term_ids):
+        """Doc ids (with repeats across terms) of the postings of ``term_ids``."""
+        rows = self._rows(term_ids)
+        if not len(rows):
+            return np.zeros(0, dtype=np.int64)
+        gaps = _decode_varints(_gather(self.docs, self.docs_offsets, rows))
+        return _grouped_cumsum(gaps, np.asarray(self.df)[rows]) + self.first_doc
+
+    def positions_of(self, term_ids):
+        """``(doc ids, positions)`` of every occurrence of ``term_ids``."""
+        rows = self._rows(term_ids)
+        if not len(rows):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        docs = _grouped_cumsum(_decode_varints(_gather(self.docs, self.docs_offsets, rows)),
+                               np.asarray(self.df)[rows]) + self.first_doc
+        tf = _decode_varints(_gather(self.tf, self.tf_offsets, rows))
+        positions = _grouped_cumsum(_decode_varints(_gather(self.pos, self.pos_offsets, rows)), tf)
+        return np.repeat(docs, tf), positions
+
+
+class CorpusIndex:
+    """Persistent inverted index over the corpus text, for ad-hoc keyword queries.
+
+    Phrases are matched as substrings of a document's lowercased text, the way
+    :class:`~mec_analysis.matcher.KeywordMatcher` matches taxonomy terms, so
+    ``docs("game theory")`` is exactly the set of papers the scripts count
+    for it. A phrase is resolved against the vocabulary (a one-word phrase
+    to every token containing it; otherwise the first word must end a token,
+    inner words must be whole tokens and the last word must start one) and
+    multi-word phrases are then checked for adjacency by token position.
+    Query results are sorted arrays of doc ids (CSV row numbers); ``years``
+    and ``doc_types`` are aligned with them.
+
+    Use :meth:`load` to get an index that is rebuilt whenever the CSV changes.
+    """
+
+    def __init__(self, index_dir):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.columns = self.meta["columns"]
+        self.n_docs = self.meta["n_docs"]
+        self.years = np.load(os.path.join(index_dir, "years.npy"), mmap_mode="r")
+        self.doc_type_labels = self.meta["doc_type_labels"]
+        self._doc_type_codes = np.load(os.path.join(index_dir, "doc_type_codes.npy"), mmap_mode="r")
+        with open(os.path.join(index_dir, "vocabulary.bin"), "rb") as f:
+            blob = f.read().decode("utf-8")
+        self.vocabulary = blob.split("\x00") if blob or self.n_docs else []
+        self.term_id = {token: i for i, token in enumerate(self.vocabulary)}
+        self._prefix_order = np.load(os.path.join(index_dir, "prefix_order.npy"))
+        self._suffix_order = np.load(os.path.join(index_dir, "suffix_order.npy"))
+        self._prefix_keys = [self.vocabulary[i] for i in self._prefix_order]
+        self._suffix_keys = [self.vocabulary[i][::-1] for i in self._suffix_order]
+        self._segments = [_Segment(os.path.join(index_dir, f"segment-{i:05d}"), first_doc)
+                          for i, (first_doc, _) in enumerate(self.meta["segments"])]
+        self._resolved = {}
+
+    @classmethod
+    def build(cls, csv_path, index_dir=None, columns=INDEX_COLUMNS, segment_rows=SEGMENT_ROWS):
+        return cls(build_index(csv_path, index_dir, columns, segment_rows))
+
+    @classmethod
+    def load(cls, csv_path, index_dir=None, columns=INDEX_COLUMNS):
+        """Open the index of ``csv_path``, (re)building it if missing or out of date."""
+        index_dir = index_dir or index_path(csv_path)
+        meta_path = os.path.join(index_dir, "meta.json")
+        if os.path.exists(meta_path):
+            stat = os.stat(csv_path)
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            fresh = (meta.get("version") == INDEX_VERSION and meta["source_mtime_ns"] == stat.st_mtime_ns
+                     and meta["source_size"] == stat.st_size and meta["columns"] == list(columns))
+            if fresh:
+                return cls(index_dir)
+        return cls.build(csv_path, index_dir, columns)
+
+    @property
+    def doc_types(self):
+        """Document Type of every doc (NaN where missing)."""
+        labels = np.array(self.doc_type_labels + [np.nan], dtype=object)
+        return labels[self._doc_type_codes]
+
+    def _sorted_range(self, keys, order, prefix):
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\U0010ffff", start)
+        return order[start:end]
+
+    def tokens_with(self, fragment, where="anywhere"):
+        """Ids of vocabulary tokens that contain ``fragment`` ("anywhere"),
+        start with it ("start"), end with it ("end") or equal it ("exact")."""
+        if where == "exact":
+            return np.array([self.term_id[fragment]] if fragment in self.term_id else [], dtype=np.int64)
+        if where == "start":
+            return np.sort(self._sorted_range(self._prefix_keys, self._prefix_order, fragment))
+        if where == "end":
+            return np.sort(self._sorted_range(self._suffix_keys, self._suffix_order, fragment[::-1]))
+        if where == "anywhere":
+            return np.array([i for i, token in enumerate(self.vocabulary) if fragment in token], dtype=np.int64)
+        raise ValueError(f"Unknown token position {where!r}")
+
+    def _phrase_terms(self, phrase):
+        # Candidate tokens for each word of the phrase, resolved once per phrase
+        if phrase not in self._resolved:
+            words = phrase.split(" ")
+            if len(words) == 1:
+                slots = [self.tokens_with(words[0])]
+            else:
+                slots = ([self.tokens_with(words[0], "end")]
+                         + [self.tokens_with(word, "exact") for word in words[1:-1]]
+                         + [self.tokens_with(words[-1], "start")])
+            self._resolved[phrase] = slots
+        return self._resolved[phrase]
+
+    def docs(self, phrase):
+        """Sorted ids of the documents whose text contains ``phrase``."""
+        slots = self._phrase_terms(phrase.lower())
+        if any(len(slot) == 0 for slot in slots):
+            return np.zeros(0, dtype=np.int64)
+        if len(slots) == 1:
+            return np.unique(np.concatenate([segment.docs_of(slots[0]) for segment in self._segments] or [[]])
+                             ).astype(np.int64)
+
+        # Occurrences of word k at position p of doc d vote for a phrase start
+        # at (d, p - k); the phrase occurs where every word votes
+        stride = self.meta["max_tokens"] + len(slots)
+        found = []
+        for segment in self._segments:
+            starts = None
+            for k in sorted(range(len(slots)), key=lambda k: len(slots[k])):
+                docs, positions = segment.positions_of(slots[k])
+                # A position holds one token, so the keys of a slot are distinct
+                keys = np.sort(docs * stride + positions - k + len(slots))
+                starts = keys if starts is None else np.intersect1d(starts, keys, assume_unique=True)
+                if not len(starts):
+                    break
+            starts = starts // stride
+            found.append(starts[np.append(True, starts[1:] != starts[:-1])] if len(starts) else starts)
+        return np.concatenate(found or [np.zeros(0, dtype=np.int64)]).astype(np.int64)
+
+    def all_of(self, *phrases):
+        """Documents containing every phrase (AND)."""
+        result = np.arange(self.n_docs)
+        for phrase in phrases:
+            result = np.intersect1d(result, self.docs(phrase), assume_unique=True)
+        return result
+
+    def any_of(self, *phrases):
+        """Documents containing at least one of the phrases (OR)."""
+        return np.unique(np.concatenate([self.docs(phrase) for phrase in phrases] or [np.zeros(0, dtype=np.int64)]))
+
+    def select(self, docs=None, years=None, doc_types=None):
+        """Restrict ``docs`` (default: all) to a ``(start, end)`` year span and/or document types."""
+        docs = np.arange(self.n_docs) if docs is None else np.asarray(docs, dtype=np.int64)
+        keep = np.ones(len(docs), dtype=bool)
+        if years is not None:
+            doc_years = self.years[docs]
+            keep &= (doc_years >= years[0]) & (doc_years <= years[1])
+        if doc_types is not None:
+            codes = [self.doc_type_labels.index(t) for t in doc_types if t in self.doc_type_labels]
+            keep &= np.isin(self._doc_type_codes[docs], codes)
+        return docs[keep]
+
+    def query(self, all_of=(), any_of=(), years=None, doc_types=None):
+        """Documents matching every phrase of ``all_of`` and one of ``any_of``, within the filters."""
+        docs = self.all_of(*all_of)
+        if any_of:
+            docs = np.intersect1d(docs, self.any_of(*any_of), assume_unique=True)
+        return self.select(docs, years, doc_types)
+
+    def term_matrix(self, terms, docs=None):
+        """Sparse ``docs`` x ``terms`` matrix with a 1 where the document contains the term."""
+        docs = np.arange(self.n_docs) if docs is None else np.asarray(docs, dtype=np.int64)
+        rows, cols = [], []
+        for j, term in enumerate(terms):
+            hits = self.docs(term)
+            at = np.searchsorted(docs, hits)
+            inside = at < len(docs)
+            at, hits = at[inside], hits[inside]
+            at = at[docs[at] == hits]
+            rows.append(at)
+            cols.append(np.full(len(at), j))
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(docs), len(terms)))
+
+    def incidence(self, matcher, docs=None):
+        """:class:`~mec_analysis.incidence.Incidence` of ``matcher``'s terms over ``docs`` (sorted ids).
+
+        Equal to matching the documents' text with ``matcher``, but computed
+        from the postings alone.
+        """
+        docs = np.arange(self.n_docs) if docs is None else np.asarray(docs, dtype=np.int64)
+        return Incidence(matcher, self.term_matrix(matcher.terms, docs), self.years[docs], self.doc_types[docs])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the corpus index and count documents matching a query.")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("--index", help="index directory (default: <csv>.index)")
+    parser.add_argument("--all", nargs="+", default=[], metavar="PHRASE", help="phrases that must all occur")
+    parser.add_argument("--any", nargs="+", default=[], metavar="PHRASE", help="phrases of which one must occur")
+    parser.add_argument("--years", help="year span, e.g. 2020-2022")
+    parser.add_argument("--doc-type", nargs="+", help="document types, e.g. 'Conference paper'")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index even if it is up to date")
+    args = parser.parse_args()
+
+    index = (CorpusIndex.build if args.rebuild else CorpusIndex.load)(args.csv, args.index)
+    years = next(iter(parse_year_ranges([args.years]).values())) if args.years else None
+    docs = index.query(args.all, args.any, years, args.doc_type)
+    print(f"{len(docs)} of {index.n_docs} documents match")
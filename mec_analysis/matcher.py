@@ -0,0 +1,106 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """Finds every goal/technique keyword in a text in a single pass.
+
+    All raw terms (including their alias spellings) are compiled once into an
+    Aho-Corasick automaton, so scanning a text costs one step per character no
+    matter how many terms the taxonomy has. Matches are reported under their
+    canonical keyword, exactly like the old ``raw in text`` loops did.
+    """
+
+    def __init__(self, goals_raw, techniques_raw, goal_aliases=None, technique_aliases=None):
+        goal_aliases = goal_aliases or {}
+        technique_aliases = technique_aliases or {}
+
+        # Goals first, then techniques, each sorted (same order as the reports)
+        self.goals = sorted({goal_aliases.get(g, g) for g in goals_raw})
+        self.techniques = sorted({technique_aliases.get(t, t) for t in techniques_raw})
+        shared = set(self.goals) & set(self.techniques)
+        if shared:
+            raise ValueError(f"Keywords listed as both a goal and a technique: {sorted(shared)}")
+        self.keywords = self.goals + self.techniques
+        self.index = {k: i for i, k in enumerate(self.keywords)}
+        self.n_goals = len(self.goals)
+
+        # Raw spellings, each tagged with the canonical keyword it counts towards
+        # (the first one wins within a category; a goal and a technique may not share one)
+        spellings = {}
+        for raw_list, aliases in ((goals_raw, goal_aliases), (techniques_raw, technique_aliases)):
+            for raw in raw_list:
+                keyword = self.index[aliases.get(raw, raw)]
+                first = spellings.setdefault(raw.lower(), keyword)
+                if (first < self.n_goals) != (keyword < self.n_goals):
+                    raise ValueError(f"{raw!r} is spelled like both a goal and a technique")
+        self.terms = list(spellings)
+        self.term_keyword = list(spellings.values())
+
+        self._build()
+
+    def _build(self):
+        # Trie
+        goto = [{}]
+        out = [set()]
+        for term_id, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(set())
+                state = nxt
+            out[state].add(term_id)
+
+        # Failure links (BFS), folded into a full transition table so that the
+        # scan loop never has to follow failure links at match time.
+        delta = [dict(edges) for edges in goto]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback_state = fail[state]
+            out[state] |= out[fallback_state]
+            for ch, nxt in delta[fallback_state].items():
+                delta[state].setdefault(ch, nxt)
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fallback_state].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._out_terms = [frozenset(o) if o else None for o in out]
+        self._out = [frozenset(self.term_keyword[t] for t in o) if o else None for o in out]
+
+    def _scan(self, text, out):
+        delta = self._delta
+        state = 0
+        found = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state] is not None:
+                found |= out[state]
+        return found
+
+    def find_ids(self, text):
+        """Return the set of keyword indices (into ``self.keywords``) found in ``text``."""
+        return self._scan(text, self._out)
+
+    def find_term_ids(self, text):
+        """Return the set of raw term indices (into ``self.terms``) found in ``text``.
+
+        Unlike :meth:`find_ids`, two spellings of the same keyword are reported
+        separately, for reports that count every matching spelling.
+        """
+        return self._scan(text, self._out_terms)
+
+    def find(self, text):
+        """Return ``(found_goals, found_techniques)`` as sets of canonical keywords."""
+        goals, techniques = set(), set()
+        for i in self.find_ids(text):
+            if i < self.n_goals:
+                goals.add(self.keywords[i])
+            else:
+                techniques.add(self.keywords[i])
+        return goals, techniques
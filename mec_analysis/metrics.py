@@ -0,0 +1,159 @@
+import cProfile
+import csv
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+STAGE_FIELDS = ["stage", "period", "calls", "wall_s", "rows", "rows_per_s", "bytes_read", "peak_rss_mb"]
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+class RunMetrics:
+    """Per-stage instrumentation of one analysis run.
+
+    Stages are named load, normalize, match, aggregate, export and plot.
+    Each ``with metrics.stage(...)`` block adds its wall time, rows and bytes
+    read to the record of that (stage, period); repeated blocks, e.g. one per
+    streamed chunk, accumulate into the same record. ``peak_rss_mb`` is the
+    process's memory high-water mark when the stage last finished, so the
+    stage that raised it is the one where it first jumps. With
+    ``report_dir=None`` nothing is written, but records are still collected
+    (worker processes return them to be merged with :meth:`merge`).
+
+    With ``profile=True``, stages opened with ``profile=True`` (the matching
+    loop) run under cProfile and each is dumped to a ``.prof`` file readable
+    with pstats, snakeviz or any other cProfile viewer.
+    """
+
+    def __init__(self, name, report_dir=None, profile=False):
+        self.name = name
+        self.report_dir = report_dir
+        self.profile = profile
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.records = {}
+        self._profiles = {}
+
+    def _record(self, stage, period):
+        key = (stage, period)
+        if key not in self.records:
+            self.records[key] = {"stage": stage, "period": period, "calls": 0, "wall_s": 0.0, "rows": 0,
+                                 "bytes_read": 0, "peak_rss_mb": None}
+        return self.records[key]
+
+    @contextmanager
+    def stage(self, stage, period=None, rows=0, bytes_read=0, profile=False):
+        """Time a block as ``stage`` (of ``period``).
+
+        Yields the stage record; ``rows``/``bytes_read`` known only inside the
+        block can be added to it there.
+        """
+        record = self._record(stage, period)
+        record["rows"] += rows
+        record["bytes_read"] += bytes_read
+        profiler = None
+        if profile and self.profile:
+            profiler = self._profiles.setdefault((stage, period), cProfile.Profile())
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["wall_s"] += time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            record["calls"] += 1
+            record["peak_rss_mb"] = peak_rss_mb()
+
+    def timed(self, iterable, stage, period=None, bytes_read=0):
+        """Iterate ``iterable`` (e.g. streamed chunks), timing each step as ``stage``.
+
+        Items with a length (DataFrames) count as that many rows.
+        """
+        self._record(stage, period)["bytes_read"] += bytes_read
+        iterator = iter(iterable)
+        while True:
+            with self.stage(stage, period) as record:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    record["calls"] -= 1  # incremented again on exit
+                    return
+                record["rows"] += len(item) if hasattr(item, "__len__") else 0
+            yield item
+
+    def merge(self, records):
+        """Add stage records collected elsewhere (e.g. in a worker process)."""
+        for (stage, period), other in records.items():
+            record = self._record(stage, period)
+            for field in ("calls", "wall_s", "rows", "bytes_read"):
+                record[field] += other[field]
+            peaks = [p for p in (record["peak_rss_mb"], other["peak_rss_mb"]) if p is not None]
+            record["peak_rss_mb"] = max(peaks) if peaks else None
+
+    def stage_rows(self):
+        rows = []
+        for record in self.records.values():
+            row = dict(record)
+            row["wall_s"] = round(row["wall_s"], 4)
+            if record["rows"] and record["wall_s"]:
+                row["rows_per_s"] = round(record["rows"] / record["wall_s"], 1)
+            else:
+                row["rows_per_s"] = None
+            row["peak_rss_mb"] = round(row["peak_rss_mb"], 1) if row["peak_rss_mb"] is not None else None
+            rows.append({field: row[field] for field in STAGE_FIELDS})
+        return rows
+
+    def report(self):
+        return {
+            "run": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._start, 4),
+            "peak_rss_mb": round(peak_rss_mb(), 1) if resource is not None else None,
+            "stages": self.stage_rows(),
+        }
+
+    def _base_path(self):
+        return os.path.join(self.report_dir, f"{self.name}_{self.started:%Y%m%d-%H%M%S}")
+
+    def dump_profiles(self):
+        """Write the cProfile data of profiled stages as ``.prof`` files to ``report_dir``."""
+        if self.report_dir is None or not self._profiles:
+            return
+        os.makedirs(self.report_dir, exist_ok=True)
+        for (stage, period), profiler in self._profiles.items():
+            profiler.dump_stats(f"{self._base_path()}_{stage}{'_' + period if period else ''}.prof")
+
+    def write(self):
+        """Write ``<name>_<timestamp>.json``/``.csv`` (and any ``.prof``) to ``report_dir``.
+
+        Returns the JSON report path, or None when reporting is disabled.
+        """
+        if self.report_dir is None:
+            return None
+        os.makedirs(self.report_dir, exist_ok=True)
+        base = self._base_path()
+        report = self.report()
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        with open(base + ".csv", "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=STAGE_FIELDS)
+            writer.writeheader()
+            writer.writerows(report["stages"])
+        self.dump_profiles()
+        return base + ".json"
@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+
+import numpy as np
+from scipy import sparse
+
+
+def read_network_json(json_path):
+    """Parse a VOSviewer JSON export into flat column arrays.
+
+    Returns a dict with item columns (``ids``, ``labels``, ``x``, ``y``,
+    ``cluster``, ``weights``/``scores`` as name -> array) and link columns
+    (``link_source``, ``link_target``, ``link_strength``).
+    """
+    with open(json_path, 'r', encoding='utf-8-sig') as f:
+        network = json.load(f)['network']
+    items = network['items']
+    links = network.get('links', [])
+
+    weight_names = list(dict.fromkeys(name for item in items for name in item.get('weights', {})))
+    score_names = list(dict.fromkeys(name for item in items for name in item.get('scores', {})))
+    return {
+        "ids": np.fromiter((item['id'] for item in items), dtype=np.int64, count=len(items)),
+        "labels": [item['label'] for item in items],
+        "x": np.fromiter((item.get('x', np.nan) for item in items), dtype=float, count=len(items)),
+        "y": np.fromiter((item.get('y', np.nan) for item in items), dtype=float, count=len(items)),
+        "cluster": np.fromiter((item.get('cluster', 0) for item in items), dtype=np.int32, count=len(items)),
+        "weights": {
+            name: np.fromiter((item.get('weights', {}).get(name, np.nan) for item in items), dtype=float,
+                              count=len(items))
+            for name in weight_names
+        },
+        "scores": {
+            name: np.fromiter((item.get('scores', {}).get(name, np.nan) for item in items), dtype=float,
+                              count=len(items))
+            for name in score_names
+        },
+        "link_source": np.fromiter((link['source_id'] for link in links), dtype=np.int64, count=len(links)),
+        "link_target": np.fromiter((link['target_id'] for link in links), dtype=np.int64, count=len(links)),
+        "link_strength": np.fromiter((link['strength'] for link in links), dtype=float, count=len(links)),
+    }
+
+
+def binary_path(json_path):
+    """Directory holding the binary form of ``json_path``."""
+    return json_path + ".bin"
+
+
+def write_network_binary(arrays, bin_dir, source_stat=None):
+    """Write network ``arrays`` as one ``.npy`` file per column under ``bin_dir``.
+
+    Labels are interned: ``label_table.bin`` holds each distinct label once
+    (UTF-8, addressed by ``label_offsets.npy``) and ``label_codes.npy`` maps
+    items to entries of that table.
+    """
+    tmp_dir = bin_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    table, codes = np.unique(np.asarray(arrays["labels"], dtype=object).astype(str), return_inverse=True)
+    encoded = [label.encode("utf-8") for label in table]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    with open(os.path.join(tmp_dir, "label_table.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+    np.save(os.path.join(tmp_dir, "label_offsets.npy"), offsets)
+    np.save(os.path.join(tmp_dir, "label_codes.npy"), codes.astype(np.int32))
+
+    columns = ["ids", "x", "y", "cluster", "link_source", "link_target", "link_strength"]
+    for name in columns:
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), arrays[name])
+    for group in ("weights", "scores"):
+        for i, values in enumerate(arrays[group].values()):
+            np.save(os.path.join(tmp_dir, f"{group}_{i}.npy"), values)
+
+    meta = {
+        "weights": list(arrays["weights"]),
+        "scores": list(arrays["scores"]),
+        "source_mtime_ns": source_stat.st_mtime_ns if source_stat else None,
+        "source_size": source_stat.st_size if source_stat else None,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(bin_dir, ignore_errors=True)
+    os.replace(tmp_dir, bin_dir)
+
+
+def read_network_binary(bin_dir):
+    """Load arrays written by :func:`write_network_binary` (memory-mapped)."""
+    def column(name):
+        return np.load(os.path.join(bin_dir, f"{name}.npy"), mmap_mode="r")
+
+    with open(os.path.join(bin_dir, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(os.path.join(bin_dir, "label_table.bin"), "rb") as f:
+        table_bytes = f.read()
+    offsets = column("label_offsets")
+    table = [table_bytes[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    arrays = {name: column(name) for name in
+              ["ids", "x", "y", "cluster", "link_source", "link_target", "link_strength"]}
+    arrays["labels"] = [table[code] for code in column("label_codes")]
+    arrays["weights"] = {name: column(f"weights_{i}") for i, name in enumerate(meta["weights"])}
+    arrays["scores"] = {name: column(f"scores_{i}") for i, name in enumerate(meta["scores"])}
+    return arrays
+
+
+def load_network_arrays(json_path):
+    """Return the network arrays of ``json_path``, via its binary form.
+
+    The binary form is (re)built whenever the JSON's mtime or size differs
+    from the one it was converted from; otherwise the JSON is not parsed.
+    """
+    bin_dir = binary_path(json_path)
+    stat = os.stat(json_path)
+    try:
+        with open(os.path.join(bin_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        fresh = meta["source_mtime_ns"] == stat.st_mtime_ns and meta["source_size"] == stat.st_size
+    except (OSError, ValueError, KeyError):
+        fresh = False
+    if not fresh:
+        write_network_binary(read_network_json(json_path), bin_dir, stat)
+    return read_network_binary(bin_dir)
+
+
+class KeywordNetwork:
+    """VOSviewer keyword network stored as a CSR adjacency structure.
+
+    Items are kept in arrays ordered by id (``ids``, ``x``, ``y``,
+    ``cluster`` and the ``weights``/``scores`` columns). For the item at
+    position ``i``, ``neighbours[indptr[i]:indptr[i + 1]]`` are the positions
+    of its linked items and ``strengths[...]`` the link strengths, in the
+    order the links appear in the export. ``labels`` holds the lowercased
+    labels with ``aliases`` applied.
+    """
+
+    def __init__(self, arrays, aliases=None):
+        aliases = aliases or {}
+        order = np.argsort(arrays["ids"], kind="stable")
+        self.ids = np.asarray(arrays["ids"])[order]
+        self.raw_labels = np.asarray([arrays["labels"][i].lower() for i in order], dtype=object)
+        self.labels = np.asarray([aliases.get(label, label) for label in self.raw_labels], dtype=object)
+        self.x = np.asarray(arrays["x"])[order]
+        self.y = np.asarray(arrays["y"])[order]
+        self.cluster = np.asarray(arrays["cluster"])[order]
+        self.weights = {name: np.asarray(values)[order] for name, values in arrays["weights"].items()}
+        self.scores = {name: np.asarray(values)[order] for name, values in arrays["scores"].items()}
+        # Lookup by raw label, like keyword_to_id in 5.2.1 (last item wins)
+        self.position = {label: i for i, label in enumerate(self.raw_labels)}
+
+        # Every link is stored in both directions (self-loops once), sorted
+        # by node and then by link order so ties keep export order.
+        strengths = np.asarray(arrays["link_strength"], dtype=float)
+        src = self._positions_of(arrays["link_source"])
+        tgt = self._positions_of(arrays["link_target"])
+        link_index = np.arange(len(src))
+        not_loop = src != tgt
+        node = np.concatenate([src, tgt[not_loop]])
+        other = np.concatenate([tgt, src[not_loop]])
+        link_order = np.concatenate([link_index, link_index[not_loop]])
+        weight = np.concatenate([strengths, strengths[not_loop]])
+
+        edge_order = np.lexsort((link_order, node))
+        self.neighbours = other[edge_order]
+        self.strengths = weight[edge_order]
+        self.indptr = np.zeros(len(self.ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(node, minlength=len(self.ids)), out=self.indptr[1:])
+
+    def _positions_of(self, ids):
+        # Positions of item ``ids``; a link to an id missing from the items is an error, not its neighbour
+        ids = np.asarray(ids)
+        positions = np.searchsorted(self.ids, ids)
+        known = np.zeros(len(ids), dtype=bool)
+        in_range = positions < len(self.ids)
+        known[in_range] = self.ids[positions[in_range]] == ids[in_range]
+        if not known.all():
+            unknown = np.unique(ids[~known])
+            shown = ", ".join(str(i) for i in unknown[:10]) + (", ..." if len(unknown) > 10 else "")
+            raise ValueError(f"Links refer to {len(unknown)} item id(s) missing from the items: {shown}")
+        return positions
+
+    @classmethod
+    def load(cls, json_path, aliases=None):
+        """Build the network from the binary form of ``json_path`` (see :func:`load_network_arrays`)."""
+        return cls(load_network_arrays(json_path), aliases)
+
+    def __contains__(self, keyword):
+        return keyword in self.position
+
+    def __len__(self):
+        return len(self.ids)
+
+    def adjacency(self):
+        """Symmetric ``items x items`` sparse matrix of link strengths (self-links on the diagonal)."""
+        matrix = sparse.csr_matrix((self.strengths, self.neighbours, self.indptr), shape=(len(self), len(self)))
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+        return matrix
+
+    def mask(self, keywords):
+        """Boolean mask over items whose (normalized) label is in ``keywords``."""
+        return np.isin(self.labels, list(keywords))
+
+    def neighbours_of(self, keyword):
+        """Return ``(positions, strengths)`` of all items linked to ``keyword``."""
+        i = self.position[keyword]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.neighbours[start:end], self.strengths[start:end]
+
+    def top_k_neighbours(self, keyword, k=5, category_filter=None):
+        """Return the ``k`` strongest ``(label, strength)`` links of ``keyword``.
+
+        ``category_filter`` restricts neighbours to a collection of normalized
+        labels (or a precomputed :meth:`mask`). Selection uses a partial
+        partition, so only the neighbours at or above the k-th strength get
+        sorted. Equal strengths keep export order.
+        """
+        if keyword not in self.position:
+            return None
+        positions, strengths = self.neighbours_of(keyword)
+        if category_filter is not None:
+            if not isinstance(category_filter, np.ndarray):
+                category_filter = self.mask(category_filter)
+            keep = category_filter[positions]
+            positions, strengths = positions[keep], strengths[keep]
+
+        if len(strengths) > k > 0:
+            kth = np.partition(strengths, len(strengths) - k)[len(strengths) - k]
+            candidates = np.flatnonzero(strengths >= kth)
+        else:
+            candidates = np.arange(len(strengths))
+        top = candidates[np.argsort(-strengths[candidates], kind="stable")][:k]
+        return [(self.labels[positions[j]], float(strengths[j])) for j in top]
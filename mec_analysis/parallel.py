@@ -0,0 +1,18 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def parallel_map(func, tasks, workers=None):
+    """Return ``[func(task) for task in tasks]`` computed in a process pool.
+
+    ``workers`` defaults to the number of CPUs (capped at the number of
+    tasks); ``workers=1`` runs in this process, which is handy for debugging.
+    ``func`` must be a module-level function, and scripts that call this need
+    an ``if __name__ == "__main__":`` guard so worker processes can import them.
+    """
+    tasks = list(tasks)
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers == 1:
+        return [func(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, tasks))
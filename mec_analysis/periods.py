@@ -0,0 +1,148 @@
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from mec_analysis.corpus import DEFAULT_CHUNKSIZE
+from mec_analysis.incidence import assign_periods
+
+# Default thesis periods (label -> inclusive year range)
+DEFAULT_YEAR_RANGES = {
+    "2011_2013": (2011, 2013),
+    "2014_2016": (2014, 2016),
+    "2017_2019": (2017, 2019),
+    "2020_2022": (2020, 2022),
+    "2023_2024": (2023, 2024),
+}
+
+METADATA_FILE = "_periods.json"
+
+
+def check_disjoint(year_ranges):
+    """Raise ValueError if two of the ``year_ranges`` share a year (a row can only go to one period)."""
+    spans = sorted(year_ranges.items(), key=lambda item: item[1])
+    for (label, (_, end)), (next_label, (next_start, _)) in zip(spans, spans[1:]):
+        if next_start <= end:
+            raise ValueError(f"Periods {label!r} and {next_label!r} overlap")
+
+
+def parse_year_ranges(specs, overlapping=False):
+    """Turn specs like ``["2011-2013", "2024"]`` into ``{"2011_2013": (2011, 2013), "2024_2024": ...}``.
+
+    Ranges that share a year are rejected unless ``overlapping`` is set
+    (e.g. for trend windows, which are not used to assign rows to periods).
+    """
+    year_ranges = {}
+    for spec in specs:
+        start, _, end = spec.partition("-")
+        start, end = int(start), int(end or start)
+        if end < start:
+            raise ValueError(f"Invalid period {spec!r}: end year before start year")
+        year_ranges[f"{start}_{end}"] = (start, end)
+    if not overlapping:
+        check_disjoint(year_ranges)
+    return year_ranges
+
+
+def partition_path(store_path, period):
+    return os.path.join(store_path, f"period={period}", "part-0.parquet")
+
+
+def partition_corpus(input_file, store_path, year_ranges=DEFAULT_YEAR_RANGES, columns=None,
+                     chunksize=DEFAULT_CHUNKSIZE):
+    """Split the Scopus CSV into one Parquet partition per period in a single scan.
+
+    The CSV is streamed in chunks; every chunk is bucketed by Year once and
+    each bucket is appended to its period's Parquet file. ``columns`` limits
+    the stored columns (default: all; Year is always kept). Text columns are
+    stored as strings and Year as float, so all chunks share one schema.
+    Every period gets a partition file, also one without rows. The
+    ``year_ranges`` must not overlap. Returns the number of rows written per
+    period.
+    """
+    check_disjoint(year_ranges)
+    wanted = None if columns is None else set(columns) | {"Year"}
+    read_columns = None if wanted is None else (lambda col: col in wanted)
+    header = pd.read_csv(input_file, usecols=read_columns, nrows=0).columns
+    schema = pa.schema([pa.field(col, pa.float64() if col == "Year" else pa.string()) for col in header])
+    chunks = pd.read_csv(input_file, usecols=read_columns, dtype=str, chunksize=chunksize)
+
+    os.makedirs(store_path, exist_ok=True)
+    writers = {}
+    rows = {period: 0 for period in year_ranges}
+    try:
+        for period in year_ranges:
+            os.makedirs(os.path.dirname(partition_path(store_path, period)), exist_ok=True)
+            writers[period] = pq.ParquetWriter(partition_path(store_path, period), schema)
+        for chunk in chunks:
+            chunk = chunk.assign(Year=pd.to_numeric(chunk["Year"], errors="coerce"))
+            periods = assign_periods(chunk["Year"], year_ranges)
+            codes, labels = pd.factorize(pd.Series(periods, dtype=object))
+            for code, period in enumerate(labels):
+                part = chunk[codes == code]
+                writers[period].write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+                rows[period] += len(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    with open(os.path.join(store_path, METADATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            "year_ranges": {period: list(bounds) for period, bounds in year_ranges.items()},
+            "rows": rows,
+        }, f, indent=2)
+    return rows
+
+
+def store_year_ranges(store_path):
+    """Return the ``{period: (start, end)}`` mapping a store was written with."""
+    with open(os.path.join(store_path, METADATA_FILE), 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    return {period: tuple(bounds) for period, bounds in metadata["year_ranges"].items()}
+
+
+def partition_tasks(store_path, periods=None, rows_per_task=DEFAULT_CHUNKSIZE):
+    """Split the requested periods into ``(period, row_groups)`` work units.
+
+    Consecutive Parquet row groups are packed into units of about
+    ``rows_per_task`` rows, so a large period is spread over several workers.
+    """
+    available = store_year_ranges(store_path)
+    tasks = []
+    for period in (available if periods is None else periods):
+        metadata = pq.ParquetFile(partition_path(store_path, period)).metadata
+        period_tasks, group, group_rows = [], [], 0
+        for i in range(metadata.num_row_groups):
+            group.append(i)
+            group_rows += metadata.row_group(i).num_rows
+            if group_rows >= rows_per_task:
+                period_tasks.append((period, group))
+                group, group_rows = [], 0
+        # Always emit at least one unit so empty periods still get reported
+        if group or not period_tasks:
+            period_tasks.append((period, group))
+        tasks.extend(period_tasks)
+    return tasks
+
+
+def read_partition(store_path, period, columns=None, row_groups=None):
+    """Read one period (or just ``row_groups`` of it) as a DataFrame."""
+    parquet_file = pq.ParquetFile(partition_path(store_path, period))
+    if row_groups is None:
+        return parquet_file.read(columns=columns).to_pandas()
+    return parquet_file.read_row_groups(row_groups, columns=columns).to_pandas()
+
+
+def partition_bytes(store_path, period, columns=None, row_groups=None):
+    """Compressed on-disk size of the ``columns``/``row_groups`` of one period (what a read fetches)."""
+    metadata = pq.ParquetFile(partition_path(store_path, period)).metadata
+    total = 0
+    for i in (range(metadata.num_row_groups) if row_groups is None else row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            if columns is None or column.path_in_schema in columns:
+                total += column.total_compressed_size
+    return total
@@ -0,0 +1,138 @@
+import hashlib
+import inspect
+import json
+import os
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return [path, None, None]
+    return [path, stat.st_mtime_ns, stat.st_size]
+
+
+def _source(func):
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return func.__qualname__
+
+
+class Stage:
+    def __init__(self, name, func, deps=(), files=(), config=None, outputs=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.files = list(files)
+        self.config = config
+        self.outputs = list(outputs)
+
+
+class Pipeline:
+    """Runs analysis stages as a dependency graph, skipping those that are up to date.
+
+    A stage is a function called with the results of its ``deps`` as keyword
+    arguments. Stages with ``outputs`` are reports; the others produce
+    intermediate results (the parsed corpus, the keyword matches), which are
+    computed at most once per run and only when a report that actually runs
+    needs them.
+
+    Each stage has a fingerprint hashing its code, its ``config``, the mtime
+    and size of its input ``files`` and the fingerprints of its deps, so it
+    changes whenever anything upstream does. A report is skipped when its
+    fingerprint equals the one recorded in ``state_path`` after its last
+    successful run and all its outputs still exist. Code the stage function
+    calls is not part of the fingerprint; use ``force=True`` after changing it.
+    A report other stages depend on (e.g. a cleaned corpus they read) is not
+    rerun for them while it is up to date; its result is then its outputs.
+    """
+
+    def __init__(self, state_path=".pipeline_state.json", metrics=None):
+        self.state_path = state_path
+        self.metrics = metrics
+        self.stages = {}
+        self._results = {}
+        self._fingerprints = {}
+        self._force = False
+        self.state = {}
+        if os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def stage(self, name, deps=(), files=(), config=None, outputs=()):
+        """Decorator registering a function as stage ``name``."""
+        def register(func):
+            missing = [dep for dep in deps if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {name!r} depends on unknown stages {missing}")
+            self.stages[name] = Stage(name, func, deps, files, config, outputs)
+            return func
+        return register
+
+    def fingerprint(self, name):
+        if name not in self._fingerprints:
+            stage = self.stages[name]
+            key = {
+                "name": name,
+                "code": _source(stage.func),
+                "config": stage.config,
+                "files": [_file_stamp(path) for path in stage.files],
+                "deps": [self.fingerprint(dep) for dep in stage.deps],
+                "outputs": stage.outputs,
+            }
+            encoded = json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+            self._fingerprints[name] = hashlib.sha256(encoded).hexdigest()
+        return self._fingerprints[name]
+
+    def is_current(self, name):
+        stage = self.stages[name]
+        return (bool(stage.outputs) and self.state.get(name) == self.fingerprint(name)
+                and all(os.path.exists(path) for path in stage.outputs))
+
+    def result(self, name):
+        """Result of stage ``name``, computing it (and its deps) on first use."""
+        if name not in self._results and not self._force and self.is_current(name):
+            self._results[name] = list(self.stages[name].outputs)
+        if name not in self._results:
+            stage = self.stages[name]
+            kwargs = {dep: self.result(dep) for dep in stage.deps}
+            for path in stage.outputs:
+                if os.path.dirname(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.metrics is not None:
+                with self.metrics.stage(name):
+                    self._results[name] = stage.func(**kwargs)
+            else:
+                self._results[name] = stage.func(**kwargs)
+            if stage.outputs:
+                self.state[name] = self.fingerprint(name)
+                self._save_state()
+        return self._results[name]
+
+    def _save_state(self):
+        if os.path.dirname(self.state_path):
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, targets=None, force=False):
+        """Bring the report stages ``targets`` (default: all) up to date.
+
+        Returns ``{stage: "ran" | "up to date"}`` in run order.
+        """
+        targets = [name for name, stage in self.stages.items() if stage.outputs] if targets is None else targets
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            raise KeyError(f"Unknown stages {unknown}")
+        self._force = force
+        status = {}
+        for name in targets:
+            if not force and self.is_current(name):
+                status[name] = "up to date"
+                continue
+            self.result(name)
+            status[name] = "ran"
+        return status
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+def axis_codes(values, labels=None):
+    """Map ``values`` onto ``labels`` (discovered in order of appearance when None).
+
+    Returns ``(codes, labels)``; values outside ``labels`` (and missing
+    values) get code -1.
+    """
+    values = pd.Series(np.asarray(values, dtype=object), dtype=object)
+    if labels is None:
+        labels = list(pd.unique(values[values.notna()]))
+    return pd.Index(labels, dtype=object).get_indexer(values), list(labels)
+
+
+def top_k_cells(counts, names, k, nonzero=True):
+    """``(name, count)`` lists of the ``k`` largest counts along the last axis, per cell.
+
+    Returns ``{cell index: list}`` over the leading axes (``{(): list}`` for
+    a 1-D ``counts``). Ties keep the order of ``names``; with ``nonzero``
+    zero counts are left out. Every count is made unique by folding its
+    position into it, so one partial selection (argpartition) finds the top
+    ``k`` without sorting the whole axis; only those ``k`` are sorted.
+    """
+    counts = np.asarray(counts)
+    n = counts.shape[-1]
+    k = max(min(k, n), 0)
+    if k == 0:
+        return {cell: [] for cell in np.ndindex(counts.shape[:-1])}
+    key = counts * n + (n - 1 - np.arange(n))
+    if k < n:
+        top = np.argpartition(-key, k - 1, axis=-1)[..., :k]
+    else:
+        top = np.broadcast_to(np.arange(n), key.shape)
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(key, top, axis=-1), axis=-1), axis=-1)
+    values = np.take_along_axis(counts, top, axis=-1)
+    cells = {}
+    for cell in np.ndindex(counts.shape[:-1]):
+        cells[cell] = [(names[i], int(v)) for i, v in zip(top[cell], values[cell]) if v > 0 or not nonzero]
+    return cells
+
+
+def top_k(names, counts, k):
+    """The ``k`` largest ``counts`` as ``(name, count)``; zero counts left out, ties keep ``names`` order."""
+    return top_k_cells(counts, names, k)[()]
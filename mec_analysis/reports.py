@@ -0,0 +1,229 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from mec_analysis.charts import SERIES_COLORS, BarChart
+
+
+def join_present_columns(df):
+    """Lowercased ``" ".join`` of the non-null cells of each row, built column by column."""
+    text = pd.Series("", index=df.index)
+    has_text = pd.Series(False, index=df.index)
+    for col in df.columns:
+        present = df[col].notna()
+        text = text + np.where(has_text & present, " ", "") + df[col].where(present, "").astype(str)
+        has_text |= present
+    return text.str.lower()
+
+
+# ==== 5.2.1: strongest technique links of each goal in the VOSviewer network ====
+def network_top_techniques(network, goals, techniques, k=5):
+    """``{goal: [(technique, strength), ...]}``, or a message when the goal has none."""
+    technique_mask = network.mask(techniques)
+    results = {}
+    for goal in goals:
+        if goal not in network:
+            results[goal] = "Not found"
+            continue
+        top_k = network.top_k_neighbours(goal, k=k, category_filter=technique_mask)
+        results[goal] = top_k if top_k else "No technique connections found"
+    return results
+
+
+def network_top_techniques_lines(results):
+    lines = []
+    for goal, top_techs in results.items():
+        lines.append(f"\nGoal: {goal.capitalize()}")
+        if isinstance(top_techs, str):
+            lines.append(top_techs)
+        else:
+            lines.extend(f"  {tech} (Strength: {strength})" for tech, strength in top_techs)
+    return lines
+
+
+# ==== 5.2.2: top keywords per document type ====
+def doc_type_top_keywords_lines(cube, doc_types, k=5):
+    """Top ``k`` goals and techniques per document type of a :class:`~mec_analysis.cube.KeywordCube`.
+
+    Ties keep taxonomy order; keywords with no papers are listed too.
+    """
+    lines = []
+    for doc_type in doc_types:
+        for category in ["Goal", "Technique"]:
+            lines.append(f"\nTop {k} {category}s for {doc_type}:")
+            for keyword, count in cube.top_k(k, category, doc_types=doc_type, nonzero=False):
+                lines.append(f"  {keyword}: {count}")
+    return lines
+
+
+# ==== 5.2.3: papers per keyword ====
+# Keywords of the taxonomy in the row order of the report
+KEYWORD_COUNT_GOALS = [
+    "energy utilization", "resource allocation", "quality of service", "resource management",
+    "green computing", "energy-consumption", "energy efficiency", "decision making",
+    "wireless communications", "scheduling algorithms", "computational efficiency",
+    "economic and social effects", "information management", "network security",
+    "low-latency communication"
+]
+
+KEYWORD_COUNT_TECHNIQUES = [
+    "computation offloading", "reinforcement learning", "task analysis", "deep learning",
+    "job analysis", "task offloading", "optimization", "integer programming",
+    "deep reinforcement learning", "multiaccess", "computational modelling",
+    "network architecture", "learning algorithms", "heuristic algorithms", "iterative methods",
+    "markov processes", "nonlinear programming", "game theory", "convex optimization",
+    "computation resources", "learning systems", "multi agent systems", "bandwidth",
+    "approximation algorithms", "computational complexity", "optimization problems",
+    "benchmarking", "machine learning", "transfer functions"
+]
+
+
+def keyword_count_rows(incidence, goals, techniques):
+    """``{'Keyword', 'Type', 'Count'}`` rows in the order of ``goals`` then ``techniques``."""
+    paper_counts = incidence.matrix.sum(axis=0).A1
+    index = incidence.matcher.index
+    return [{'Keyword': keyword, 'Type': kw_type, 'Count': paper_counts[index[keyword]]}
+            for keyword, kw_type in [(kw, 'Goal') for kw in goals] + [(kw, 'Technique') for kw in techniques]]
+
+
+def keyword_count_chart(result_df, output_path, dpi=300):
+    return BarChart(
+        output_path, result_df['Keyword'], result_df['Count'],
+        colors=['skyblue' if t == 'Goal' else 'lightgreen' for t in result_df['Type']],
+        title="Keyword Occurrence in Total Dataset (3400+ Papers)",
+        xlabel="Keywords (Goals & Techniques)", ylabel="Number of Papers",
+        value_labels="top", legend=[('Goal', 'skyblue'), ('Technique', 'lightgreen')], legend_loc='upper right',
+        figsize=(20, 8), dpi=dpi, tick_rotation=90, tick_ha='center', tick_fontsize=8, grid=True,
+    )
+
+
+# ==== 5.3.1: top techniques of every goal per period ====
+def goal_technique_rows(tensor, cube, year_ranges, k=3):
+    """One row per period and goal that occurs in it, with its top ``k`` co-occurring techniques.
+
+    The goal x technique counts come from the
+    :class:`~mec_analysis.cooccurrence.CooccurrenceTensor`, the goal
+    occurrences from the :class:`~mec_analysis.cube.KeywordCube` summed over
+    each period's ``year_ranges`` span.
+    """
+    rows = []
+    for period_label in tensor.periods:
+        goal_occurrence = cube.counts(years=tuple(year_ranges[period_label]), category="Goal")
+        for goal_id in np.flatnonzero(goal_occurrence):
+            goal = tensor.goals[goal_id]
+            row = {"Time Period": period_label, "Goal": goal, "Goal Occurrence": int(goal_occurrence[goal_id])}
+            for i, (tech, count) in enumerate(tensor.top_techniques(goal, k=k, period=period_label), start=1):
+                row[f"Technique {i}"] = tech
+                row[f"Count {i}"] = count
+            rows.append(row)
+    return rows
+
+
+def goal_technique_text(rows, periods):
+    """Text report of :func:`goal_technique_rows`, one section per period."""
+    parts = []
+    for period_label in periods:
+        parts.append(f"\n===== Period: {period_label} =====\n\n")
+        for row in rows:
+            if row["Time Period"] != period_label:
+                continue
+            parts.append(f"Goal: {row['Goal']} (Occurrences: {row['Goal Occurrence']})\n")
+            i = 1
+            while f"Technique {i}" in row:
+                parts.append(f"  Technique {i}: {row[f'Technique {i}']} (Count: {row[f'Count {i}']})\n")
+                i += 1
+            parts.append("\n")
+    return "".join(parts)
+
+
+# ==== 5.3.2: top goals and techniques per year range and document type ====
+TOP_GOALS_TECHNIQUES_COLUMNS = ["Year Range", "Document Type", "Category", "Name", "Count"]
+
+
+def top_goals_techniques_rows(cube, year_ranges, doc_types, k_techniques=6, k_goals=5):
+    """Rows of the top techniques then goals of each year range and document type (spellings counted).
+
+    ``year_ranges`` maps labels to ``(start, end)`` spans of the
+    :class:`~mec_analysis.cube.KeywordCube`'s years.
+    """
+    rows = []
+    for yr, span in year_ranges.items():
+        for doc_type in doc_types:
+            for tech, count in cube.top_k(k_techniques, "Technique", span, doc_type, spelling=True):
+                rows.append([yr, doc_type, "Technique", tech, count])
+            for goal, count in cube.top_k(k_goals, "Goal", span, doc_type, spelling=True):
+                rows.append([yr, doc_type, "Goal", goal, count])
+    return rows
+
+
+def top_goals_techniques_charts(rows, year_ranges, doc_types, output_dir, dpi=300):
+    """One bar chart per year range and document type of :func:`top_goals_techniques_rows`."""
+    charts = []
+    for yr in year_ranges:
+        for doc_type in doc_types:
+            group = [row for row in rows if row[0] == yr and row[1] == doc_type]
+            if not group:
+                continue
+            charts.append(BarChart(
+                os.path.join(output_dir, f"top_goals_techniques_{yr}_{doc_type.replace(' ', '_')}.png"),
+                [row[3] for row in group], [row[4] for row in group],
+                colors=["lightgreen" if row[2] == "Technique" else "skyblue" for row in group],
+                title=f"Top Techniques and Goals, {doc_type} {yr}", ylabel="Occurrences", value_labels="top",
+                legend=[("Technique", "lightgreen"), ("Goal", "skyblue")], figsize=(10, 6), dpi=dpi,
+            ))
+    return charts
+
+
+# ==== 5.3.3: keyword occurrences stacked by year range ====
+def occurrence_rows(data, year_ranges, canonical_goals, canonical_techniques):
+    """Rows of every keyword and year range with a non-zero count (``data[keyword][year]``)."""
+    rows = []
+    for keyword in canonical_goals + canonical_techniques:
+        for year in year_ranges:
+            count = data[keyword].get(year, 0)
+            if count > 0:
+                rows.append({
+                    "Keyword": keyword,
+                    "Type": "Goal" if keyword in canonical_goals else "Technique",
+                    "Year Range": year,
+                    "Count": count
+                })
+    return rows
+
+
+def keyword_colors(keywords, canonical_goals, canonical_techniques):
+    return ['blue' if k in canonical_goals else 'green' if k in canonical_techniques else 'black' for k in keywords]
+
+
+def stacked_bar_chart(data, year_ranges, canonical_goals, canonical_techniques, output_path, keywords=None,
+                      title="Stacked Keyword Occurrences Across Time Periods", dpi=300):
+    """Keywords stacked by year range; tick labels colored by keyword type."""
+    keywords = canonical_goals + canonical_techniques if keywords is None else keywords
+    return BarChart(
+        output_path, keywords, {year: [data[k].get(year, 0) for k in keywords] for year in year_ranges},
+        title=title, xlabel="Keywords (Blue: Goal, Green: Technique)", ylabel="Total Occurrences Across Years",
+        tick_colors=keyword_colors(keywords, canonical_goals, canonical_techniques), legend_title="Year Range",
+        dpi=dpi,
+    )
+
+
+def chart_variants(data, year_ranges, canonical_goals, canonical_techniques, output_dir, dpi=300):
+    """One chart per year range and one per keyword group (goals, techniques)."""
+    charts = []
+    all_keywords = canonical_goals + canonical_techniques
+    for idx, year in enumerate(year_ranges):
+        charts.append(BarChart(
+            os.path.join(output_dir, f"keyword_occurrences_{year}.png"), all_keywords,
+            {year: [data[k].get(year, 0) for k in all_keywords]}, colors=[SERIES_COLORS[idx % len(SERIES_COLORS)]],
+            title=f"Keyword Occurrences {year}", xlabel="Keywords (Blue: Goal, Green: Technique)",
+            ylabel="Occurrences", tick_colors=keyword_colors(all_keywords, canonical_goals, canonical_techniques),
+            dpi=dpi,
+        ))
+    for group, name, keywords in [("goals", "Goal", canonical_goals), ("techniques", "Technique", canonical_techniques)]:
+        charts.append(stacked_bar_chart(
+            data, year_ranges, canonical_goals, canonical_techniques,
+            os.path.join(output_dir, f"stacked_{group}_occurrences.png"), keywords=keywords,
+            title=f"Stacked {name} Occurrences Across Time Periods", dpi=dpi,
+        ))
+    return charts
@@ -0,0 +1,279 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Only the standard library is imported up front, so the server listens at
+# once; numpy/pandas and the analysis modules are imported by the loader
+# thread, and queries answer 503 until it is done.
+
+DEFAULT_PORT = 8050
+
+
+class QueryError(ValueError):
+    """A request the server cannot answer (reported as HTTP 400)."""
+
+
+def _one(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def _int(params, name, default, minimum=1):
+    value = _one(params, name)
+    try:
+        number = default if value is None else int(value)
+    except ValueError:
+        raise QueryError(f"{name} must be an integer, not {value!r}") from None
+    if minimum is not None and number < minimum:
+        raise QueryError(f"{name} must be at least {minimum}, not {number}")
+    return number
+
+
+def _flag(params, name):
+    return _one(params, name, "0").lower() in ("1", "true", "yes")
+
+
+def _span(value):
+    # "2011-2013" or "2024" -> (2011, 2013) / (2024, 2024)
+    start, _, end = value.partition("-")
+    try:
+        start, end = int(start), int(end or start)
+    except ValueError:
+        raise QueryError(f"Invalid year span {value!r}") from None
+    if start > end:
+        raise QueryError(f"Invalid year span {value!r}: end year before start year")
+    return start, end
+
+
+class CorpusData:
+    """The matched corpus and the VOSviewer network, loaded once and kept in memory.
+
+    Holds the :class:`~mec_analysis.incremental.CorpusState` counts (its
+    keyword cube and per-year trends) and the
+    :class:`~mec_analysis.network.KeywordNetwork`; every query is a slice
+    of these, so it takes milliseconds.
+    """
+
+    def __init__(self, corpus_file, network_file, state_dir=None):
+        from mec_analysis.incremental import update_state
+        from mec_analysis.network import KeywordNetwork
+        from mec_analysis.spatial import MapIndex
+        from mec_analysis.taxonomy import KEYWORD_ALIASES, taxonomy_matcher
+        from mec_analysis.trends import KeywordTrends
+
+        started = time.perf_counter()
+        self.matcher = taxonomy_matcher()
+        self.state, self.added = update_state(corpus_file, self.matcher, state_dir)
+        self.cube = self.state.cube
+        self.trends = KeywordTrends.from_cube(self.cube)
+        self.all_trends = KeywordTrends.from_cube(self.cube, by_doc_type=False)
+        self.network = KeywordNetwork.load(network_file, aliases=KEYWORD_ALIASES) if network_file else None
+        if self.network is not None:
+            self.masks = {"Goal": self.network.mask(self.matcher.goals),
+                          "Technique": self.network.mask(self.matcher.techniques)}
+            self.maps = {category: MapIndex(self.network, mask) for category, mask in self.masks.items()}
+            self.maps["all"] = MapIndex(self.network)
+        self.load_seconds = time.perf_counter() - started
+
+    def health(self, params):
+        return {"status": "ready", "docs": self.state.n_rows, "rows_added": self.added,
+                "load_seconds": round(self.load_seconds, 3), "network_items": len(self.network or [])}
+
+    def neighbours(self, params):
+        """5.2.1: strongest links of a keyword (default: every goal) to the techniques (or ``category``)."""
+        if self.network is None:
+            raise QueryError("No VOSviewer network loaded")
+        k = _int(params, "k", 5)
+        category = _one(params, "category", "Technique")
+        if category not in ("Goal", "Technique", "all"):
+            raise QueryError(f"Unknown category {category!r}")
+        mask = None if category == "all" else self.masks[category]
+        keywords = params.get("keyword") or sorted(self.matcher.goals)
+        results = {}
+        for keyword in keywords:
+            top = self.network.top_k_neighbours(keyword.lower(), k=k, category_filter=mask)
+            results[keyword] = None if top is None else [{"keyword": label, "strength": strength}
+                                                          for label, strength in top]
+        return {"category": category, "k": k, "neighbours": results}
+
+    def near(self, params):
+        """Nearest keywords on the VOSviewer map (default: to every goal, among the techniques or ``category``).
+
+        ``k`` nearest, or all within ``radius`` map units.
+        """
+        if self.network is None:
+            raise QueryError("No VOSviewer network loaded")
+        category = _one(params, "category", "Technique")
+        if category not in self.maps:
+            raise QueryError(f"Unknown category {category!r}")
+        radius = _one(params, "radius")
+        try:
+            radius = None if radius is None else float(radius)
+        except ValueError:
+            raise QueryError(f"radius must be a number, not {radius!r}") from None
+        k = _int(params, "k", 5)
+        keywords = params.get("keyword") or sorted(self.matcher.goals)
+        index = self.maps[category]
+        lowered = [keyword.lower() for keyword in keywords]
+        found = index.nearest(lowered, k) if radius is None else index.within(lowered, radius)
+        results = {}
+        for keyword in keywords:
+            near = found[keyword.lower()]
+            results[keyword] = None if near is None else [{"keyword": label, "distance": distance}
+                                                          for label, distance in near]
+        return {"category": category, "k": k, "radius": radius, "near": results}
+
+    def top(self, params):
+        """5.2.2/5.3.2: the ``k`` most frequent goals or techniques of a slice of the cube."""
+        category = _one(params, "category")
+        if category not in (None, "Goal", "Technique"):
+            raise QueryError(f"Unknown category {category!r}")
+        k = _int(params, "k", 5)
+        years = params.get("years")
+        if years:
+            spans = [_span(value) for value in years]
+            years = spans[0] if len(spans) == 1 else sorted({y for s, e in spans for y in range(s, e + 1)})
+        doc_types = params.get("doc_type") or None
+        by = tuple(params.get("by", []))
+        if set(by) - {"year", "doc_type"}:
+            raise QueryError(f"by must be year and/or doc_type, not {list(by)}")
+        top = self.cube.top_k(k, category, years, doc_types, by, spelling=_flag(params, "spelling"),
+                              nonzero=not _flag(params, "zeros"))
+
+        def entries(pairs):
+            return [{"keyword": keyword, "count": count} for keyword, count in pairs]
+
+        if not by:
+            return {"category": category, "k": k, "top": entries(top)}
+        cells = []
+        for label, pairs in top.items():
+            label = label if isinstance(label, tuple) else (label,)
+            cells.append({**dict(zip(by, label)), "top": entries(pairs)})
+        return {"category": category, "k": k, "by": list(by), "cells": cells}
+
+    def periods(self, params):
+        """5.3.3: documents per keyword in each year window (``window`` spans or ``rolling`` years)."""
+        from mec_analysis.trends import rolling_windows, window_label
+
+        doc_type = _one(params, "doc_type")
+        trends = self.all_trends if doc_type is None else self.trends
+        if doc_type is not None and doc_type not in trends.doc_types:
+            raise QueryError(f"Unknown document type {doc_type!r}")
+        if params.get("window"):
+            year_ranges = {window_label(*span): span for span in map(_span, params["window"])}
+        else:
+            try:
+                year_ranges = rolling_windows(trends.first_year, trends.last_year,
+                                              _int(params, "rolling", 1, minimum=None),
+                                              _int(params, "step", 1, minimum=None))
+            except ValueError as e:
+                raise QueryError(str(e)) from None
+        data = trends.occurrence_data(year_ranges, doc_type, spelling=_flag(params, "spelling"))
+        goals = set(self.matcher.goals)
+        return {
+            "windows": list(year_ranges),
+            "keywords": [{"keyword": keyword, "category": "Goal" if keyword in goals else "Technique",
+                          "counts": counts} for keyword, counts in data.items() if counts],
+        }
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Local HTTP server answering JSON queries from a resident :class:`CorpusData`.
+
+    ``GET /health``, ``/neighbours``, ``/near``, ``/top`` and ``/periods``
+    query the data; ``POST /reload`` counts the rows appended to the corpus
+    since and swaps the new data in without dropping requests.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, corpus_file, network_file, state_dir=None, verbose=False):
+        super().__init__(address, QueryHandler)
+        self.sources = (corpus_file, network_file, state_dir)
+        self.verbose = verbose
+        self.data = None
+        self.error = None
+        self._reload_lock = threading.Lock()
+
+    def reload(self):
+        with self._reload_lock:
+            try:
+                self.data = CorpusData(*self.sources)
+                self.error = None
+            except Exception as e:  # reported by /health; the previous data keeps serving
+                self.error = f"{type(e).__name__}: {e}"
+                raise
+
+    def load_in_background(self):
+        thread = threading.Thread(target=self.reload, daemon=True)
+        thread.start()
+        return thread
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    routes = {"/health": "health", "/neighbours": "neighbours", "/near": "near", "/top": "top",
+              "/periods": "periods"}
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path not in self.routes:
+            return self._send(404, {"error": f"Unknown query {url.path!r}"})
+        data = self.server.data
+        if data is None:
+            status = {"status": "failed" if self.server.error else "loading", "error": self.server.error}
+            return self._send(503, status)
+        started = time.perf_counter()
+        try:
+            body = getattr(data, self.routes[url.path])(parse_qs(url.query))
+        except QueryError as e:
+            return self._send(400, {"error": str(e)})
+        except Exception as e:  # answer instead of dropping the connection
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        body["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self._send(200, body)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/reload":
+            return self._send(404, {"error": f"Unknown command {self.path!r}"})
+        try:
+            self.server.reload()
+        except Exception:
+            return self._send(500, {"error": self.server.error})
+        self._send(200, self.server.data.health({}))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve keyword queries over the corpus and the VOSviewer "
+                                                 "network from memory, as JSON on localhost.")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("--network", help="VOSviewer JSON export for /neighbours")
+    parser.add_argument("--state-dir", help="where the corpus counts are kept (default: next to the CSV)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = QueryServer((args.host, args.port), args.csv, args.network, args.state_dir, args.verbose)
+    server.load_in_background()
+    print(f"✅ Serving on http://{args.host}:{server.server_port} (loading the corpus in the background)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
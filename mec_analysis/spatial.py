@@ -0,0 +1,190 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+PROXIMITY_COLUMNS = ["Keyword", "Rank", "Neighbour", "Distance", "Same cluster"]
+
+CLUSTER_BOUNDS_COLUMNS = ["Cluster", "Items", "Min x", "Max x", "Min y", "Max y", "Centroid x", "Centroid y",
+                          "Weighted centroid x", "Weighted centroid y", "Spread"]
+
+
+class MapIndex:
+    """KD-tree over the VOSviewer map coordinates (``x``, ``y``) of a :class:`~mec_analysis.network.KeywordNetwork`.
+
+    ``category_filter`` (a collection of normalized labels or a
+    :meth:`~mec_analysis.network.KeywordNetwork.mask`) limits the indexed
+    items, e.g. to the techniques; items without coordinates are left out.
+    Queries take any number of keywords of the whole network at once and
+    answer them with one tree query, in ``O(log n)`` per keyword instead of
+    a distance to every item. A keyword never finds items with its own
+    (normalized) label.
+    """
+
+    def __init__(self, network, category_filter=None):
+        self.network = network
+        indexed = np.isfinite(network.x) & np.isfinite(network.y)
+        if category_filter is not None:
+            if not isinstance(category_filter, np.ndarray):
+                category_filter = network.mask(category_filter)
+            indexed &= category_filter
+        self.positions = np.flatnonzero(indexed)
+        self.tree = cKDTree(np.column_stack([network.x[self.positions], network.y[self.positions]]))
+        # Items sharing a label (after aliasing) with the query are skipped, so ask for this many more
+        labels = pd.Series(network.labels[self.positions])
+        self._max_same_label = int(labels.value_counts().max()) if len(labels) else 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _queries(self, keywords):
+        # Positions of the keywords with coordinates, and which keywords those are
+        position = self.network.position
+        queries = np.array([position.get(keyword, -1) for keyword in keywords], dtype=np.int64)
+        found = queries >= 0
+        found[found] = np.isfinite(self.network.x[queries[found]]) & np.isfinite(self.network.y[queries[found]])
+        return queries[found], np.flatnonzero(found)
+
+    def _points(self, queries):
+        return np.column_stack([self.network.x[queries], self.network.y[queries]])
+
+    def nearest_pairs(self, keywords, k=5):
+        """``(query, item, distance)`` arrays: the ``k`` nearest items of each keyword, nearest first.
+
+        ``query`` indexes ``keywords``, ``item`` is a network position.
+        """
+        queries, found = self._queries(keywords)
+        n = min(k + self._max_same_label, len(self))
+        if not len(queries) or n <= 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        distances, hits = self.tree.query(self._points(queries), k=n)
+        distances, hits = distances.reshape(len(queries), n), hits.reshape(len(queries), n)
+        items = self.positions[hits]
+        keep = self.network.labels[items] != self.network.labels[queries][:, None]
+        # Of the items left in each row (already sorted by distance), the first k
+        keep &= np.cumsum(keep, axis=1) <= k
+        rows = np.broadcast_to(found[:, None], keep.shape)
+        return rows[keep], items[keep], distances[keep]
+
+    def within_pairs(self, keywords, radius):
+        """``(query, item, distance)`` arrays of the items within ``radius`` of each keyword, nearest first."""
+        queries, found = self._queries(keywords)
+        if not len(queries) or not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        pairs = cKDTree(self._points(queries)).sparse_distance_matrix(self.tree, radius, output_type="ndarray")
+        query, items, distances = pairs["i"], self.positions[pairs["j"]], pairs["v"]
+        keep = self.network.labels[items] != self.network.labels[queries[query]]
+        query, items, distances = query[keep], items[keep], distances[keep]
+        order = np.lexsort((items, distances, query))
+        return found[query[order]], items[order], distances[order]
+
+    def _grouped(self, keywords, query, items, distances):
+        # {keyword: [(label, distance), ...]}, None for keywords not on the map
+        queries, found = self._queries(keywords)
+        result = {keyword: None for keyword in keywords}
+        for i in found:
+            result[keywords[i]] = []
+        labels = self.network.labels
+        for q, item, distance in zip(query.tolist(), items.tolist(), distances.tolist()):
+            result[keywords[q]].append((labels[item], distance))
+        return result
+
+    def nearest(self, keywords, k=5):
+        """``{keyword: [(label, distance), ...]}``: the ``k`` nearest indexed items of each keyword.
+
+        Keywords not in the network (or without coordinates) map to ``None``,
+        as in :meth:`~mec_analysis.network.KeywordNetwork.top_k_neighbours`.
+        """
+        keywords = list(keywords)
+        return self._grouped(keywords, *self.nearest_pairs(keywords, k))
+
+    def within(self, keywords, radius):
+        """``{keyword: [(label, distance), ...]}``: the indexed items within ``radius`` of each keyword."""
+        keywords = list(keywords)
+        return self._grouped(keywords, *self.within_pairs(keywords, radius))
+
+    def proximity_table(self, keywords, k=5, radius=None):
+        """One row per (keyword, neighbour) of :meth:`nearest` (or of :meth:`within` with ``radius``).
+
+        See :data:`PROXIMITY_COLUMNS`; "Same cluster" compares the VOSviewer clusters.
+        """
+        keywords = list(keywords)
+        query, items, distances = (self.within_pairs(keywords, radius) if radius is not None
+                                   else self.nearest_pairs(keywords, k))
+        positions = np.array([self.network.position.get(keyword, -1) for keyword in keywords], dtype=np.int64)
+        queries = positions[query]
+        starts = np.flatnonzero(np.r_[True, query[1:] != query[:-1]]) if len(query) else np.zeros(0, dtype=int)
+        rank = np.arange(len(query)) - np.repeat(starts, np.diff(np.r_[starts, len(query)])) + 1
+        return pd.DataFrame({
+            "Keyword": np.asarray(keywords, dtype=object)[query],
+            "Rank": rank,
+            "Neighbour": self.network.labels[items],
+            "Distance": distances,
+            "Same cluster": self.network.cluster[items] == self.network.cluster[queries],
+        }, columns=PROXIMITY_COLUMNS)
+
+
+def cluster_bounds(network, weight=None):
+    """Bounding box, centroid and spread of every VOSviewer cluster on the map, one row per cluster.
+
+    The weighted centroid uses the ``weight`` column of ``network.weights``
+    (default: the first one, e.g. Occurrences); "Spread" is the root mean
+    square distance of the items from the centroid. All in one pass of
+    grouped reductions over the items.
+    """
+    on_map = np.isfinite(network.x) & np.isfinite(network.y)
+    x, y = network.x[on_map], network.y[on_map]
+    clusters, codes = np.unique(network.cluster[on_map], return_inverse=True)
+    n = len(clusters)
+    items = np.bincount(codes, minlength=n)
+
+    def extreme(ufunc, values, start):
+        out = np.full(n, start)
+        ufunc.at(out, codes, values)
+        return out
+
+    centroid_x = np.bincount(codes, x, n) / items
+    centroid_y = np.bincount(codes, y, n) / items
+    name = weight or next(iter(network.weights), None)
+    w = np.nan_to_num(network.weights[name][on_map]) if name is not None else np.ones(len(x))
+    total = np.bincount(codes, w, n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weighted_x = np.where(total > 0, np.bincount(codes, w * x, n) / total, centroid_x)
+        weighted_y = np.where(total > 0, np.bincount(codes, w * y, n) / total, centroid_y)
+    squared = (x - centroid_x[codes]) ** 2 + (y - centroid_y[codes]) ** 2
+    return pd.DataFrame({
+        "Cluster": clusters.astype(int),
+        "Items": items,
+        "Min x": extreme(np.minimum, x, np.inf),
+        "Max x": extreme(np.maximum, x, -np.inf),
+        "Min y": extreme(np.minimum, y, np.inf),
+        "Max y": extreme(np.maximum, y, -np.inf),
+        "Centroid x": centroid_x,
+        "Centroid y": centroid_y,
+        "Weighted centroid x": weighted_x,
+        "Weighted centroid y": weighted_y,
+        "Spread": np.sqrt(np.bincount(codes, squared, n) / items),
+    }, columns=CLUSTER_BOUNDS_COLUMNS)
+
+
+if __name__ == "__main__":
+    from mec_analysis.network import KeywordNetwork
+    from mec_analysis.taxonomy import KEYWORD_ALIASES, taxonomy_matcher
+
+    parser = argparse.ArgumentParser(description="Techniques nearest to every goal on the VOSviewer map, and the "
+                                                 "extent of every cluster.")
+    parser.add_argument("json", help="VOSviewer JSON export")
+    parser.add_argument("--k", type=int, default=5, help="nearest techniques per goal (default 5)")
+    parser.add_argument("--radius", type=float, help="instead of the k nearest, every technique within this distance")
+    parser.add_argument("--output", default="goal_technique_proximity.csv", help="goal -> technique proximity CSV")
+    parser.add_argument("--clusters", default="cluster_bounds.csv", help="per-cluster bounds and centroids CSV")
+    args = parser.parse_args()
+
+    network = KeywordNetwork.load(args.json, aliases=KEYWORD_ALIASES)
+    matcher = taxonomy_matcher()
+    index = MapIndex(network, network.mask(matcher.techniques))
+    goals = [goal for goal in sorted(matcher.goals) if goal in network]
+    index.proximity_table(goals, args.k, args.radius).to_csv(args.output, index=False)
+    cluster_bounds(network).to_csv(args.clusters, index=False)
+    print(f"✅ Map proximity saved to: {args.output}, {args.clusters}")
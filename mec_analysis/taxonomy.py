@@ -0,0 +1,39 @@
+from mec_analysis.matcher import KeywordMatcher
+
+# Alias spellings and the canonical keyword they count towards
+GOAL_ALIASES = {
+    "resources allocation": "resource allocation",
+    "quality-of-service": "quality of service",
+}
+
+TECHNIQUE_ALIASES = {
+    "optimisations": "optimization",
+    "reinforcement learnings": "reinforcement learning",
+}
+
+KEYWORD_ALIASES = {**GOAL_ALIASES, **TECHNIQUE_ALIASES}
+
+# Raw terms searched for, alias spellings included
+GOALS_RAW = [
+    "computational efficiency", "decision making", "economic and social effects", "energy efficiency",
+    "energy utilization", "energy-consumption", "green computing", "information management",
+    "low-latency communication", "network security", "quality of service", "quality-of-service",
+    "resource allocation", "resource management", "resources allocation", "scheduling algorithms",
+    "wireless communications"
+]
+
+TECHNIQUES_RAW = [
+    "approximation algorithms", "bandwidth", "benchmarking", "computation offloading",
+    "computation resources", "computational complexity", "computational modelling",
+    "convex optimization", "deep learning", "deep reinforcement learning", "game theory",
+    "heuristic algorithms", "integer programming", "iterative methods", "job analysis",
+    "learning algorithms", "learning systems", "machine learning", "markov processes",
+    "multi agent systems", "multiaccess", "network architecture", "nonlinear programming",
+    "optimisations", "optimization", "optimization problems", "reinforcement learning",
+    "reinforcement learnings", "task analysis", "task offloading", "transfer functions"
+]
+
+
+def taxonomy_matcher():
+    """:class:`~mec_analysis.matcher.KeywordMatcher` for the thesis goal/technique taxonomy."""
+    return KeywordMatcher(GOALS_RAW, TECHNIQUES_RAW, GOAL_ALIASES, TECHNIQUE_ALIASES)
@@ -0,0 +1,82 @@
+import os
+from collections import defaultdict
+
+import pandas as pd
+
+from mec_analysis.cache import open_match_cache
+from mec_analysis.corpus import TEXT_COLUMNS
+from mec_analysis.excel import read_excel_columns
+from mec_analysis.incidence import KeywordCounts, build_incidence
+from mec_analysis.metrics import RunMetrics
+from mec_analysis.parallel import parallel_map
+from mec_analysis.reports import KEYWORD_COUNT_GOALS, KEYWORD_COUNT_TECHNIQUES, join_present_columns, keyword_count_rows
+
+# Keyword counts of the hand-picked top-paper workbooks (5.2.3 and 5.3.3),
+# shared by the analysis scripts and run_pipeline.py.
+
+
+def top100_keyword_counts(workbook, matcher, nrows=100, cache_dir=None, metrics=None):
+    """5.2.3: papers per report keyword among the first ``nrows`` papers of ``workbook``, as a DataFrame.
+
+    The searched columns are lowercased and joined with a newline, so no
+    match spans two columns; rows follow
+    :data:`~mec_analysis.reports.KEYWORD_COUNT_GOALS`/``KEYWORD_COUNT_TECHNIQUES``.
+    Stages are recorded in ``metrics`` when given.
+    """
+    metrics = metrics or RunMetrics("5.2.3")
+    # Only the searched columns are read; they are kept in a Parquet sidecar next
+    # to the workbook, so later runs skip parsing the XLSX until it changes
+    with metrics.stage("load", bytes_read=os.path.getsize(workbook)) as record:
+        df = read_excel_columns(workbook, TEXT_COLUMNS, nrows=nrows)
+        record["rows"] += len(df)
+    with metrics.stage("normalize", rows=len(df)):
+        text = df[TEXT_COLUMNS[0]].astype(str).str.lower()
+        for col in TEXT_COLUMNS[1:]:
+            text = text + "\n" + df[col].astype(str).str.lower()
+    with metrics.stage("match", rows=len(text), profile=True):
+        cache = open_match_cache(cache_dir, "5.2.3")
+        incidence = build_incidence(text, matcher, cache=cache)
+        if cache is not None:
+            cache.save()
+    with metrics.stage("aggregate", rows=len(text)):
+        return pd.DataFrame(keyword_count_rows(incidence, KEYWORD_COUNT_GOALS, KEYWORD_COUNT_TECHNIQUES))
+
+
+def count_workbook(task):
+    """Worker: match one workbook and return its mergeable keyword counts and stage metrics."""
+    file_path, matcher, cache_dir, metrics_dir, profile = task
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    metrics = RunMetrics("5.3.3-" + name, metrics_dir, profile=profile)
+    with metrics.stage("load", name, bytes_read=os.path.getsize(file_path)) as record:
+        df = read_excel_columns(file_path, TEXT_COLUMNS)
+        record["rows"] += len(df)
+    with metrics.stage("normalize", name, rows=len(df)):
+        text = join_present_columns(df)
+    with metrics.stage("match", name, rows=len(df), profile=True):
+        cache = open_match_cache(cache_dir, "5.3.3-" + name)
+        incidence = build_incidence(text, matcher, cache=cache)
+        if cache is not None:
+            cache.save()
+    with metrics.stage("aggregate", name, rows=len(df)):
+        counts = KeywordCounts.from_incidence(incidence)
+    metrics.dump_profiles()
+    return counts, metrics.records
+
+
+def keyword_occurrences(book_files, matcher, workers=None, cache_dir=None, metrics=None):
+    """5.3.3: ``{keyword: {year range: papers}}`` over the ``{year range: workbook}`` of ``book_files``.
+
+    Keywords are the goals, then the techniques of ``matcher``; zero counts
+    are left out. Each workbook is read and matched in its own worker
+    process (see :func:`~mec_analysis.parallel.parallel_map`).
+    """
+    data = {k: defaultdict(int) for k in matcher.keywords}
+    metrics_dir, profile = (metrics.report_dir, metrics.profile) if metrics is not None else (None, False)
+    tasks = [(file_path, matcher, cache_dir, metrics_dir, profile) for file_path in book_files.values()]
+    for year, (counts, records) in zip(book_files, parallel_map(count_workbook, tasks, workers)):
+        if metrics is not None:
+            metrics.merge(records)
+        for keyword, count in zip(matcher.keywords, counts.keyword_counts):
+            if count > 0:
+                data[keyword][year] = int(count)
+    return data
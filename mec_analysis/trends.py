@@ -0,0 +1,233 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from mec_analysis.cooccurrence import ALL_DOC_TYPES
+from mec_analysis.cube import KeywordCube
+from mec_analysis.periods import parse_year_ranges
+from mec_analysis.ranking import top_k
+
+
+def window_label(start, end):
+    return str(start) if start == end else f"{start}-{end}"
+
+
+def rolling_windows(first, last, width, step=1):
+    """``{"2011-2013": (2011, 2013), ...}``: windows of ``width`` years from ``first`` to ``last``.
+
+    Raises ValueError unless ``width`` and ``step`` are at least one year.
+    """
+    if width < 1 or step < 1:
+        raise ValueError(f"Rolling windows need a width and step of at least 1 year, not {width} and {step}")
+    return {window_label(start, start + width - 1): (start, start + width - 1)
+            for start in range(first, last - width + 2, step)}
+
+
+class KeywordTrends:
+    """Per-year keyword counts stored as prefix sums over the years.
+
+    ``keyword_docs[i, d, k]`` is the number of documents of type ``d``
+    published before ``years[0] + i`` that mention keyword ``k``;
+    ``keyword_spellings`` counts their matching spellings and ``docs`` the
+    documents themselves. The count over any ``[start, end]`` window is
+    then ``prefix[end + 1] - prefix[start]``: two lookups per keyword,
+    however wide the window, so yearly, rolling or custom window schemes are
+    read off the same arrays without re-splitting or re-matching the corpus.
+    """
+
+    def __init__(self, keywords, n_goals, first_year, doc_types, docs, keyword_docs, keyword_spellings):
+        self.keywords = list(keywords)
+        self.n_goals = n_goals
+        self.first_year = first_year
+        self.doc_types = list(doc_types)
+        self.docs = docs
+        self.keyword_docs = keyword_docs
+        self.keyword_spellings = keyword_spellings
+
+    @property
+    def goals(self):
+        return self.keywords[:self.n_goals]
+
+    @property
+    def techniques(self):
+        return self.keywords[self.n_goals:]
+
+    @property
+    def last_year(self):
+        return self.first_year + len(self.docs) - 2
+
+    @property
+    def years(self):
+        return list(range(self.first_year, self.last_year + 1))
+
+    @classmethod
+    def from_cube(cls, cube, by_doc_type=True):
+        """Prefix sums of a :class:`~mec_analysis.cube.KeywordCube` over its years.
+
+        Undated documents are left out, and so are documents without a type
+        unless ``by_doc_type=False`` puts every document under
+        :data:`~mec_analysis.cooccurrence.ALL_DOC_TYPES`.
+        """
+        dated = [i for i, year in enumerate(cube.years) if year is not None]
+        if by_doc_type:
+            typed = [i for i, doc_type in enumerate(cube.doc_types) if doc_type is not None]
+            doc_types = [cube.doc_types[i] for i in typed]
+            index = np.ix_(dated, typed)
+            counts = cube.docs[index], cube.keyword_docs[index], cube.keyword_spellings[index]
+        else:
+            doc_types = [ALL_DOC_TYPES]
+            counts = [values[dated].sum(axis=1, keepdims=True)
+                      for values in (cube.docs, cube.keyword_docs, cube.keyword_spellings)]
+
+        def prefix_sums(values):
+            # Accumulate over the years, after a zero row
+            prefix = np.zeros((len(dated) + 1, *values.shape[1:]), dtype=np.int64)
+            np.cumsum(values, axis=0, out=prefix[1:])
+            return prefix
+
+        first = cube.years[dated[0]] if dated else 0
+        return cls(cube.keywords, cube.n_goals, first, doc_types, *(prefix_sums(values) for values in counts))
+
+    @classmethod
+    def from_incidence(cls, incidence, doc_type_labels=None, by_doc_type=True):
+        """Count an :class:`~mec_analysis.incidence.Incidence` per year (and document type).
+
+        Rows without a year, or (with ``doc_type_labels``) of another
+        document type, are not counted. ``by_doc_type=False`` puts every row
+        under :data:`~mec_analysis.cooccurrence.ALL_DOC_TYPES`.
+        """
+        return cls.from_cube(KeywordCube.from_incidence(incidence, doc_type_labels), by_doc_type)
+
+    def __add__(self, other):
+        if self.keywords != other.keywords or self.doc_types != other.doc_types:
+            raise ValueError("Cannot add keyword trends over different keywords or document types")
+        if len(other.docs) == 1 or len(self.docs) == 1:  # no dated documents on one side
+            return self if len(other.docs) == 1 else other
+        first, last = min(self.first_year, other.first_year), max(self.last_year, other.last_year)
+        left, right = self._extend(first, last), other._extend(first, last)
+        return KeywordTrends(self.keywords, self.n_goals, first, self.doc_types, left[0] + right[0],
+                             left[1] + right[1], left[2] + right[2])
+
+    def _extend(self, first, last):
+        # Prefix arrays over [first, last]: zeros before the first year, the total after the last
+        index = np.clip(np.arange(first, last + 2) - self.first_year, 0, len(self.docs) - 1)
+        return self.docs[index], self.keyword_docs[index], self.keyword_spellings[index]
+
+    def _bounds(self, start, end):
+        # Prefix rows of a window; years outside the data count zero
+        lo = np.clip(np.asarray(start) - self.first_year, 0, len(self.docs) - 1)
+        hi = np.clip(np.asarray(end) - self.first_year + 1, 0, len(self.docs) - 1)
+        return lo, np.maximum(hi, lo)
+
+    def _doc_type_slice(self, prefix, doc_type):
+        if doc_type is None:
+            return prefix.sum(axis=1)
+        if doc_type not in self.doc_types:
+            raise KeyError(f"Document type {doc_type!r} not in trends")
+        return prefix[:, self.doc_types.index(doc_type)]
+
+    def window(self, start, end, doc_type=None, spelling=False):
+        """Counts per keyword (goals, then techniques) over the years ``start``..``end``."""
+        prefix = self._doc_type_slice(self.keyword_spellings if spelling else self.keyword_docs, doc_type)
+        lo, hi = self._bounds(start, end)
+        return prefix[hi] - prefix[lo]
+
+    def window_docs(self, start, end, doc_type=None):
+        prefix = self._doc_type_slice(self.docs, doc_type)
+        lo, hi = self._bounds(start, end)
+        return prefix[hi] - prefix[lo]
+
+    def windows(self, year_ranges, doc_type=None, spelling=False):
+        """``windows x keywords`` counts of every ``(start, end)`` in ``year_ranges`` (a dict or list)."""
+        spans = np.array(list(year_ranges.values() if isinstance(year_ranges, dict) else year_ranges),
+                         dtype=np.int64).reshape(-1, 2)
+        return self.window(spans[:, 0], spans[:, 1], doc_type, spelling)
+
+    def rolling(self, width, step=1, doc_type=None, spelling=False):
+        """``(year_ranges, counts)`` of ``width``-year windows sliding by ``step`` over the data."""
+        year_ranges = rolling_windows(self.first_year, self.last_year, width, step)
+        return year_ranges, self.windows(year_ranges, doc_type, spelling)
+
+    def frame(self, year_ranges, doc_type=None, spelling=False):
+        """Keywords x windows DataFrame (one trend line per keyword)."""
+        return pd.DataFrame(self.windows(year_ranges, doc_type, spelling).T, index=self.keywords,
+                            columns=list(year_ranges)).rename_axis("Keyword")
+
+    def top_keywords(self, category, k, period, doc_type=None, spelling=False):
+        """The ``k`` most frequent ``"Goal"``/``"Technique"`` keywords of a ``(start, end)`` window."""
+        counts = self.window(*period, doc_type, spelling)
+        if category == "Goal":
+            return top_k(self.goals, counts[:self.n_goals], k)
+        if category == "Technique":
+            return top_k(self.techniques, counts[self.n_goals:], k)
+        raise ValueError(f"Unknown category {category!r}")
+
+    def occurrence_data(self, year_ranges, doc_type=None, spelling=False):
+        """``{keyword: {window: count}}`` of the non-zero counts, as used by the 5.3.3 reports."""
+        counts = self.windows(year_ranges, doc_type, spelling)
+        labels = list(year_ranges)
+        return {keyword: {labels[w]: int(counts[w, i]) for w in np.flatnonzero(counts[:, i])}
+                for i, keyword in enumerate(self.keywords)}
+
+    def top_rows(self, year_ranges, doc_types=None, k_techniques=6, k_goals=5, spelling=True):
+        """5.3.2-style rows (see :data:`~mec_analysis.reports.TOP_GOALS_TECHNIQUES_COLUMNS`) for any windows."""
+        rows = []
+        for label, span in year_ranges.items():
+            for doc_type in doc_types or [None]:
+                for category, k in [("Technique", k_techniques), ("Goal", k_goals)]:
+                    for keyword, count in self.top_keywords(category, k, span, doc_type, spelling):
+                        rows.append([label, doc_type or ALL_DOC_TYPES, category, keyword, count])
+        return rows
+
+
+if __name__ == "__main__":
+    from mec_analysis.index import CorpusIndex
+    from mec_analysis.reports import TOP_GOALS_TECHNIQUES_COLUMNS, occurrence_rows
+    from mec_analysis.taxonomy import taxonomy_matcher
+
+    parser = argparse.ArgumentParser(description="Keyword counts of the corpus over any year windows.")
+    parser.add_argument("csv", help="Scopus CSV export (indexed on first use)")
+    windows = parser.add_mutually_exclusive_group()
+    windows.add_argument("--windows", nargs="+", metavar="SPAN", help="year spans, e.g. 2011-2013 2014-2016")
+    windows.add_argument("--rolling", type=int, metavar="YEARS", help="sliding windows of this many years")
+    parser.add_argument("--step", type=int, default=1, help="years between rolling windows (default 1)")
+    parser.add_argument("--doc-type", nargs="+", help="count these document types separately")
+    parser.add_argument("--table", choices=["trends", "occurrences", "top"], default="trends",
+                        help="keywords x windows (default), 5.3.3-style occurrence rows or 5.3.2-style top-k rows")
+    parser.add_argument("--spelling", action="store_true", help="count matching spellings instead of documents")
+    parser.add_argument("--output", help="CSV file to write (default: print)")
+    args = parser.parse_args()
+
+    index = CorpusIndex.load(args.csv)
+    incidence = index.incidence(taxonomy_matcher())
+    trends = KeywordTrends.from_incidence(incidence, args.doc_type, by_doc_type=bool(args.doc_type))
+    if args.windows:
+        year_ranges = {window_label(*span): span for span in parse_year_ranges(args.windows, overlapping=True).values()}
+    else:
+        try:
+            year_ranges = rolling_windows(trends.first_year, trends.last_year,
+                                          1 if args.rolling is None else args.rolling, args.step)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.table == "top":
+        table = pd.DataFrame(trends.top_rows(year_ranges, args.doc_type), columns=TOP_GOALS_TECHNIQUES_COLUMNS)
+    else:
+        frames = []
+        for doc_type in args.doc_type or [None]:
+            if args.table == "trends":
+                frame = trends.frame(year_ranges, doc_type, args.spelling).reset_index()
+            else:
+                data = trends.occurrence_data(year_ranges, doc_type, args.spelling)
+                frame = pd.DataFrame(occurrence_rows(data, list(year_ranges), trends.goals, trends.techniques))
+            if doc_type is not None:
+                frame.insert(0, "Document Type", doc_type)
+            frames.append(frame)
+        table = pd.concat(frames, ignore_index=True)
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"✅ {len(table)} rows saved to: {args.output}")
+    else:
+        print(table.to_string(index=False))
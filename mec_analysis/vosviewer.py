@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mec_analysis.corpus import DEFAULT_CHUNKSIZE, keyword_codes, read_typed_corpus_chunks
+
+KEYWORD_COLUMNS = ["Author Keywords", "Index Keywords"]
+
+# Links formatted per write when streaming the JSON
+LINK_BLOCK = 100_000
+
+
+def split_keywords(data, columns=KEYWORD_COLUMNS, aliases=None):
+    """``(rows, codes, vocabulary)`` of the ``"; "``-separated keyword cells, lowercased and alias-normalized.
+
+    Row ``rows[i]`` (a position in ``data``) lists keyword
+    ``vocabulary[codes[i]]``. The cells are split into interned codes (see
+    :func:`~mec_analysis.corpus.keyword_codes`), so a keyword is a Python
+    string once per chunk, not once per mention.
+
+    A keyword listed more than once for a document (e.g. as an author and an
+    index keyword) gives one pair.
+    """
+    vocabulary = {}
+    row_parts, code_parts = [], []
+    for col in columns:
+        if col in data:
+            rows, codes, keywords = keyword_codes(data[col], aliases)
+            ids = np.array([vocabulary.setdefault(k, len(vocabulary)) for k in keywords], dtype=np.int64)
+            row_parts.append(rows)
+            code_parts.append(ids[codes])
+    if not row_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), []
+    n = max(len(vocabulary), 1)
+    pairs = np.unique(np.concatenate(row_parts) * n + np.concatenate(code_parts))
+    return pairs // n, pairs % n, list(vocabulary)
+
+
+class CooccurrenceCounter:
+    """Accumulates the keyword co-occurrence matrix ``X.T @ X`` chunk by chunk.
+
+    ``X`` is the binary document x keyword matrix, so the diagonal holds the
+    occurrences of each keyword and the off-diagonal entries the number of
+    documents two keywords share (VOSviewer's full counting). Keywords get
+    ids in order of first appearance; the matrix only ever holds the
+    non-zero pairs, so memory follows the number of co-occurring pairs, not
+    the square of the vocabulary. Per-keyword sums of publication year and
+    citations feed the average scores.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.labels = []
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.year_sum = np.zeros(0)
+        self.year_count = np.zeros(0)
+        self.citation_sum = np.zeros(0)
+        self.citation_count = np.zeros(0)
+        # Per-document year and citations, for the year-normalized citations
+        self._doc_rows = []
+        self._doc_keywords = []
+        self._doc_years = []
+        self._doc_citations = []
+        self.n_docs = 0
+
+    def _ids(self, keywords):
+        # Global ids of a chunk's vocabulary, adding the keywords not seen before
+        for keyword in keywords:
+            if keyword not in self.vocabulary:
+                self.vocabulary[keyword] = len(self.labels)
+                self.labels.append(keyword)
+        return np.array([self.vocabulary[k] for k in keywords], dtype=np.int64)
+
+    def add(self, data, aliases=None, columns=KEYWORD_COLUMNS):
+        """Count one chunk of the corpus (a DataFrame with the keyword columns, optionally Year/Cited by)."""
+        rows, codes, keywords = split_keywords(data, columns, aliases)
+        ids = self._ids(keywords)[codes]
+        n = len(self.labels)
+        x = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, ids)), shape=(len(data), n))
+        self.matrix.resize((n, n))
+        self.matrix = self.matrix + (x.T @ x).tocsr()
+
+        grow = n - len(self.year_sum)
+        for name in ("year_sum", "year_count", "citation_sum", "citation_count"):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(grow)]))
+        for column, total, count, docs in [("Year", self.year_sum, self.year_count, self._doc_years),
+                                           ("Cited by", self.citation_sum, self.citation_count,
+                                            self._doc_citations)]:
+            values = (pd.to_numeric(data[column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+                      if column in data else np.full(len(data), np.nan))
+            docs.append(values)
+            known = ~np.isnan(values[rows])
+            np.add.at(total, ids[known], values[rows][known])
+            np.add.at(count, ids[known], 1)
+        self._doc_rows.append(rows + self.n_docs)
+        self._doc_keywords.append(ids)
+        self.n_docs += len(data)
+
+    def normalized_citation_average(self):
+        """Per keyword, the mean of its documents' citations divided by the mean citations of their year."""
+        n = len(self.labels)
+        if not self._doc_rows:
+            return np.full(n, np.nan)
+        years, citations = np.concatenate(self._doc_years), np.concatenate(self._doc_citations)
+        known = ~np.isnan(citations) & ~np.isnan(years)
+        normalized = np.full(len(citations), np.nan)
+        if known.any():
+            year_codes, _ = pd.factorize(years[known])
+            year_mean = np.bincount(year_codes, citations[known]) / np.bincount(year_codes)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                normalized[known] = np.where(year_mean[year_codes] > 0, citations[known] / year_mean[year_codes], 0)
+        rows, ids = np.concatenate(self._doc_rows), np.concatenate(self._doc_keywords)
+        values = normalized[rows]
+        keep = ~np.isnan(values)
+        total, count = np.zeros(n), np.zeros(n)
+        np.add.at(total, ids[keep], values[keep])
+        np.add.at(count, ids[keep], 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return total / count
+
+    def network(self, min_occurrences=5, min_strength=1, max_keywords=None):
+        """The thresholded network as ``(items, links)`` DataFrames in VOSviewer's schema.
+
+        Keywords need ``min_occurrences`` documents and, like VOSviewer, only
+        the ``max_keywords`` with the largest total link strength are kept.
+        Links between kept keywords need ``min_strength`` shared documents.
+        Items are numbered from 1 in label order.
+        """
+        occurrences = self.matrix.diagonal()
+        pairs = sparse.triu(self.matrix, k=1).tocsr()
+        keep = np.flatnonzero(occurrences >= min_occurrences)
+        if max_keywords is not None and len(keep) > max_keywords:
+            kept = pairs[keep][:, keep]
+            strength = np.asarray(kept.sum(axis=0)).ravel() + np.asarray(kept.sum(axis=1)).ravel()
+            keep = np.sort(keep[np.argsort(-strength, kind="stable")[:max_keywords]])
+        labels = np.array([self.labels[i] for i in keep], dtype=object)
+        order = np.argsort(labels, kind="stable")
+        keep, labels = keep[order], labels[order]
+
+        links = pairs[keep][:, keep].tocoo()
+        strong = links.data >= min_strength
+        strengths = links.data[strong]
+        # Each pair appears once, but in vocabulary order; emit source < target in item order
+        source = np.minimum(links.row[strong], links.col[strong])
+        target = np.maximum(links.row[strong], links.col[strong])
+        link_order = np.lexsort((target, source))
+        link_df = pd.DataFrame({"source_id": source[link_order] + 1, "target_id": target[link_order] + 1,
+                                "strength": strengths[link_order].astype(float)})
+
+        ends = np.concatenate([source, target])
+        n_links = np.bincount(ends, minlength=len(keep))
+        total_strength = np.bincount(ends, np.concatenate([strengths, strengths]), minlength=len(keep))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            items = pd.DataFrame({
+                "id": np.arange(1, len(keep) + 1),
+                "label": labels,
+                "Links": n_links.astype(float),
+                "Total link strength": total_strength.astype(float),
+                "Occurrences": occurrences[keep].astype(float),
+                "Avg. pub. year": self.year_sum[keep] / self.year_count[keep],
+                "Avg. citations": self.citation_sum[keep] / self.citation_count[keep],
+                "Avg. norm. citations": self.normalized_citation_average()[keep],
+            })
+        return items, link_df
+
+
+def write_network_json(items, links, output_path):
+    """Stream ``items``/``links`` to a VOSviewer JSON file (``network.items``/``network.links``).
+
+    Items are written one at a time and links in blocks of
+    :data:`LINK_BLOCK`, so the JSON text of the whole network is never held
+    in memory. Scores without a value (e.g. citations when the
+    export has no "Cited by" column) are left out.
+    """
+    weight_names = ["Links", "Total link strength", "Occurrences"]
+    score_names = ["Avg. pub. year", "Avg. citations", "Avg. norm. citations"]
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write('{"network": {"items": [')
+        for i, row in enumerate(items.itertuples(index=False, name=None)):
+            values = dict(zip(items.columns, row))
+            item = {
+                "id": int(values["id"]),
+                "label": values["label"],
+                "weights": {name: float(values[name]) for name in weight_names},
+                "scores": {name: round(float(values[name]), 4) for name in score_names
+                           if not np.isnan(values[name])},
+            }
+            f.write(("," if i else "") + "\n" + json.dumps(item))
+        f.write('\n], "links": [')
+        # Links are plain numbers, so they are formatted directly (in blocks)
+        # rather than through json.dumps, which dominates the time otherwise
+        for start in range(0, len(links), LINK_BLOCK):
+            block = links.iloc[start:start + LINK_BLOCK]
+            f.write(("," if start else "") + ",".join(
+                f'\n{{"source_id": {source}, "target_id": {target}, "strength": {strength!r}}}'
+                for source, target, strength in zip(block["source_id"].tolist(), block["target_id"].tolist(),
+                                                    block["strength"].astype(float).tolist())
+            ))
+        f.write("\n]}}\n")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def build_keyword_network(csv_path, output_path, aliases=None, min_occurrences=5, min_strength=1,
+                          max_keywords=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Build the keyword co-occurrence network of a Scopus CSV and write it as VOSviewer JSON.
+
+    Returns the ``(items, links)`` DataFrames written.
+    """
+    counter = CooccurrenceCounter()
+    for chunk in read_typed_corpus_chunks(csv_path, KEYWORD_COLUMNS + ["Year", "Cited by"], chunksize=chunksize):
+        counter.add(chunk, aliases)
+    items, links = counter.network(min_occurrences, min_strength, max_keywords)
+    write_network_json(items, links, output_path)
+    return items, links
+
+
+if __name__ == "__main__":
+    from mec_analysis.taxonomy import KEYWORD_ALIASES
+
+    parser = argparse.ArgumentParser(description="Build the keyword co-occurrence network of a Scopus CSV "
+                                                 "as a VOSviewer JSON file.")
+    parser.add_argument("csv", help="Scopus CSV export")
+    parser.add_argument("output", help="JSON file to write")
+    parser.add_argument("--min-occurrences", type=int, default=5, help="documents a keyword needs (default 5)")
+    parser.add_argument("--min-strength", type=int, default=1, help="documents a link needs (default 1)")
+    parser.add_argument("--max-keywords", type=int, help="keep only this many keywords, by total link strength")
+    parser.add_argument("--no-aliases", action="store_true", help="do not merge alias spellings")
+    args = parser.parse_args()
+
+    items, links = build_keyword_network(args.csv, args.output, None if args.no_aliases else KEYWORD_ALIASES,
+                                         args.min_occurrences, args.min_strength, args.max_keywords)
+    print(f"✅ Network of {len(items)} keywords and {len(links)} links saved to: {args.output}")
@@ -0,0 +1,222 @@
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mec_analysis.charts import render_charts
+from mec_analysis.dedup import deduplicate_corpus
+from mec_analysis.excel import write_excel_rows
+from mec_analysis import graph
+from mec_analysis.incremental import update_state
+from mec_analysis.metrics import RunMetrics
+from mec_analysis.network import KeywordNetwork
+from mec_analysis.periods import DEFAULT_YEAR_RANGES
+from mec_analysis.pipeline import Pipeline
+from mec_analysis import reports
+from mec_analysis.taxonomy import KEYWORD_ALIASES, taxonomy_matcher
+from mec_analysis import top_papers
+from mec_analysis.trends import KeywordTrends, rolling_windows
+from mec_analysis.vosviewer import build_keyword_network
+
+# Runs every analysis of chapter 5 from one pass over the corpus: duplicate
+# papers (e.g. from merged exports) are dropped first, the deduplicated CSV is
+# matched against the taxonomy once into per-year counts, kept between runs,
+# and each report is sliced from those. When rows are appended to the CSV
+# (e.g. a new Scopus pull), only they are matched and added to the counts.
+# Reports whose code, settings and inputs have not changed are skipped.
+
+root = os.path.dirname(os.path.abspath(__file__))
+
+# ==== Inputs ====
+corpus_file = "Mobile Edge computing dataset.csv"  # Scopus export (not in the repository)
+network_file = os.path.join(root, "JSON File obtained from VOSViewer.json")
+top100_file = os.path.join(
+    root, "5.2.3", "Input containing Top 100 recommended papers From 2011-2024 of Mobile Edge Computing.xlsx"
+)
+top10_files = {
+    year: os.path.join(root, "5.3.3", "Top  10 Papers from Year span", f"{year}.xlsx")
+    for year in ["2011-2013", "2014-2016", "2017-2019", "2020-2022", "2023-2024"]
+}
+
+# ==== Outputs ====
+output_dir = "pipeline_output"  # one subdirectory per analysis
+state_file = ".pipeline_state.json"  # fingerprints of the last successful run of each report
+corpus_state_dir = None  # keyword counts of the corpus kept between runs; None: next to the deduplicated CSV
+metrics_dir = "run_metrics"  # per-stage timing reports; None disables
+chart_dpi = 300
+
+# ==== Analysis settings (as in the individual scripts) ====
+doc_types_522 = ["Article", "Book chapter", "Conference paper"]
+year_ranges_532 = {
+    "2011-2013": (2011, 2013),
+    "2014-2016": (2014, 2016),
+    "2017-2019": (2017, 2019),
+    "2020-2022": (2020, 2022),
+    "2023-2024": (2023, 2024)
+}
+doc_types_532 = ["Article", "Conference paper", "Book chapter"]
+rolling_years = 3  # width of the rolling windows of the keyword trend lines
+network_min_occurrences = 5  # keywords in fewer documents are left out of the co-occurrence network built
+dedup_threshold = 0.8  # estimated abstract similarity above which two papers are the same (DOI/title always are)
+
+
+def output(section, name):
+    return os.path.join(output_dir, section, name)
+
+
+def build_pipeline(corpus_file, metrics=None):
+    pipeline = Pipeline(state_file, metrics=metrics)
+
+    # ==== Shared intermediates ====
+    @pipeline.stage("taxonomy")
+    def taxonomy():
+        return taxonomy_matcher()
+
+    # Every stage reading the corpus reads it without duplicate papers. The first
+    # copy of a paper is kept, so rows appended to the corpus are appended to
+    # the deduplicated CSV too and the counts below stay incremental.
+    deduplicated_file = output("dedup", "deduplicated_corpus.csv")
+
+    @pipeline.stage("dedup", files=[corpus_file], config={"threshold": dedup_threshold},
+                    outputs=[deduplicated_file, output("dedup", "duplicate_clusters.csv")])
+    def deduplicated_corpus():
+        deduplicate_corpus(corpus_file, deduplicated_file, output("dedup", "duplicate_clusters.csv"),
+                           threshold=dedup_threshold)
+
+    @pipeline.stage("corpus_state", deps=["taxonomy", "dedup"])
+    def corpus_state(taxonomy, dedup):
+        # Counts of the corpus kept between runs: only rows appended since the last run are matched
+        return update_state(deduplicated_file, taxonomy, corpus_state_dir)[0]
+
+    @pipeline.stage("keyword_cube", deps=["corpus_state"])
+    def keyword_cube(corpus_state):
+        # (year x document type x keyword) counts that the keyword reports slice
+        return corpus_state.cube
+
+    @pipeline.stage("keyword_trends", deps=["keyword_cube"])
+    def keyword_trends(keyword_cube):
+        # Per-year prefix sums, so any window scheme is read off without re-matching
+        return KeywordTrends.from_cube(keyword_cube)
+
+    # ==== The cube itself, for queries outside the pipeline (KeywordCube.load) ====
+    @pipeline.stage("cube", deps=["keyword_cube"], outputs=[output("cube", "keyword_cube")])
+    def save_cube(keyword_cube):
+        keyword_cube.save(output("cube", "keyword_cube"))
+
+    # ==== 5.2.1: strongest technique links of each goal in the VOSviewer network ====
+    @pipeline.stage("5.2.1", deps=["taxonomy"], files=[network_file], outputs=[output("5.2.1", "top_techniques.txt")])
+    def top_network_techniques(taxonomy):
+        network = KeywordNetwork.load(network_file, aliases=KEYWORD_ALIASES)
+        results = reports.network_top_techniques(network, taxonomy.goals, set(taxonomy.techniques), k=5)
+        with open(output("5.2.1", "top_techniques.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(reports.network_top_techniques_lines(results)) + "\n")
+
+    # ==== Network analytics: centrality, clusters and goal -> technique paths ====
+    @pipeline.stage("network", deps=["taxonomy"], files=[network_file],
+                    outputs=[output("network", "network_metrics.csv"), output("network", "cluster_summary.csv"),
+                             output("network", "goal_technique_paths.csv"),
+                             output("network", "network_with_metrics.json")])
+    def network_analytics(taxonomy):
+        network = KeywordNetwork.load(network_file, aliases=KEYWORD_ALIASES)
+        adjacency = network.adjacency()
+        metrics = graph.network_metrics(network, adjacency)
+        metrics.to_csv(output("network", "network_metrics.csv"), index=False)
+        graph.cluster_summary(network, adjacency).to_csv(output("network", "cluster_summary.csv"), index=False)
+        paths = graph.strongest_paths(network, taxonomy.goals, taxonomy.techniques, adjacency)
+        paths.to_csv(output("network", "goal_technique_paths.csv"), index=False)
+        graph.export_network_json(network_file, output("network", "network_with_metrics.json"), metrics)
+
+    # ==== Keyword co-occurrence network of the corpus, as VOSviewer JSON ====
+    @pipeline.stage("keyword_network", deps=["dedup"], config={"min_occurrences": network_min_occurrences},
+                    outputs=[output("network", "keyword_network.json")])
+    def keyword_network(dedup):
+        build_keyword_network(deduplicated_file, output("network", "keyword_network.json"),
+                              aliases=KEYWORD_ALIASES, min_occurrences=network_min_occurrences)
+
+    # ==== 5.2.2: top keywords per document type ====
+    @pipeline.stage("5.2.2", deps=["keyword_cube"], config={"doc_types": doc_types_522},
+                    outputs=[output("5.2.2", "top_keywords_by_document_type.txt")])
+    def top_keywords_by_doc_type(keyword_cube):
+        lines = reports.doc_type_top_keywords_lines(keyword_cube, doc_types_522, k=5)
+        with open(output("5.2.2", "top_keywords_by_document_type.txt"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    # ==== 5.2.3: papers per keyword in the top 100 papers ====
+    @pipeline.stage("5.2.3", deps=["taxonomy"], files=[top100_file], config={"dpi": chart_dpi},
+                    outputs=[output("5.2.3", "Keyword_Counts_Cleaned.xlsx"), output("5.2.3", "Keyword_BarGraph.png")])
+    def top100_keyword_counts(taxonomy):
+        result_df = top_papers.top100_keyword_counts(top100_file, taxonomy, nrows=100)
+        write_excel_rows(output("5.2.3", "Keyword_Counts_Cleaned.xlsx"), result_df.columns,
+                         result_df.itertuples(index=False))
+        reports.keyword_count_chart(result_df, output("5.2.3", "Keyword_BarGraph.png"), dpi=chart_dpi).render()
+
+    # ==== 5.3.1: top techniques of every goal per period ====
+    @pipeline.stage("5.3.1", deps=["corpus_state"], config={"year_ranges": DEFAULT_YEAR_RANGES},
+                    outputs=[output("5.3.1", "combined_goal_technique_analysis.csv"),
+                             output("5.3.1", "combined_goal_technique_analysis.txt")])
+    def goal_techniques_by_period(corpus_state):
+        # Periods are sums of the per-year counts, so the per-period CSVs are not needed
+        tensor = corpus_state.period_pairs(DEFAULT_YEAR_RANGES)
+        rows = reports.goal_technique_rows(tensor, corpus_state.cube, DEFAULT_YEAR_RANGES, k=3)
+        pd.DataFrame(rows).to_csv(output("5.3.1", "combined_goal_technique_analysis.csv"), index=False)
+        periods = [p for p, span in DEFAULT_YEAR_RANGES.items() if corpus_state.cube.doc_counts(years=span)]
+        with open(output("5.3.1", "combined_goal_technique_analysis.txt"), "w", encoding="utf-8") as f:
+            f.write(reports.goal_technique_text(rows, periods))
+
+    # ==== 5.3.2: top goals and techniques per year range and document type ====
+    @pipeline.stage("5.3.2", deps=["keyword_cube"],
+                    config={"year_ranges": year_ranges_532, "doc_types": doc_types_532},
+                    outputs=[output("5.3.2", "top_goals_techniques_filtered.xlsx")])
+    def top_goals_techniques(keyword_cube):
+        rows = reports.top_goals_techniques_rows(keyword_cube, year_ranges_532, doc_types_532, k_techniques=6,
+                                                 k_goals=5)
+        write_excel_rows(output("5.3.2", "top_goals_techniques_filtered.xlsx"),
+                         reports.TOP_GOALS_TECHNIQUES_COLUMNS, rows)
+
+    # ==== Keyword trend lines: every year and rolling windows ====
+    @pipeline.stage("trends", deps=["keyword_trends"], config={"rolling_years": rolling_years},
+                    outputs=[output("trends", "keyword_trends_yearly.csv"),
+                             output("trends", f"keyword_trends_rolling_{rolling_years}y.csv")])
+    def trend_lines(keyword_trends):
+        first, last = keyword_trends.first_year, keyword_trends.last_year
+        for width, name in [(1, "keyword_trends_yearly.csv"),
+                            (rolling_years, f"keyword_trends_rolling_{rolling_years}y.csv")]:
+            keyword_trends.frame(rolling_windows(first, last, width)).to_csv(output("trends", name))
+
+    # ==== 5.3.3: keyword occurrences in the top 10 papers of each year range ====
+    @pipeline.stage("5.3.3", deps=["taxonomy"], files=list(top10_files.values()), config={"dpi": chart_dpi},
+                    outputs=[output("5.3.3", "stacked_keyword_occurrences_data.csv"),
+                             output("5.3.3", "stacked_keyword_occurrences_colored_ordered.png")])
+    def top10_keyword_occurrences(taxonomy):
+        year_ranges = list(top10_files)
+        data = top_papers.keyword_occurrences(top10_files, taxonomy, workers=1)
+        rows = reports.occurrence_rows(data, year_ranges, taxonomy.goals, taxonomy.techniques)
+        pd.DataFrame(rows).to_csv(output("5.3.3", "stacked_keyword_occurrences_data.csv"), index=False)
+        render_charts([reports.stacked_bar_chart(
+            data, year_ranges, taxonomy.goals, taxonomy.techniques,
+            output("5.3.3", "stacked_keyword_occurrences_colored_ordered.png"), dpi=chart_dpi
+        )])
+
+    return pipeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the chapter 5 analyses, skipping those that are up to date.")
+    parser.add_argument("--corpus", default=corpus_file, help="Scopus CSV export")
+    parser.add_argument("--output-dir", default=output_dir, help="directory the reports are written to")
+    parser.add_argument("--only", nargs="+", metavar="ANALYSIS", help="run only these analyses, e.g. 5.3.1 5.3.2")
+    parser.add_argument("--force", action="store_true", help="rerun analyses even if they are up to date")
+    args = parser.parse_args()
+    output_dir = args.output_dir
+
+    metrics = RunMetrics("pipeline", metrics_dir)
+    status = build_pipeline(args.corpus, metrics).run(args.only, force=args.force)
+    for name, outcome in status.items():
+        print(f"{name}: {outcome}")
+    print(f"✅ Reports saved to: {output_dir}")
+
+    report_path = metrics.write()
+    if report_path:
+        print(f"✅ Run metrics saved to: {report_path}")
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# Import mec_analysis from this checkout, like the analysis scripts do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from benchmarks.synthetic_corpus import write_corpus_csv
+
+
+@pytest.fixture(scope="session")
+def corpus_csv(tmp_path_factory):
+    """A small synthetic Scopus-like corpus (see benchmarks/synthetic_corpus.py)."""
+    return write_corpus_csv(str(tmp_path_factory.mktemp("corpus") / "corpus.csv"), 300, seed=3)
@@ -0,0 +1,63 @@
+import pytest
+
+from mec_analysis import cache as cache_module
+from mec_analysis.cache import MatchCache
+from mec_analysis.matcher import KeywordMatcher
+
+TEXTS = ["low latency task offloading", "edge caching for vehicles", "energy aware offloading and caching"]
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """``(terms, text)`` of every text the cache scans, recorded through the matcher it builds."""
+    recorded = []
+
+    class RecordingMatcher(KeywordMatcher):
+        def find_term_ids(self, text):
+            recorded.append((tuple(self.terms), text))
+            return super().find_term_ids(text)
+
+    monkeypatch.setattr(cache_module, "KeywordMatcher", RecordingMatcher)
+    return recorded
+
+
+def term_matrix(path, texts, goals, techniques):
+    # One run: open the cache, match ``texts`` and save, like the scripts do
+    cache = MatchCache(str(path))
+    matrix = cache.term_matrix(texts, KeywordMatcher(goals, techniques))
+    cache.save()
+    expected = [[term in text for term in goals + techniques] for text in texts]
+    assert matrix.toarray().astype(bool).tolist() == expected
+    return matrix
+
+
+def test_added_term_is_the_only_one_scanned(tmp_path, scans):
+    term_matrix(tmp_path / "cache.npz", TEXTS, ["latency"], ["caching"])
+    assert len(scans) == len(TEXTS)
+
+    scans.clear()
+    term_matrix(tmp_path / "cache.npz", TEXTS, ["latency"], ["caching", "offloading"])
+    assert scans == [(("offloading",), text) for text in TEXTS]
+
+    scans.clear()
+    term_matrix(tmp_path / "cache.npz", TEXTS[::-1], ["latency"], ["offloading", "caching"])
+    assert scans == []
+
+
+def test_changed_text_misses_the_cache(tmp_path, scans):
+    term_matrix(tmp_path / "cache.npz", TEXTS, ["latency"], ["caching", "offloading"])
+    scans.clear()
+    edited = TEXTS[:2] + ["energy aware offloading with latency limits"]
+    term_matrix(tmp_path / "cache.npz", edited, ["latency"], ["caching", "offloading"])
+    assert scans == [(("latency", "caching", "offloading"), edited[2])]
+
+
+def test_entries_dropped_by_save_are_scanned_again(tmp_path, scans):
+    term_matrix(tmp_path / "cache.npz", TEXTS, ["latency"], ["caching"])
+    term_matrix(tmp_path / "cache.npz", TEXTS[:1], ["latency"], ["caching"])
+    assert len(MatchCache(str(tmp_path / "cache.npz"))) == 1
+
+    scans.clear()
+    term_matrix(tmp_path / "cache.npz", TEXTS, ["latency"], ["caching"])
+    assert [text for _, text in scans] == TEXTS[1:]
+    assert len(MatchCache(str(tmp_path / "cache.npz"))) == len(TEXTS)
@@ -0,0 +1,19 @@
+from matplotlib.image import imread
+
+from mec_analysis.charts import BarChart, render_charts
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_render_writes_a_png(tmp_path):
+    chart = BarChart(str(tmp_path / "charts" / "counts.png"), ["caching", "offloading"],
+                     {"2015-2019": [3, 0], "2020-2024": [5, 2]}, title="Papers", figsize=(4, 3), dpi=50)
+    path = chart.render()
+    with open(path, "rb") as f:
+        assert f.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE
+    assert imread(path).shape[:2] == (150, 200)
+
+    single = BarChart(str(tmp_path / "single.png"), ["a", "b", "c"], [1, 2.5, 0], colors=["red", "green", "blue"],
+                      value_labels="top", figsize=(4, 3), dpi=50)
+    assert render_charts([single]) == [str(tmp_path / "single.png")]
+    assert imread(single.output_path).shape[:2] == (150, 200)
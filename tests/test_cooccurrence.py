@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from mec_analysis.cooccurrence import CooccurrenceTensor
+from mec_analysis.corpus import corpus_texts, read_typed_corpus_chunks
+from mec_analysis.incidence import build_incidence
+from mec_analysis.taxonomy import taxonomy_matcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return taxonomy_matcher()
+
+
+def chunk_tensor(chunk, matcher):
+    incidence = build_incidence(corpus_texts(chunk), matcher, years=chunk["Year"], doc_types=chunk["Document Type"])
+    return CooccurrenceTensor.from_incidence(incidence, chunk["Year"], chunk["Document Type"]), incidence
+
+
+def test_sum_of_chunks_equals_one_count(corpus_csv, matcher):
+    chunks = [chunk_tensor(chunk, matcher)[0] for chunk in read_typed_corpus_chunks(corpus_csv, chunksize=70)]
+    assert len(chunks) > 1
+    total = chunks[0]
+    for tensor in chunks[1:]:
+        total = total + tensor
+
+    whole, incidence = chunk_tensor(next(read_typed_corpus_chunks(corpus_csv)), matcher)
+    assert sorted(total.periods) == sorted(whole.periods)
+    assert sorted(total.doc_types) == sorted(whole.doc_types)
+    whole = whole.reindex(total.periods, total.doc_types)
+    assert total.pairs.nnz > 0 and (total.pairs != whole.pairs).nnz == 0
+
+    # Against a dense count: documents of each (year, type) with both the goal and the technique
+    years, doc_types = incidence.years, incidence.doc_types
+    goals, techniques = incidence.goal_matrix.toarray(), incidence.technique_matrix.toarray()
+    expected = np.zeros(total.shape, dtype=np.int64)
+    for p, year in enumerate(total.periods):
+        for d, doc_type in enumerate(total.doc_types):
+            rows = (years == year) & (doc_types == doc_type)
+            expected[p, d] = goals[rows].T.astype(np.int64) @ techniques[rows]
+    assert (total.pairs.toarray() == expected.reshape(-1, len(total.techniques))).all()
+    with pytest.raises(ValueError, match="different keywords"):
+        total + CooccurrenceTensor(total.goals[1:], total.techniques, [], [], whole.pairs[:0, :])
@@ -0,0 +1,30 @@
+import os
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mec_analysis.corpus import CORPUS_COLUMNS, read_typed_corpus_chunks
+
+
+def read_range(path, start=0, end=None):
+    chunks = list(read_typed_corpus_chunks(path, CORPUS_COLUMNS + ["Title"], chunksize=40, start=start, end=end))
+    return pd.concat(chunks, ignore_index=True) if chunks else None
+
+
+def test_byte_ranges_cover_every_row_once(corpus_csv, tmp_path):
+    df = pd.read_csv(corpus_csv, dtype=str, keep_default_na=False)
+    # A quoted newline must not be taken for the end of a row
+    df.loc[5, "Abstract"] = "first line\nsecond line, with a comma"
+    path = str(tmp_path / "corpus.csv")
+    boundaries = []
+    for n_rows in (0, 7, 150, 151, len(df)):
+        df.iloc[:n_rows].to_csv(path, index=False)
+        boundaries.append(os.path.getsize(path))
+
+    whole = read_range(path)
+    assert len(whole) == len(df) and whole["Title"].tolist() == df["Title"].str.lower().tolist()
+    assert whole.loc[5, "Abstract"] == "first line\nsecond line, with a comma"
+    parts = [read_range(path, start, end) for start, end in zip(boundaries, boundaries[1:])]
+    assert_frame_equal(pd.concat(parts, ignore_index=True), whole)
+    assert_frame_equal(read_range(path, boundaries[2]), whole.iloc[150:].reset_index(drop=True))
+    assert read_range(path, boundaries[-1]) is None
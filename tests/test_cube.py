@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mec_analysis.corpus import corpus_texts, read_typed_corpus_chunks
+from mec_analysis.cube import KeywordCube
+from mec_analysis.incidence import build_incidence
+from mec_analysis.taxonomy import taxonomy_matcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return taxonomy_matcher()
+
+
+def chunk_cube(chunk, matcher):
+    # Some rows (picked by their text, not their chunk) lose their year or document
+    # type, so both axes get a None label
+    texts = corpus_texts(chunk)
+    length = texts.str.len().to_numpy()
+    years = chunk["Year"].astype(float).where(length % 7 != 0)
+    doc_types = chunk["Document Type"].astype(object).where(length % 11 != 0)
+    incidence = build_incidence(texts, matcher, years=years, doc_types=doc_types)
+    return KeywordCube.from_incidence(incidence), incidence
+
+
+def test_sum_of_chunks_equals_one_count(corpus_csv, matcher, tmp_path):
+    chunks = [chunk_cube(chunk, matcher)[0] for chunk in read_typed_corpus_chunks(corpus_csv, chunksize=70)]
+    assert len(chunks) > 1
+    total = chunks[0]
+    for cube in chunks[1:]:
+        total = total + cube
+
+    whole, incidence = chunk_cube(next(read_typed_corpus_chunks(corpus_csv)), matcher)
+    assert total.years == whole.years and total.years[-1] is None
+    assert sorted(total.doc_types[:-1]) == sorted(whole.doc_types[:-1]) and total.doc_types[-1] is None
+    whole = whole.reindex(total.years, total.doc_types)
+    for name in ("docs", "keyword_docs", "keyword_spellings"):
+        assert np.array_equal(getattr(total, name), getattr(whole, name)), name
+
+    # Against a dense count of the documents of each (year, type) mentioning each keyword
+    years = [None if np.isnan(year) else int(year) for year in incidence.years]
+    doc_types = [None if pd.isna(doc_type) else doc_type for doc_type in incidence.doc_types]
+    matrix = incidence.matrix.toarray()
+    for y, year in enumerate(total.years):
+        for d, doc_type in enumerate(total.doc_types):
+            rows = np.array([a == year and b == doc_type for a, b in zip(years, doc_types)])
+            assert total.docs[y, d] == rows.sum()
+            assert (total.keyword_docs[y, d] == matrix[rows].sum(axis=0)).all()
+    assert total.docs.sum() == incidence.n_docs
+
+    path = total.save(str(tmp_path / "cube"))
+    loaded = KeywordCube.load(path)
+    assert loaded.years == total.years and loaded.doc_types == total.doc_types
+    assert np.array_equal(loaded.keyword_spellings, total.keyword_spellings)
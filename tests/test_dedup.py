@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from mec_analysis.dedup import _stable_hash, deduplicate_corpus, fingerprint_corpus
+
+ABSTRACT = ("Mobile edge computing moves computation offloading close to the users so that latency sensitive "
+            "applications meet their deadlines while the energy consumption of the devices stays low")
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows, columns=["Title", "Year", "DOI", "Abstract"]).to_csv(path, index=False)
+    return str(path)
+
+
+def test_stable_hash_all_null():
+    assert _stable_hash(pa.array([None, None], type=pa.string())).tolist() == [0, 0]
+    hashes = _stable_hash(pa.array(["a", None, "a"]))
+    assert hashes[0] == hashes[2] != 0 and hashes[1] == 0
+
+
+def test_chunk_without_any_doi_or_title(tmp_path):
+    csv_path = write_csv(tmp_path / "corpus.csv", [
+        ["", 2020, "", ABSTRACT],
+        ["", 2021, "", ABSTRACT + " ."],
+        ["", 2022, "", "Something else entirely about vehicular networks and caching at the roadside units"],
+    ])
+    fingerprints = fingerprint_corpus(csv_path, chunksize=2)
+    assert fingerprints.n_rows == 3
+    assert not fingerprints.doi.any() and not fingerprints.title.any()
+
+    report = deduplicate_corpus(csv_path, str(tmp_path / "dedup.csv"))
+    assert report["Row"].tolist() == [0, 1]
+    assert report["Kept"].tolist() == [True, False]
+    assert not report["Same DOI"].any()
+    assert len(pd.read_csv(tmp_path / "dedup.csv")) == 2
+
+
+def test_same_doi_and_title(tmp_path):
+    csv_path = write_csv(tmp_path / "corpus.csv", [
+        ["Task offloading in mobile edge computing", 2020, "10.1/ABC", "First abstract text about offloading"],
+        ["Caching at the edge of vehicular networks", 2021, "https://doi.org/10.1/abc", "Unrelated words"],
+        ["Task Offloading in Mobile Edge Computing.", 2022, "", "Other words about scheduling tasks"],
+        ["Energy harvesting for IoT", 2022, "10.1/xyz", np.nan],
+    ])
+    report = deduplicate_corpus(csv_path, str(tmp_path / "dedup.csv"))
+    assert report["Row"].tolist() == [0, 1, 2]
+    assert report["Same DOI"].tolist() == [True, True, False]
+    assert report["Same title"].tolist() == [True, False, True]
+    assert len(pd.read_csv(tmp_path / "dedup.csv")) == 2
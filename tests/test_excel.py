@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from mec_analysis import excel
+from mec_analysis.excel import read_excel_columns, sidecar_path
+
+
+def test_sidecar_reads_match_read_excel(tmp_path, monkeypatch):
+    path = str(tmp_path / "papers.xlsx")
+    pd.DataFrame({
+        "Title": ["Edge caching", "Task offloading", None, "Latency"],
+        "Year": [2020, 2021, 2022, 2023],
+        "Volume": ["12", 7, None, 3.5],
+        "Notes": [None] * 4,
+        "Cited by": [1.5, np.nan, 3, 4],
+    }).to_excel(path, index=False)
+
+    def check(columns, nrows=None):
+        assert_frame_equal(read_excel_columns(path, columns, nrows=nrows),
+                           pd.read_excel(path, usecols=columns, nrows=nrows)[columns])
+
+    check(["Title", "Volume"])
+    assert os.path.exists(sidecar_path(path))
+    check(["Year", "Notes"])  # columns missing from the sidecar are added to it
+
+    # From here on every read comes from the sidecar
+    monkeypatch.setattr(excel, "iter_excel_rows", None)
+    check(["Title", "Volume"])
+    check(["Volume", "Year", "Notes"], nrows=2)
+    check(["Title"], nrows=0)
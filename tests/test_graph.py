@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from mec_analysis.graph import pagerank, weighted_degree
+
+
+def test_pagerank_of_a_path():
+    # 0 - 1 - 2: by symmetry r0 = r2 = a and r1 = b, with
+    # b = 0.85 * 2a + 0.05 and a = 0.85 * b / 2 + 0.05, so b = 18/37 and a = 19/74
+    adjacency = sparse.csr_matrix(np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]], dtype=float))
+    assert weighted_degree(adjacency).tolist() == [1, 2, 1]
+    assert pagerank(adjacency) == pytest.approx([19 / 74, 18 / 37, 19 / 74])
+    assert pagerank(sparse.csr_matrix((0, 0))).size == 0
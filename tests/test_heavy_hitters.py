@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mec_analysis.cooccurrence import ALL_DOC_TYPES
+from mec_analysis.heavy_hitters import ALL_PERIODS, KeywordHeavyHitters, SpaceSaving, sketch_corpus
+from mec_analysis.vosviewer import KEYWORD_COLUMNS, split_keywords
+
+
+def zipf_chunks(seed, n_chunks=20, chunk=500, vocabulary=400):
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, vocabulary + 1) ** 1.1
+    for _ in range(n_chunks):
+        draws = rng.choice(vocabulary, size=chunk, p=weights / weights.sum())
+        yield pd.Series(draws).map(lambda i: f"kw{i}").value_counts()
+
+
+def exact_counts(*streams):
+    return pd.concat([counts for stream in streams for counts in stream]).groupby(level=0).sum()
+
+
+def assert_bounds(summary, exact):
+    counts = dict(zip(summary.keywords, summary.counts))
+    errors = dict(zip(summary.keywords, summary.errors))
+    assert summary.total == exact.sum()
+    assert len(counts) <= summary.capacity
+    for keyword, true in exact.items():
+        if keyword in counts:
+            assert counts[keyword] - errors[keyword] <= true <= counts[keyword], keyword
+        else:
+            # Not monitored: it cannot have been seen more often than the floor
+            assert true <= summary.floor, keyword
+    # Every keyword above total / capacity is monitored
+    assert set(exact[exact > exact.sum() / summary.capacity].index) <= set(counts)
+
+
+@pytest.mark.parametrize("capacity", [10, 50, 1000])
+def test_bounds_after_merge(capacity):
+    left, right = SpaceSaving(capacity), SpaceSaving(capacity)
+    for a, b in zip(zipf_chunks(1), zipf_chunks(2)):
+        left.add_counts(a)
+        right.add_counts(b)
+    assert_bounds(left, exact_counts(zipf_chunks(1)))
+    assert_bounds(left + right, exact_counts(zipf_chunks(1), zipf_chunks(2)))
+
+
+def test_exact_while_below_capacity():
+    summary = SpaceSaving(1000)
+    for counts in zipf_chunks(3, n_chunks=5):
+        summary.add_counts(counts)
+    exact = exact_counts(zipf_chunks(3, n_chunks=5))
+    assert not summary.errors.any()
+    assert dict(zip(summary.keywords, summary.counts)) == exact.to_dict()
+    assert [count for _, count, _ in summary.top(5)] == sorted(exact, reverse=True)[:5]
+
+
+def test_corpus_sketch_matches_exact_counts(corpus_csv):
+    hitters = sketch_corpus(corpus_csv, capacity=10_000, chunksize=64)
+    data = pd.read_csv(corpus_csv)
+    rows, codes, vocabulary = split_keywords(data, KEYWORD_COLUMNS)
+    exact = pd.Series(np.bincount(codes, minlength=len(vocabulary)), index=vocabulary)
+    summary = hitters.cells[(ALL_PERIODS, ALL_DOC_TYPES)]
+    assert dict(zip(summary.keywords, summary.counts)) == {k: v for k, v in exact.items() if v}
+    assert isinstance(hitters + KeywordHeavyHitters(10_000), KeywordHeavyHitters)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from mec_analysis.incremental import update_state
+from mec_analysis.taxonomy import taxonomy_matcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return taxonomy_matcher()
+
+
+def assert_same_counts(state, fresh):
+    for name in ("years", "doc_types"):
+        assert getattr(state.cube, name) == getattr(fresh.cube, name)
+    for name in ("docs", "keyword_docs", "keyword_spellings"):
+        assert np.array_equal(getattr(state.cube, name), getattr(fresh.cube, name)), name
+    for name in ("periods", "doc_types"):
+        assert getattr(state.pairs, name) == getattr(fresh.pairs, name)
+    assert (state.pairs.pairs != fresh.pairs.pairs).nnz == 0
+    assert state.n_rows == fresh.n_rows
+
+
+def split_corpus(corpus_csv, tmp_path, n_first):
+    df = pd.read_csv(corpus_csv, dtype=str, keep_default_na=False)
+    path = str(tmp_path / "corpus.csv")
+    df.iloc[:n_first].to_csv(path, index=False)
+    return path, df.iloc[n_first:]
+
+
+def test_appended_rows_equal_a_fresh_count(corpus_csv, tmp_path, matcher):
+    path, rest = split_corpus(corpus_csv, tmp_path, 180)
+    state, added = update_state(path, matcher, str(tmp_path / "state"), chunksize=50)
+    assert added == 180
+
+    rest.to_csv(path, mode="a", header=False, index=False)
+    state, added = update_state(path, matcher, str(tmp_path / "state"), chunksize=50)
+    assert added == len(rest)
+    fresh, _ = update_state(path, matcher, str(tmp_path / "fresh"))
+    assert_same_counts(state, fresh)
+
+    # Nothing appended: nothing counted again
+    state, added = update_state(path, matcher, str(tmp_path / "state"))
+    assert added == 0
+    assert_same_counts(state, fresh)
+
+
+def test_edited_rows_are_counted_again(corpus_csv, tmp_path, matcher):
+    path, _ = split_corpus(corpus_csv, tmp_path, 120)
+    update_state(path, matcher, str(tmp_path / "state"))
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = df.iloc[10:]
+    df.to_csv(path, index=False)
+
+    state, added = update_state(path, matcher, str(tmp_path / "state"))
+    assert added == len(df)
+    fresh, _ = update_state(path, matcher, str(tmp_path / "fresh"))
+    assert_same_counts(state, fresh)
@@ -0,0 +1,48 @@
+import numpy as np
+
+from mec_analysis.corpus import corpus_texts, read_typed_corpus_chunks
+from mec_analysis.incidence import build_incidence
+from mec_analysis.index import CorpusIndex, _decode_varints, _encode_varints
+from mec_analysis.matcher import KeywordMatcher
+
+# Nested ("edge computing" in "mobile edge computing") and aliased terms
+GOALS = ["latency", "low latency", "edge computing", "mobile edge computing"]
+TECHNIQUES = ["offloading", "reinforcement learning", "deep reinforcement learning", "caching", "game theory"]
+ALIASES = {"low latency": "latency"}
+
+
+def test_varints_round_trip():
+    values = np.array([0, 1, 127, 128, 300, 16383, 16384, 2**32, 2**40 + 5], dtype=np.uint64)
+    data, sizes = _encode_varints(values)
+    assert sizes.tolist() == [1, 1, 1, 2, 2, 2, 3, 5, 6]
+    assert _decode_varints(data).tolist() == values.astype(np.int64).tolist()
+
+
+def test_index_incidence_equals_matching(corpus_csv, tmp_path):
+    matcher = KeywordMatcher(GOALS, TECHNIQUES, ALIASES)
+    # Small segments, so postings of a term span several of them
+    index = CorpusIndex.build(corpus_csv, str(tmp_path / "index"), segment_rows=64)
+    chunks = list(read_typed_corpus_chunks(corpus_csv, chunksize=1000))
+    assert len(chunks) == 1
+    data = chunks[0]
+    expected = build_incidence(corpus_texts(data), matcher, years=data["Year"], doc_types=data["Document Type"])
+
+    actual = index.incidence(matcher)
+    assert actual.term_matrix.shape == expected.term_matrix.shape
+    assert (actual.term_matrix.astype(bool) != expected.term_matrix.astype(bool)).nnz == 0
+    assert (actual.matrix != expected.matrix).nnz == 0
+    assert np.array_equal(actual.years, expected.years, equal_nan=True)
+    assert list(actual.doc_types) == list(expected.doc_types)
+
+    docs = np.array([3, 64, 65, 200])
+    subset = index.incidence(matcher, docs)
+    assert (subset.matrix != expected.matrix[docs]).nnz == 0
+
+
+def test_phrase_query_matches_substring_search(corpus_csv, tmp_path):
+    index = CorpusIndex.build(corpus_csv, str(tmp_path / "index"), segment_rows=64)
+    data = next(read_typed_corpus_chunks(corpus_csv, chunksize=1000))
+    texts = corpus_texts(data).tolist()
+    for phrase in ["edge computing", "offloading", "deep reinforcement learning", "network"]:
+        expected = [i for i, text in enumerate(texts) if phrase in text]
+        assert list(index.docs(phrase)) == expected, phrase
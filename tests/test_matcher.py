@@ -0,0 +1,65 @@
+import itertools
+import random
+
+import pandas as pd
+import pytest
+
+from mec_analysis.matcher import KeywordMatcher
+from mec_analysis.taxonomy import GOAL_ALIASES, GOALS_RAW, TECHNIQUE_ALIASES, TECHNIQUES_RAW, taxonomy_matcher
+
+# Nested ("edge" in "mobile edge computing") and overlapping ("edge computing" / "computing power") terms
+GOALS = ["edge", "edge computing", "mobile edge computing", "latency", "low latency"]
+TECHNIQUES = ["computing power", "computing", "game theory", "theory", "ing p"]
+ALIASES = {"low latency": "latency"}
+
+
+def expected(text, goals_raw, techniques_raw, goal_aliases, technique_aliases):
+    # The ``raw in text`` loops the matcher replaced
+    goals = {goal_aliases.get(raw, raw) for raw in goals_raw if raw.lower() in text}
+    techniques = {technique_aliases.get(raw, raw) for raw in techniques_raw if raw.lower() in text}
+    return goals, techniques
+
+
+def test_nested_and_overlapping_terms():
+    matcher = KeywordMatcher(GOALS, TECHNIQUES, ALIASES)
+    words = ["mobile", "edge", "computing", "power", "game", "theory", "low", "latency", "ing", "p", "x"]
+    rng = random.Random(0)
+    texts = ["", "mobile edge computing power", "edgecomputing", "game theoryedge"]
+    texts += [" ".join(rng.choices(words, k=rng.randint(1, 8))) for _ in range(500)]
+    texts += ["".join(rng.choices(words, k=rng.randint(1, 6))) for _ in range(500)]
+    for text in texts:
+        assert matcher.find(text) == expected(text, GOALS, TECHNIQUES, ALIASES, {}), text
+
+
+def test_every_substring_of_a_term():
+    matcher = KeywordMatcher(GOALS, TECHNIQUES, ALIASES)
+    for term in GOALS + TECHNIQUES:
+        for start, end in itertools.combinations(range(len(term) + 1), 2):
+            text = term[start:end]
+            assert matcher.find(text) == expected(text, GOALS, TECHNIQUES, ALIASES, {}), text
+
+
+def test_term_ids_report_every_spelling():
+    matcher = KeywordMatcher(GOALS, TECHNIQUES, ALIASES)
+    found = matcher.find_term_ids("low latency")
+    assert {matcher.terms[i] for i in found} == {"latency", "low latency"}
+    assert matcher.find_ids("low latency") == {matcher.index["latency"]}
+
+
+def test_repeated_spellings():
+    # Within a category the first spelling wins; across categories it is an error
+    matcher = KeywordMatcher(["latency", "delay", "Delay"], ["caching"], {"delay": "latency", "Delay": "latency"})
+    assert matcher.terms == ["latency", "delay", "caching"]
+    assert matcher.find("low delay and caching") == ({"latency"}, {"caching"})
+    with pytest.raises(ValueError, match="both a goal and a technique"):
+        KeywordMatcher(["latency", "Caching"], ["caching"])
+    with pytest.raises(ValueError, match="both a goal and a technique"):
+        KeywordMatcher(["latency"], ["caching", "delay"], technique_aliases={"delay": "latency"})
+
+
+def test_taxonomy_on_corpus_texts(corpus_csv):
+    matcher = taxonomy_matcher()
+    df = pd.read_csv(corpus_csv).fillna("")
+    texts = (df["Abstract"] + " " + df["Author Keywords"] + " " + df["Index Keywords"]).str.lower()
+    for text in texts:
+        assert matcher.find(text) == expected(text, GOALS_RAW, TECHNIQUES_RAW, GOAL_ALIASES, TECHNIQUE_ALIASES)
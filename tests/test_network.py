@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+from mec_analysis.network import KeywordNetwork
+
+
+def write_network(path, ids, links, strengths=None):
+    strengths = strengths or [1] * len(links)
+    network = {
+        "items": [{"id": i, "label": f"Keyword {i}", "x": 0.0, "y": 0.0, "cluster": 1} for i in ids],
+        "links": [{"source_id": s, "target_id": t, "strength": w} for (s, t), w in zip(links, strengths)],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"network": network}, f)
+    return str(path)
+
+
+def test_links_to_unknown_items_are_rejected(tmp_path):
+    for i, links in enumerate([[(1, 2), (3, 999)], [(0, 2)], [(2, 4)]]):
+        path = write_network(tmp_path / f"network{i}.json", [1, 2, 3, 5], links)
+        with pytest.raises(ValueError, match="missing from the items"):
+            KeywordNetwork.load(path)
+
+
+def test_top_k_neighbours(tmp_path):
+    path = write_network(tmp_path / "network.json", [3, 1, 2, 4], [(1, 2), (1, 3), (4, 1), (2, 3)], [5, 2, 5, 1])
+    network = KeywordNetwork.load(path)
+    assert network.top_k_neighbours("keyword 1", k=2) == [("keyword 2", 5.0), ("keyword 4", 5.0)]
+    assert network.top_k_neighbours("keyword 1", k=5, category_filter={"keyword 3"}) == [("keyword 3", 2.0)]
+    assert network.top_k_neighbours("keyword 2", k=5) == [("keyword 1", 5.0), ("keyword 3", 1.0)]
+    assert network.top_k_neighbours("keyword 9") is None
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from mec_analysis.periods import parse_year_ranges, partition_corpus, partition_tasks, read_partition
+
+
+def test_overlapping_ranges_are_rejected():
+    assert parse_year_ranges(["2011-2013", "2014", "2015-2016"]) == {
+        "2011_2013": (2011, 2013), "2014_2014": (2014, 2014), "2015_2016": (2015, 2016),
+    }
+    with pytest.raises(ValueError, match="overlap"):
+        parse_year_ranges(["2015-2016", "2011-2013", "2013-2014"])
+    assert len(parse_year_ranges(["2011-2013", "2012-2014"], overlapping=True)) == 2
+
+
+def test_every_range_gets_a_partition(corpus_csv, tmp_path):
+    year_ranges = {"early": (1990, 1999), "all": (2000, 2030)}
+    rows = partition_corpus(corpus_csv, str(tmp_path / "store"), year_ranges, chunksize=64)
+    assert rows == {"early": 0, "all": len(pd.read_csv(corpus_csv))}
+
+    tasks = partition_tasks(str(tmp_path / "store"))
+    assert [period for period, _ in tasks] == ["early", "all"]
+    assert read_partition(str(tmp_path / "store"), "early").empty
+
+    # A header-only export still gives every period an (empty) partition
+    header_only = tmp_path / "empty.csv"
+    pd.read_csv(corpus_csv, nrows=0).to_csv(header_only, index=False)
+    assert partition_corpus(str(header_only), str(tmp_path / "empty"), year_ranges) == {"early": 0, "all": 0}
+    assert len(partition_tasks(str(tmp_path / "empty"))) == 2
+    with pytest.raises(ValueError, match="overlap"):
+        partition_corpus(corpus_csv, str(tmp_path / "other"), {"a": (2000, 2010), "b": (2010, 2020)})
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from mec_analysis.network import KeywordNetwork
+from mec_analysis.spatial import MapIndex, cluster_bounds
+
+
+def random_network(n=500, seed=0, aliases=None):
+    rng = np.random.default_rng(seed)
+    arrays = {
+        "ids": rng.permutation(np.arange(1, n + 1)),
+        "labels": [f"Keyword {i}" for i in range(n)],
+        "x": rng.normal(size=n),
+        "y": rng.normal(size=n),
+        "cluster": rng.integers(1, 6, n).astype(np.int32),
+        "weights": {"Occurrences": rng.integers(1, 30, n).astype(float)},
+        "scores": {},
+        "link_source": np.zeros(0, dtype=np.int64),
+        "link_target": np.zeros(0, dtype=np.int64),
+        "link_strength": np.zeros(0),
+    }
+    arrays["x"][7] = np.nan  # an item without a position
+    return KeywordNetwork(arrays, aliases)
+
+
+def brute_force(network, keyword, candidates):
+    q = network.position[keyword]
+    distances = np.hypot(network.x - network.x[q], network.y - network.y[q])
+    candidates = candidates & (network.labels != network.labels[q]) & np.isfinite(distances)
+    order = np.argsort(distances[candidates], kind="stable")
+    return np.flatnonzero(candidates)[order], distances[candidates][order]
+
+
+@pytest.mark.parametrize("filtered", [False, True])
+def test_nearest_and_within_equal_brute_force(filtered):
+    network = random_network()
+    mask = (network.cluster <= 2) if filtered else np.ones(len(network), dtype=bool)
+    index = MapIndex(network, mask if filtered else None)
+    keywords = [f"keyword {i}" for i in range(0, 500, 7)]
+    nearest = index.nearest(keywords, k=6)
+    within = index.within(keywords, 0.4)
+    for keyword in keywords:
+        if keyword == "keyword 7":
+            assert nearest[keyword] is None and within[keyword] is None
+            continue
+        positions, distances = brute_force(network, keyword, mask)
+        assert [d for _, d in nearest[keyword]] == pytest.approx(distances[:6].tolist())
+        assert [label for label, _ in nearest[keyword]] == network.labels[positions[:6]].tolist()
+        assert [d for _, d in within[keyword]] == pytest.approx(distances[distances <= 0.4].tolist())
+
+
+def test_aliases_and_unknown_keywords():
+    network = random_network(50, aliases={"keyword 1": "keyword 0"})
+    index = MapIndex(network)
+    result = index.nearest(["keyword 0", "missing"], k=3)
+    assert result["missing"] is None
+    # "keyword 1" is an alias of "keyword 0", so it is not its neighbour
+    assert "keyword 0" not in [label for label, _ in result["keyword 0"]]
+    assert len(result["keyword 0"]) == 3
+    table = index.proximity_table(["keyword 0", "missing", "keyword 2"], k=2)
+    assert table["Keyword"].tolist() == ["keyword 0", "keyword 0", "keyword 2", "keyword 2"]
+    assert table["Rank"].tolist() == [1, 2, 1, 2]
+
+
+def test_cluster_bounds():
+    network = random_network()
+    bounds = cluster_bounds(network).set_index("Cluster")
+    on_map = np.isfinite(network.x)
+    for cluster, row in bounds.iterrows():
+        members = on_map & (network.cluster == cluster)
+        assert row["Items"] == members.sum()
+        assert row["Min x"] == network.x[members].min() and row["Max y"] == network.y[members].max()
+        assert row["Centroid x"] == pytest.approx(network.x[members].mean())
+        weights = network.weights["Occurrences"][members]
+        assert row["Weighted centroid y"] == pytest.approx(np.average(network.y[members], weights=weights))
+
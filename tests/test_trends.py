@@ -0,0 +1,14 @@
+import pytest
+
+from mec_analysis.trends import rolling_windows
+
+
+def test_rolling_windows():
+    assert rolling_windows(2011, 2015, 3) == {"2011-2013": (2011, 2013), "2012-2014": (2012, 2014),
+                                              "2013-2015": (2013, 2015)}
+    assert rolling_windows(2011, 2016, 2, step=2) == {"2011-2012": (2011, 2012), "2013-2014": (2013, 2014),
+                                                      "2015-2016": (2015, 2016)}
+    assert rolling_windows(2011, 2012, 5) == {}
+    for width, step in [(0, 1), (3, 0), (-1, 1)]:
+        with pytest.raises(ValueError, match="at least 1 year"):
+            rolling_windows(2011, 2015, width, step)
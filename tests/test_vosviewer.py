@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from mec_analysis.network import KeywordNetwork
+from mec_analysis.vosviewer import build_keyword_network
+
+
+def test_network_is_x_transpose_x(tmp_path):
+    csv_path = tmp_path / "corpus.csv"
+    pd.DataFrame({
+        "Author Keywords": ["Edge Computing; caching", "caching", "edge computing; Offloading"],
+        "Index Keywords": ["Caching; latency", "offloading", None],
+        "Year": [2020, 2021, 2022],
+        "Cited by": [4, None, 2],
+    }).to_csv(csv_path, index=False)
+    items, links = build_keyword_network(str(csv_path), str(tmp_path / "network.json"), min_occurrences=1)
+
+    # Documents x (caching, edge computing, latency, offloading); a keyword in both columns counts once
+    x = np.array([[1, 1, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1]])
+    assert items["label"].tolist() == ["caching", "edge computing", "latency", "offloading"]
+    matrix = np.diag(items["Occurrences"].to_numpy())
+    matrix[links["source_id"] - 1, links["target_id"] - 1] = links["strength"]
+    matrix[links["target_id"] - 1, links["source_id"] - 1] = links["strength"]
+    assert (matrix == x.T @ x).all()
+    assert items["Avg. pub. year"].tolist() == [2020.5, 2021, 2020, 2021.5]
+    assert items["Avg. citations"].tolist() == [4, 3, 4, 2]
+
+    network = KeywordNetwork.load(str(tmp_path / "network.json"))
+    assert (network.adjacency().toarray() == x.T @ x - np.diag(np.diag(x.T @ x))).all()